@@ -0,0 +1,56 @@
+# animation.py
+import game_clock
+
+
+def frame_index(now, frame_ms, count, start=0):
+    """
+    Номер кадра анимации в момент now. Кадр зависит только от времени, поэтому одинаковые
+    анимации с общим start идут в одной фазе, а остановленная анимация сразу догоняет остальные.
+    """
+    if count <= 1:
+        return 0
+    return int((now - start) // frame_ms) % count
+
+
+class AnimationClock:
+    """
+    Единые часы анимаций: раз в кадр читают игровое время и продвигают кадры всех видимых объектов.
+    Анимации объектов вне экрана не продвигаются, draw объектов только выбирает готовый кадр.
+    """
+
+    def __init__(self, clock=None):
+        """:param clock: объект с методом get_ticks(); по умолчанию глобальные игровые часы"""
+        self.clock = clock
+        self.now = self._read_clock()
+        self.advanced = 0  # Сколько объектов продвинуто на последнем тике
+
+    def _read_clock(self):
+        return self.clock.get_ticks() if self.clock is not None else game_clock.get_ticks()
+
+    def tick(self, objects):
+        """
+        Продвигает анимации переданных (видимых) объектов к текущему времени.
+        :param objects: iterable - объекты с необязательным методом advance_animation(now)
+        :return: float - время тика
+        """
+        now = self.now = self._read_clock()
+        advanced = 0
+        for obj in objects:
+            advance = obj.advance_animation
+            if advance is not None:
+                advance(now)
+                advanced += 1
+        self.advanced = advanced
+        return now
+
+
+_clock = AnimationClock()
+
+
+def tick(objects):
+    return _clock.tick(objects)
+
+
+def get_time():
+    """Время последнего тика анимаций (одно на весь кадр)."""
+    return _clock.now
@@ -0,0 +1,185 @@
+# atlas.py
+import pygame
+
+ATLAS_SIZE = 1024  # Сторона страницы атласа в пикселях
+PADDING = 1  # Зазор между спрайтами на странице
+
+
+def alpha_usage(surface):
+    """
+    Как спрайт на самом деле использует прозрачность.
+    :return: str - "opaque" (вся альфа 255), "binary" (только 0 и 255) или "blended" (полупрозрачные пиксели)
+    """
+    if surface.get_colorkey() is not None:
+        return "binary"
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return "opaque"
+    alpha = pygame.surfarray.array_alpha(surface)
+    if alpha.size == 0 or alpha.min() == 255:
+        return "opaque"
+    if ((alpha == 0) | (alpha == 255)).all():
+        return "binary"
+    return "blended"
+
+
+class AtlasPage:
+    """Одна страница атласа: поверхность, заполняемая полками (строками спрайтов одной высоты)."""
+
+    def __init__(self, size, with_alpha):
+        self.size = size
+        self.with_alpha = with_alpha
+        if with_alpha:
+            self.surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            self.surface.fill((0, 0, 0, 0))
+        else:
+            self.surface = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha() if with_alpha else self.surface.convert()
+        self.shelf_y = 0  # Верх текущей полки
+        self.shelf_height = 0
+        self.cursor_x = 0
+
+    def place(self, width, height):
+        """
+        Ищет место под спрайт на текущей или новой полке.
+        :return: pygame.Rect или None, если страница заполнена
+        """
+        if self.cursor_x + width > self.size:
+            self.shelf_y += self.shelf_height + PADDING
+            self.shelf_height = 0
+            self.cursor_x = 0
+        if self.shelf_y + height > self.size or width > self.size:
+            return None
+        rect = pygame.Rect(self.cursor_x, self.shelf_y, width, height)
+        self.cursor_x += width + PADDING
+        self.shelf_height = max(self.shelf_height, height)
+        return rect
+
+
+class TextureAtlas:
+    """
+    Упаковывает мелкие спрайты в несколько больших страниц: непрозрачные - в страницы convert(),
+    полупрозрачные - в страницы convert_alpha(). Спрайты с альфой только 0/255 переводятся в colorkey
+    с RLE и остаются отдельными поверхностями (RLE-поверхность нельзя делить на подповерхности).
+    Вместо исходных спрайтов выдаются подповерхности страниц, поэтому blit работает как раньше.
+    """
+
+    def __init__(self, page_size=ATLAS_SIZE, max_sprite=256):
+        """
+        :param page_size: int - сторона страницы
+        :param max_sprite: int - спрайты больше этого по любой стороне не упаковываются (фоны, панели)
+        """
+        self.page_size = page_size
+        self.max_sprite = max_sprite
+        self.pages = {False: [], True: []}  # С альфой? -> страницы
+        self.regions = {}  # id(исходного спрайта) -> (страница, pygame.Rect)
+        self.stats = {"opaque": 0, "blended": 0, "binary": 0, "standalone": 0}
+
+    def _page_for(self, with_alpha, width, height):
+        pages = self.pages[with_alpha]
+        if pages:
+            rect = pages[-1].place(width, height)
+            if rect is not None:
+                return pages[-1], rect
+        page = AtlasPage(self.page_size, with_alpha)
+        pages.append(page)
+        return page, page.place(width, height)
+
+    def pack(self, sprites):
+        """
+        Упаковывает поверхности; одинаковые объекты упаковываются один раз.
+        :param sprites: iterable из pygame.Surface
+        :return: dict - id(исходной поверхности) -> готовая поверхность
+        """
+        packed = {}
+        queue = []
+        for sprite in sprites:
+            if id(sprite) in packed:
+                continue
+            width, height = sprite.get_size()
+            usage = alpha_usage(sprite)
+            self.stats[usage] += 1
+            if usage == "binary" and sprite.get_colorkey() is not None:
+                packed[id(sprite)] = _converted(sprite, False)  # Уже с colorkey
+            elif usage == "binary":
+                packed[id(sprite)] = _colorkey_rle(sprite)
+            elif width > self.max_sprite or height > self.max_sprite or width == 0 or height == 0:
+                self.stats["standalone"] += 1
+                packed[id(sprite)] = _converted(sprite, usage == "blended")
+            else:
+                packed[id(sprite)] = None
+                queue.append((sprite, usage == "blended"))
+
+        # Полочная упаковка: сначала высокие спрайты, чтобы полки заполнялись плотнее
+        queue.sort(key=lambda item: (item[0].get_height(), item[0].get_width()), reverse=True)
+        for sprite, with_alpha in queue:
+            width, height = sprite.get_size()
+            page, rect = self._page_for(with_alpha, width, height)
+            if with_alpha:
+                # Страница прозрачна, MAX переносит RGBA спрайта без смешивания
+                page.surface.blit(sprite, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                page.surface.blit(sprite, rect)
+            self.regions[id(sprite)] = (page, rect)
+            packed[id(sprite)] = page.surface.subsurface(rect)
+        return packed
+
+    def surface_count(self):
+        return sum(len(pages) for pages in self.pages.values())
+
+
+def _converted(sprite, with_alpha):
+    if pygame.display.get_surface() is None:
+        return sprite
+    return sprite.convert_alpha() if with_alpha else sprite.convert()
+
+
+def _colorkey_rle(sprite):
+    """Спрайт с альфой 0/255 -> непрозрачная поверхность с colorkey и RLE-ускорением."""
+    alpha = pygame.surfarray.array_alpha(sprite)
+    rgb = pygame.surfarray.array3d(sprite)
+    used = set(map(tuple, rgb[alpha == 255].reshape(-1, 3).tolist()))
+    key = next(color for color in ((255, 0, 255), (0, 255, 255), (1, 2, 3), (254, 1, 253)) if color not in used)
+    surface = pygame.Surface(sprite.get_size())
+    surface.fill(key)
+    surface.blit(sprite, (0, 0))
+    surface.set_colorkey(key, pygame.RLEACCEL)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+def pack_images(image_dict, atlas=None):
+    """
+    Заменяет спрайты в словаре изображений (в том числе во вложенных словарях и списках анимаций)
+    на упакованные в атлас.
+    :return: tuple (новый словарь, TextureAtlas)
+    """
+    atlas = atlas if atlas is not None else TextureAtlas()
+    sprites = []
+    _collect(image_dict, sprites)
+    packed = atlas.pack(sprites)
+    return _replace(image_dict, packed), atlas
+
+
+def _collect(value, sprites):
+    if isinstance(value, pygame.Surface):
+        sprites.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect(item, sprites)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect(item, sprites)
+
+
+def _replace(value, packed):
+    if isinstance(value, pygame.Surface):
+        return packed[id(value)]
+    if isinstance(value, dict):
+        return {key: _replace(item, packed) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace(item, packed) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_replace(item, packed) for item in value)
+    return value
@@ -0,0 +1,72 @@
+# background.py
+import pygame
+import images
+from config import MAP_WIDTH, SCREEN_HEIGHT
+
+CHUNK_WIDTH = 512  # Ширина заранее собранного куска фона в пикселях
+
+
+class BackgroundLayer:
+    """
+    Слой тайлов фона, собранный в поверхности-чанки шириной CHUNK_WIDTH.
+    За кадр рисуются только чанки, попавшие в камеру; чанк пересобирается, лишь когда меняются его тайлы.
+    """
+
+    def __init__(self, tile_map, map_width=MAP_WIDTH, height=SCREEN_HEIGHT, chunk_width=CHUNK_WIDTH):
+        """
+        :param tile_map: TileMap - карта тайлов фона
+        :param map_width: int - ширина карты в пикселях
+        :param chunk_width: int - ширина чанка (кратна tile_size)
+        """
+        self.tile_map = tile_map
+        self.map_width = map_width
+        self.height = height
+        self.tile_size = tile_map.tile_size
+        self.chunk_width = chunk_width
+        self.chunk_count = max(1, -(-map_width // chunk_width))
+        self.chunks = {}  # Номер чанка -> готовая поверхность
+        self.dirty = set(range(self.chunk_count))
+        tile_map.add_listener(lambda column, row: self.invalidate(column * self.tile_size))
+
+    def invalidate(self, x=None, width=None):
+        """
+        Помечает чанки для пересборки.
+        :param x: int - координата изменённого тайла; None - весь фон
+        :param width: int - ширина изменённой области (по умолчанию тайл)
+        """
+        if x is None:
+            self.dirty = set(range(self.chunk_count))
+            return
+        width = self.tile_size if width is None else width
+        first = max(0, x // self.chunk_width)
+        last = min(self.chunk_count - 1, (x + width - 1) // self.chunk_width)
+        self.dirty.update(range(first, last + 1))
+
+    def _build_chunk(self, index):
+        left = index * self.chunk_width
+        width = min(self.chunk_width, self.map_width - left)
+        surface = pygame.Surface((width, self.height))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        tile_map = self.tile_map
+        tile_size = self.tile_size
+        # Столбцы карты, задевающие чанк
+        first = max(0, left // tile_size)
+        last = min(tile_map.columns - 1, (left + width - 1) // tile_size)
+        rows = min(tile_map.rows, -(-self.height // tile_size))
+        tile_images = [images.GAME_IMAGES[name] for name in tile_map.palette]
+        grid = tile_map.tiles
+        surface.blits([(tile_images[grid[row, column]], (column * tile_size - left, row * tile_size))
+                       for column in range(first, last + 1) for row in range(rows)], False)
+        self.chunks[index] = surface
+        self.dirty.discard(index)
+
+    def draw(self, screen, camera_x, screen_width):
+        """Рисует чанки, пересекающиеся с камерой."""
+        camera_x = int(camera_x)
+        first = max(0, camera_x // self.chunk_width)
+        last = min(self.chunk_count - 1, (camera_x + screen_width - 1) // self.chunk_width)
+        for index in range(first, last + 1):
+            if index in self.dirty or index not in self.chunks:
+                self._build_chunk(index)
+            screen.blit(self.chunks[index], (index * self.chunk_width - camera_x, 0))
@@ -0,0 +1,304 @@
+# bed_field.py
+import numpy as np
+from config import SEEDS
+
+NAN = float("nan")
+DEFAULT_SEED_TIMINGS = (300000, 15000, 300000)  # Полив, всходы, созревание для неизвестных семян (мс)
+
+# Палитра семян: имя <-> числовой id; порядок совпадает с SEEDS
+SEED_NAMES = [seed["name"] for seed in SEEDS]
+SEED_IDS = {name: i for i, name in enumerate(SEED_NAMES)}
+SEED_TIMINGS = np.array([[seed["watering_interval_minutes"] * 60000,
+                          seed["sprout_time_minutes"] * 60000,
+                          seed["ripening_time_minutes"] * 60000] for seed in SEEDS], dtype=np.float64).reshape(-1, 3)
+
+# Атрибуты грядки, хранящиеся в массивах: имя -> (dtype, значение по умолчанию)
+BED_FIELDS = {
+    "is_planted": (np.bool_, False),
+    "is_watered": (np.bool_, False),
+    "is_sprouted": (np.bool_, False),
+    "is_ripe": (np.bool_, False),
+    "seed_id": (np.int16, -1),
+    "last_watered_time": (np.float64, 0),
+    "ripening_start_time": (np.float64, NAN),
+    "total_ripening_time": (np.float64, 0),
+    "first_watering_time": (np.float64, NAN),
+    "watering_start_time": (np.float64, NAN),
+    "watering_duration": (np.float64, 2000),
+}
+
+
+def seed_id(name):
+    """Возвращает id семени по имени, регистрируя неизвестные имена с таймингами по умолчанию."""
+    global SEED_TIMINGS
+    if name is None:
+        return -1
+    if name not in SEED_IDS:
+        SEED_IDS[name] = len(SEED_NAMES)
+        SEED_NAMES.append(name)
+        SEED_TIMINGS = np.vstack([SEED_TIMINGS, np.array(DEFAULT_SEED_TIMINGS, dtype=np.float64)])
+    return SEED_IDS[name]
+
+
+def seed_name(seed_id_value):
+    return SEED_NAMES[seed_id_value] if seed_id_value >= 0 else None
+
+
+def seed_timings(name):
+    """Возвращает (интервал полива, время всходов, время созревания) в миллисекундах."""
+    interval, sprout, ripening = SEED_TIMINGS[seed_id(name)]
+    return float(interval), float(sprout), float(ripening)
+
+
+def _time_value(value):
+    value = float(value)
+    if value != value:  # NaN означает None
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def bed_state_property(name):
+    """Свойство Bed, которое читает и пишет свою строку в BedField."""
+    is_flag = BED_FIELDS[name][0] is np.bool_
+
+    def getter(bed):
+        value = getattr(bed.field, name)[bed.index]
+        return bool(value) if is_flag else _time_value(value)
+
+    def setter(bed, value):
+        field = bed.field
+        getattr(field, name)[bed.index] = NAN if value is None else value
+        field.touch(bed.index)  # Строку нужно пересчитать при следующем update
+
+    return property(getter, setter)
+
+
+class BedField:
+    """
+    Хранилище состояний грядок в виде структуры массивов NumPy (по массиву на атрибут).
+    Объекты Bed остаются тонкими представлениями строк этого поля.
+    """
+
+    def __init__(self, capacity=64):
+        capacity = max(1, capacity)
+        self.size = 0
+        self.beds = []
+        for name, (dtype, default) in BED_FIELDS.items():
+            setattr(self, name, np.full(capacity, default, dtype=dtype))
+        # Ближайший момент, когда строка может изменить состояние; -inf - пересчитать немедленно
+        self.deadline = np.full(capacity, np.inf, dtype=np.float64)
+        self.scheduler = None  # TransitionScheduler, которому поле сообщает о своих сроках
+        self._touched = False
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        capacity = len(self.deadline) * 2
+        for name, (dtype, default) in list(BED_FIELDS.items()) + [("deadline", (np.float64, np.inf))]:
+            old = getattr(self, name)
+            new = np.full(capacity, default, dtype=dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def touch(self, index):
+        """Помечает строку (или массив строк) для пересчёта и просит планировщик обновить поле на ближайшем шаге."""
+        self.deadline[index] = -np.inf
+        if self.scheduler is not None and not self._touched:
+            self._touched = True
+            self.scheduler.schedule(self, -np.inf)
+
+    def row_state(self, index):
+        return {name: getattr(self, name)[index] for name in BED_FIELDS}
+
+    def add(self, bed):
+        """Переносит грядку (вместе с её состоянием) в это поле."""
+        state = None
+        if bed.field is not None:
+            if bed.field is self:
+                return
+            state = bed.field.row_state(bed.index)
+            bed.field._remove_row(bed)
+        if self.size == len(self.deadline):
+            self._grow()
+        index = self.size
+        self.size += 1
+        self.beds.append(bed)
+        bed.field = self
+        bed.index = index
+        if state is not None:
+            for name, value in state.items():
+                getattr(self, name)[index] = value
+        else:
+            for name, (dtype, default) in BED_FIELDS.items():
+                getattr(self, name)[index] = default
+        self.touch(index)
+
+    def remove(self, bed):
+        """Убирает грядку из поля; её состояние переезжает в собственное хранилище грядки."""
+        if bed.field is not self:
+            return False
+        BedField(capacity=1).add(bed)
+        return True
+
+    def _remove_row(self, bed):
+        index = bed.index
+        last = self.size - 1
+        if index != last:
+            for name in list(BED_FIELDS) + ["deadline"]:
+                array = getattr(self, name)
+                array[index] = array[last]
+            moved = self.beds[last]
+            moved.index = index
+            self.beds[index] = moved
+        self.beds.pop()
+        self.size -= 1
+        bed.field = None
+        bed.index = None
+
+    def next_deadline(self):
+        """Ближайший момент, когда хотя бы одна грядка поля изменит состояние."""
+        if self.size == 0:
+            return np.inf
+        return float(self.deadline[:self.size].min())
+
+    def update(self, current_time):
+        """
+        Векторно обновляет полив, всходы и созревание всех грядок, у которых наступил срок.
+        :param current_time: float - текущее игровое время в миллисекундах
+        :return: np.ndarray - индексы строк, чьё состояние изменилось (в том числе записанное извне)
+        """
+        self._touched = False
+        n = self.size
+        if n == 0:
+            return np.empty(0, dtype=np.intp)
+        due = np.flatnonzero(self.deadline[:n] <= current_time)
+        if due.size == 0:
+            return due
+
+        touched = np.isneginf(self.deadline[due])  # Строки, состояние которых записали извне (полив, посадка, сбор)
+        seeds = self.seed_id[due]
+        active_mask = self.is_planted[due] & (seeds >= 0)
+        self.deadline[due[~active_mask]] = np.inf  # Пустые грядки сами по себе не меняются
+        idx = due[active_mask]
+        touched_idle = due[~active_mask & touched]
+        if idx.size == 0:
+            return touched_idle
+        touched = touched[active_mask]
+
+        t = current_time
+        interval, sprout_time, ripening_time = SEED_TIMINGS[self.seed_id[idx]].T
+        watered0 = self.is_watered[idx]
+        sprouted0 = self.is_sprouted[idx]
+        ripe0 = self.is_ripe[idx]
+        last = self.last_watered_time[idx]
+        ripening_start = self.ripening_start_time[idx]
+        total = self.total_ripening_time[idx]
+        first = self.first_watering_time[idx]
+        watering_start = self.watering_start_time[idx]
+        duration = self.watering_duration[idx]
+
+        # Завершение полива (сравнения с NaN дают False)
+        done = (t - watering_start) >= duration
+        watered = watered0 | done
+        last = np.where(done, t, last)
+        watering_start = np.where(done, NAN, watering_start)
+        first = np.where(done & np.isnan(first), t, first)
+        ripening_start = np.where(done & np.isnan(ripening_start), t, ripening_start)
+
+        # Всходы
+        sprouted = sprouted0 | ((t - first) >= sprout_time)
+
+        # Высыхание: копим время созревания и останавливаем его
+        expired = (t - last) > interval
+        watered &= ~expired
+        paused = expired & ~np.isnan(ripening_start)
+        total = np.where(paused, total + (t - ripening_start), total)
+        ripening_start = np.where(paused, NAN, ripening_start)
+
+        # Созревание
+        ripe = ripe0 | (watered & ((total + (t - ripening_start)) >= ripening_time))
+
+        self.is_watered[idx] = watered
+        self.is_sprouted[idx] = sprouted
+        self.is_ripe[idx] = ripe
+        self.last_watered_time[idx] = last
+        self.ripening_start_time[idx] = ripening_start
+        self.total_ripening_time[idx] = total
+        self.first_watering_time[idx] = first
+        self.watering_start_time[idx] = watering_start
+
+        # Следующие сроки: конец полива, всходы, высыхание, созревание (fmin пропускает NaN)
+        deadline = np.fmin(np.full(idx.size, np.inf), watering_start + duration)
+        deadline = np.fmin(deadline, np.where(sprouted, NAN, first + sprout_time))
+        deadline = np.fmin(deadline, np.where(watered | ~np.isnan(ripening_start), last + interval, NAN))
+        deadline = np.fmin(deadline, np.where(watered & ~ripe, ripening_start + ripening_time - total, NAN))
+        self.deadline[idx] = deadline
+
+        changed = touched | done | (watered != watered0) | (sprouted != sprouted0) | (ripe != ripe0)
+        return np.concatenate([touched_idle, idx[changed]])
+
+    def catch_up(self, current_time, rows=None):
+        """
+        Аналитически переводит грядки в состояние на момент current_time, сколько бы времени ни прошло.
+        События (конец полива, всходы, созревание, высыхание) применяются в момент, когда они
+        произошли, а не в момент вызова, поэтому неделя простоя считается за один проход.
+        :param current_time: float - игровое время, к которому нужно прийти
+        :param rows: массив индексов строк; по умолчанию все грядки поля
+        :return: np.ndarray - индексы строк, чьё состояние изменилось
+        """
+        if rows is None:
+            rows = np.arange(self.size)
+        rows = np.asarray(rows, dtype=np.intp)
+        seeds = self.seed_id[rows]
+        idx = rows[self.is_planted[rows] & (seeds >= 0)]
+        if idx.size == 0:
+            return idx
+
+        t = current_time
+        interval, sprout_time, ripening_time = SEED_TIMINGS[self.seed_id[idx]].T
+        watered0 = self.is_watered[idx]
+        sprouted0 = self.is_sprouted[idx]
+        ripe0 = self.is_ripe[idx]
+        last = self.last_watered_time[idx]
+        ripening_start = self.ripening_start_time[idx]
+        total = self.total_ripening_time[idx]
+        first = self.first_watering_time[idx]
+        watering_start = self.watering_start_time[idx]
+        duration = self.watering_duration[idx]
+
+        # Полив закончился в момент watering_start + duration
+        done_at = watering_start + duration
+        done = done_at <= t
+        watered = watered0 | done
+        last = np.where(done, done_at, last)
+        watering_start = np.where(done, NAN, watering_start)
+        first = np.where(done & np.isnan(first), done_at, first)
+        ripening_start = np.where(done & np.isnan(ripening_start), done_at, ripening_start)
+
+        sprouted = sprouted0 | ((t - first) >= sprout_time)
+
+        # Созревание успевает случиться, только если наступило не позже высыхания
+        ripe_at = ripening_start + ripening_time - total
+        expire_at = last + interval
+        expired = (watered | ~np.isnan(ripening_start)) & (t > expire_at)
+        ripe = ripe0 | (watered & (ripe_at <= np.where(expired, expire_at, t)))
+
+        # Высыхание: время созревания копится только до момента высыхания
+        paused = expired & ~np.isnan(ripening_start)
+        total = np.where(paused, total + (expire_at - ripening_start), total)
+        ripening_start = np.where(paused, NAN, ripening_start)
+        watered &= ~expired
+
+        self.is_watered[idx] = watered
+        self.is_sprouted[idx] = sprouted
+        self.is_ripe[idx] = ripe
+        self.last_watered_time[idx] = last
+        self.ripening_start_time[idx] = ripening_start
+        self.total_ripening_time[idx] = total
+        self.first_watering_time[idx] = first
+        self.watering_start_time[idx] = watering_start
+        self.touch(idx)
+
+        changed = done | (watered != watered0) | (sprouted != sprouted0) | (ripe != ripe0)
+        return idx[changed]
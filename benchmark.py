@@ -0,0 +1,114 @@
+# benchmark.py
+"""Замеры производительности подсистем фермы. Запуск: python benchmark.py [имя]"""
+import contextlib
+import io
+import random
+import sys
+import time
+import pygame
+from config import SEEDS, MAP_WIDTH, SCREEN_HEIGHT
+from bed_field import BedField
+from entities import Bed
+from quadtree import QuadTree
+from spatial_hash import SpatialHashGrid
+
+
+def make_bed_views(count):
+    """Создаёт представления грядок без загрузки картинок."""
+    beds = []
+    for _ in range(count):
+        bed = Bed.__new__(Bed)
+        bed.field = None
+        bed.index = None
+        beds.append(bed)
+    return beds
+
+
+def bench_bed_field(count=50000, ticks=600):
+    field = BedField(capacity=count)
+    for i, bed in enumerate(make_bed_views(count)):
+        field.add(bed)
+        bed.plant_seed(SEEDS[i % len(SEEDS)])
+        if i % 3 == 0:
+            bed.water(0)
+    step = 1000 / 60
+    current_time = 0
+    field.update(current_time)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        current_time += step
+        field.update(current_time)
+    typical = (time.perf_counter() - start) / ticks * 1000
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        current_time += step
+        field.deadline[:field.size] = -float("inf")  # Худший случай: у всех грядок наступил срок
+        field.update(current_time)
+    worst = (time.perf_counter() - start) / ticks * 1000
+    print(f"BedField, {count} грядок: {typical:.3f} мс/тик обычно, {worst:.3f} мс/тик если пересчитываются все")
+
+
+def make_placed_beds(count, seed=0):
+    """Грядки в случайных клетках сетки 32px по всей карте."""
+    rng = random.Random(seed)
+    beds = make_bed_views(count)
+    for bed in beds:
+        bed.x = rng.randrange(0, MAP_WIDTH - 32, 32)
+        bed.y = rng.randrange(0, SCREEN_HEIGHT - 32, 32)
+        bed.width = bed.height = 32
+        bed.obj_type = "bed"
+    return beds
+
+
+def _timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench_spatial_index(counts=(1000, 10000, 100000)):
+    boundary = pygame.Rect(0, 0, MAP_WIDTH, SCREEN_HEIGHT)
+    backends = {
+        "QuadTree": (lambda: QuadTree(boundary, capacity=4),
+                     lambda beds: QuadTree.from_objects(boundary, beds, capacity=4)),
+        "SpatialHashGrid": (lambda: SpatialHashGrid(boundary, cell_size=32),
+                            lambda beds: SpatialHashGrid.from_objects(boundary, beds, cell_size=32)),
+    }
+    rng = random.Random(1)
+    points = [(rng.uniform(0, MAP_WIDTH), rng.uniform(0, SCREEN_HEIGHT)) for _ in range(20)]
+    view = pygame.Rect(1000, 0, 1280, SCREEN_HEIGHT)
+    for count in counts:
+        beds = make_placed_beds(count)
+        for name, (factory, bulk_factory) in backends.items():
+            index = factory()
+            with contextlib.redirect_stdout(io.StringIO()):  # QuadTree печатает каждую вставку
+                build = _timed(lambda: [index.insert(bed) for bed in beds])
+                bulk = _timed(lambda: bulk_factory(beds))
+                query = _timed(lambda: index.query(view), repeat=5)
+                nearest = _timed(lambda: [index.find_nearest(p, lambda b: b.y > 300) for p in points]) / len(points)
+                moved = beds[:1000]
+
+                def move_all():
+                    for bed in moved:
+                        old_x, old_y = bed.x, bed.y
+                        bed.x = (bed.x + 32) % (MAP_WIDTH - 32)
+                        index.move(bed, old_x, old_y)
+                move = _timed(move_all) / len(moved) * 1000
+            indexed = len(index.get_all_objects())
+            print(f"{name}, {count} объектов (в индексе {indexed}): постройка {build:.1f} мс, "
+                  f"from_objects {bulk:.1f} мс, query экрана {query:.2f} мс, "
+                  f"find_nearest {nearest:.2f} мс, перемещение {move:.1f} мкс")
+
+
+BENCHMARKS = {
+    "bed_field": bench_bed_field,
+    "spatial_index": bench_spatial_index,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -53,4 +53,17 @@ BUILDING_CONFIG = {
         "produce": {},
         "work_time": 0
     }
-}
\ No newline at end of file
+}
+
+# Пространственный индекс объектов карты: "quadtree" или "hash_grid" (сетка ячеек по SPATIAL_CELL_SIZE пикселей)
+SPATIAL_INDEX = "quadtree"
+SPATIAL_CELL_SIZE = 32
+
+# Вывод кадра только по изменившимся областям экрана (pygame.display.update(rects)) вместо flip всего окна
+DIRTY_RECTS = False
+
+# Бюджет памяти кэша масштабированных изображений (surface_cache.scale_surface), в байтах
+SCALE_CACHE_BYTES = 32 * 1024 * 1024
+
+# Подсвечивать при строительстве и перемещении все клетки, куда помещается выбранная постройка
+PLACEMENT_OVERLAY = True
@@ -0,0 +1,133 @@
+# dirty_rects.py
+import pygame
+import game_clock
+from notifications import notification_rect
+
+WORLD_PAD = 12  # Запас вокруг объекта: свечение выделения и полоса прогресса над ним
+HUD_BAND_HEIGHT = 90  # Полоса сверху экрана: показатели ресурсов и их подсказки
+WET_BED_MS = 11000  # Мокрая грядка рисуется 10 с после полива; ещё секунда, чтобы перерисовать её высохшей
+
+
+class DirtyRegions:
+    """
+    Учёт изменившихся областей экрана для режима DIRTY_RECTS.
+    Кадр рисуется с клипом по объединению грязных областей и выводится через pygame.display.update(rects),
+    поэтому на простаивающей ферме почти ничего не перерисовывается и не копируется на экран.
+    """
+
+    def __init__(self, screen_size, max_rects=24):
+        """
+        :param screen_size: tuple - размер окна
+        :param max_rects: int - больше областей за кадр сливаются в одну
+        """
+        self.screen_rect = pygame.Rect((0, 0), screen_size)
+        self.max_rects = max_rects
+        self.rects = []
+        self.world_rects = []  # Области в координатах карты, отмеченные между кадрами
+        self.full = True  # Первый кадр рисуется целиком
+        self.camera_x = None
+        self.hud_state = None
+        self.mouse_pos = None
+        self.player_rect = None
+        self.notification_shown = False
+
+    def watch(self, registry, simulation):
+        """Подписывается на постройку, снос и перемещение объектов и на смену их состояния в симуляции."""
+        registry.add_listener(on_add=self.mark_object, on_remove=self.mark_object, on_move=self._on_move)
+        simulation.state_listeners.append(self.mark_object)
+
+    def mark(self, rect):
+        """Отмечает область экрана."""
+        if self.full:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.rects.append(rect)
+
+    def mark_all(self):
+        self.full = True
+        self.rects = []
+
+    def mark_object(self, obj, x=None, y=None):
+        """Отмечает область объекта на карте (по умолчанию в его текущей позиции)."""
+        x = obj.x if x is None else x
+        y = obj.y if y is None else y
+        self.world_rects.append(pygame.Rect(x - WORLD_PAD, y - WORLD_PAD,
+                                            obj.width + 2 * WORLD_PAD, obj.height + 2 * WORLD_PAD))
+
+    def _on_move(self, obj, old_x, old_y):
+        self.mark_object(obj, old_x, old_y)
+        self.mark_object(obj)
+
+    def begin_frame(self, camera_x, hud_state, overlays_active, notification_active, animated_objects, player):
+        """
+        Собирает изменения к началу кадра.
+        :param camera_x: текущая позиция камеры; сдвиг камеры перерисовывает весь экран
+        :param hud_state: tuple - показатели ресурсов; при изменении перерисовывается полоса HUD
+        :param overlays_active: bool - открыто меню или режим строительства: экран перерисовывается целиком
+        :param notification_active: bool - показывается уведомление
+        :param animated_objects: объекты, которые сейчас могут меняться сами по себе (анимация, прогресс)
+        :param player: Player - рисуется каждый кадр в старой и новой позиции
+        :return: pygame.Rect - клип для отрисовки кадра или None, если рисуется весь экран
+        """
+        if camera_x != self.camera_x or overlays_active:
+            self.mark_all()
+        self.camera_x = camera_x
+
+        screen_width = self.screen_rect.width
+        hud_band = pygame.Rect(0, 0, screen_width, HUD_BAND_HEIGHT)
+        if hud_state != self.hud_state:
+            self.hud_state = hud_state
+            self.mark(hud_band)
+        mouse_pos = pygame.mouse.get_pos()
+        if mouse_pos != self.mouse_pos:
+            # Подсказка HUD появляется и исчезает под курсором
+            if hud_band.collidepoint(mouse_pos) or (self.mouse_pos and hud_band.collidepoint(self.mouse_pos)):
+                self.mark(hud_band)
+            self.mouse_pos = mouse_pos
+
+        if notification_active or self.notification_shown:
+            self.mark(notification_rect(screen_width))
+        self.notification_shown = notification_active
+
+        current_time = game_clock.get_ticks()
+        for obj in animated_objects:
+            if is_animated(obj, current_time):
+                self.mark_object(obj)
+        player_rect = pygame.Rect(player.x - WORLD_PAD, player.y - WORLD_PAD,
+                                  player.width + 2 * WORLD_PAD, player.height + 2 * WORLD_PAD)
+        self.world_rects.append(player_rect)
+        if self.player_rect is not None:
+            self.world_rects.append(self.player_rect)
+        self.player_rect = player_rect
+
+        for rect in self.world_rects:
+            self.mark(rect.move(-int(camera_x), 0))
+        self.world_rects = []
+
+        if self.full:
+            return None
+        if len(self.rects) > self.max_rects:
+            self.rects = [self.rects[0].unionall(self.rects[1:])]
+        if not self.rects:
+            return pygame.Rect(0, 0, 0, 0)
+        return self.rects[0].unionall(self.rects[1:])
+
+    def present(self):
+        """Выводит кадр на экран: целиком или только отмеченные области."""
+        if self.full:
+            pygame.display.flip()
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.full = False
+        self.rects = []
+
+
+def is_animated(obj, current_time):
+    """Может ли объект выглядеть иначе без события: анимация переработки, полив, высыхание."""
+    if getattr(obj, "is_processing", False):
+        return True
+    if obj.obj_type == "bed":
+        return obj.watering_start_time is not None or (
+            obj.is_watered and current_time - obj.last_watered_time < WET_BED_MS)
+    return False
@@ -0,0 +1,78 @@
+# draw_list.py
+import pygame
+
+# Слои отрисовки: команды рисуются по возрастанию слоя, внутри слоя - в порядке добавления
+LAYER_GROUND = 0
+LAYER_OBJECTS = 10
+LAYER_PLAYER = 20
+
+
+class DrawList:
+    """
+    Список команд отрисовки кадра. Объекты рисуют в него так же, как в экран (blit, fill, get_width),
+    а flush отправляет все команды на экран пачками через Surface.blits, по слоям.
+    """
+
+    def __init__(self, size):
+        """:param size: tuple - размер экрана, для которого собирается кадр"""
+        self.width, self.height = size
+        self.layer = LAYER_OBJECTS  # Слой для команд blit/fill без явного слоя
+        self.commands = {}  # Слой -> список (surface, позиция) или (surface, позиция, area)
+        self.blit_count = 0  # Сколько blit ушло на экран за последний flush
+        self.call_count = 0  # Сколько вызовов Surface.blits понадобилось для этого
+        self._strips = {}  # (цвет, высота) -> залитая полоса для fill
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def get_size(self):
+        return self.width, self.height
+
+    def add(self, surface, position, area=None, layer=None):
+        """Добавляет команду blit."""
+        layer = self.layer if layer is None else layer
+        command = (surface, position) if area is None else (surface, position, area)
+        commands = self.commands.get(layer)
+        if commands is None:
+            commands = self.commands[layer] = []
+        commands.append(command)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """Совместимо с Surface.blit, чтобы draw объектов мог рисовать и в экран, и в список."""
+        self.add(source, dest, area)
+
+    def fill(self, color, rect=None):
+        """
+        Заливка прямоугольника (полосы прогресса, цветные заглушки) как blit части заранее залитой полосы.
+        """
+        rect = pygame.Rect(rect) if rect is not None else pygame.Rect(0, 0, self.width, self.height)
+        rect.normalize()
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        key = (tuple(color), rect.height)
+        strip = self._strips.get(key)
+        if strip is None or strip.get_width() < rect.width:
+            strip = pygame.Surface((max(rect.width, 64), rect.height))
+            strip.fill(color)
+            if pygame.display.get_surface() is not None:
+                strip = strip.convert()
+            self._strips[key] = strip
+        self.add(strip, rect.topleft, (0, 0, rect.width, rect.height))
+
+    def flush(self, screen):
+        """Рисует все команды на screen по слоям и очищает список."""
+        blit_count = 0
+        calls = 0
+        for layer in sorted(self.commands):
+            commands = self.commands[layer]
+            if commands:
+                screen.blits(commands, False)
+                blit_count += len(commands)
+                calls += 1
+        self.commands = {}
+        self.blit_count = blit_count
+        self.call_count = calls
+        self.layer = LAYER_OBJECTS
@@ -1,9 +1,16 @@
 import pygame
 from config import BROWN, YELLOW, GREEN, BLACK, MAP_WIDTH, SCREEN_HEIGHT, SEEDS, BUILDING_CONFIG
 import images
+import game_clock
+from bed_field import BedField, bed_state_property, seed_id, seed_name, seed_timings
 import math
+import animation
+from animation import frame_index
+from atlas import alpha_usage
 
 class MapObject:
+    advance_animation = None  # Объекты без анимации AnimationClock пропускает
+
     def __init__(self, x, y, width, height, color, obj_type="generic"):
         self.x = x
         self.y = y
@@ -33,7 +40,7 @@ class MapObject:
         if self.image and self.obj_type == "house":
             screen.blit(self.image, (self.x - camera_x, self.y))
         else:
-            pygame.draw.rect(screen, self.color, (self.x - camera_x, self.y, self.width, self.height))
+            screen.fill(self.color, (self.x - camera_x, self.y, self.width, self.height))
 
     def to_dict(self):
         return {
@@ -70,9 +77,90 @@ class MarketStall(MapObject):
             "color": self.color, "obj_type": "market_stall", "movable": self.movable
         }
 
+# Готовые спрайты грядок: (почва, id семени, стадия, размер) -> [(поверхность, смещение)]
+_BED_SPRITES = {}
+_bed_sprite_images = None  # Словарь GAME_IMAGES, из которого собраны спрайты
+PLANT_STAGES = ("seedling", "sprout", "ripe")
+
+
+def bed_sprite(soil_state, soil, seed, stage, width, height):
+    """
+    Спрайт грядки с растением, собранный один раз на сочетание состояния почвы, семени и стадии.
+    Ключ кэша - имя состояния, а не поверхность: заглушки почвы у каждой грядки свои, но одинаковые,
+    поэтому кэш ограничен числом состояний, семян, стадий и размеров.
+    Если растение выходит за грядку или почва прозрачная, склеить их без потери точности нельзя -
+    тогда возвращаются две части, как при обычной отрисовке.
+    :param soil_state: str - "dry", "wet" или "ripe"
+    :param soil: pygame.Surface - изображение почвы для этого состояния
+    :return: list - пары (поверхность, смещение от левого верхнего угла грядки)
+    """
+    global _bed_sprite_images
+    if _bed_sprite_images is not images.GAME_IMAGES:
+        _BED_SPRITES.clear()  # Картинки перезагружены
+        _bed_sprite_images = images.GAME_IMAGES
+    key = (soil_state, seed, stage, width, height)
+    parts = _BED_SPRITES.get(key)
+    if parts is not None:
+        return parts
+
+    parts = [(soil, (0, 0))]
+    plant_type = seed_name(seed) if seed >= 0 else None
+    if plant_type:
+        image_key = f"{plant_type}_{PLANT_STAGES[stage]}"
+        plant_image = images.GAME_IMAGES.get(image_key)
+        if plant_image is None:
+            print(f"Ошибка: изображение для {plant_type} не найдено - '{image_key}'")
+        else:
+            offset = ((width - plant_image.get_width()) // 2, (height - plant_image.get_height()) // 2)
+            plant_rect = plant_image.get_rect(topleft=offset)
+            if soil.get_rect().contains(plant_rect) and _plant_over_soil(soil, plant_image, offset):
+                sprite = pygame.Surface(soil.get_size())
+                colorkey = soil.get_colorkey()
+                if colorkey is not None:
+                    sprite.fill(colorkey)  # Прозрачные по colorkey края почвы остаются прозрачными
+                sprite.blit(soil, (0, 0))
+                sprite.blit(plant_image, offset)
+                if colorkey is not None:
+                    sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+                if pygame.display.get_surface() is not None:
+                    sprite = sprite.convert()
+                parts = [(sprite, (0, 0))]
+            else:
+                parts.append((plant_image, offset))
+    _BED_SPRITES[key] = parts
+    return parts
+
+
+def _plant_over_soil(soil, plant_image, offset):
+    """Лежит ли каждый видимый пиксель растения на непрозрачном пикселе почвы (тогда их можно склеить)."""
+    usage = alpha_usage(soil)
+    if usage == "opaque":
+        return True
+    if usage != "binary":
+        return False
+    holes = pygame.mask.from_surface(soil)
+    holes.invert()
+    return pygame.mask.from_surface(plant_image, 0).overlap_area(holes, (-offset[0], -offset[1])) == 0
+
+
 class Bed(MapObject):
+    # Состояние грядки хранится в массивах BedField, сама грядка - лишь представление строки
+    is_planted = bed_state_property("is_planted")
+    is_watered = bed_state_property("is_watered")
+    is_sprouted = bed_state_property("is_sprouted")
+    is_ripe = bed_state_property("is_ripe")
+    last_watered_time = bed_state_property("last_watered_time")
+    ripening_start_time = bed_state_property("ripening_start_time")
+    total_ripening_time = bed_state_property("total_ripening_time")
+    first_watering_time = bed_state_property("first_watering_time")
+    watering_start_time = bed_state_property("watering_start_time")
+    watering_duration = bed_state_property("watering_duration")
+
     def __init__(self, x, y, width=32, height=32):
         super().__init__(x, y, width, height, BROWN, "bed")
+        self.field = None
+        self.index = None
+        BedField(capacity=1).add(self)  # Собственное хранилище, пока грядку не добавят в поле фермы
         self.movable = True  # Грядку можно перемещать
         self.is_planted = False
         self.plant_type = None
@@ -114,26 +202,28 @@ class Bed(MapObject):
             self.image_ripe.fill(YELLOW)
 
     def draw(self, screen, camera_x):
-        if self.is_ripe:
-            screen.blit(self.image_ripe, (self.x - camera_x, self.y))
-        elif self.is_watered and pygame.time.get_ticks() - self.last_watered_time < 10000:
-            screen.blit(self.image_wet, (self.x - camera_x, self.y))
+        # Состояние читаем прямо из массивов поля; грядка рисуется одним готовым спрайтом
+        field, index = self.field, self.index
+        if field.is_ripe[index]:
+            soil_state, soil = "ripe", self.image_ripe
+        elif field.is_watered[index] and animation.get_time() - field.last_watered_time[index] < 10000:
+            soil_state, soil = "wet", self.image_wet
         else:
-            screen.blit(self.image_dry, (self.x - camera_x, self.y))
-
-        if self.is_planted and self.plant_type:
-            try:
-                if self.is_ripe:
-                    plant_image = images.GAME_IMAGES[f"{self.plant_type}_ripe"]
-                elif self.is_sprouted:
-                    plant_image = images.GAME_IMAGES[f"{self.plant_type}_sprout"]
-                else:
-                    plant_image = images.GAME_IMAGES[f"{self.plant_type}_seedling"]
-                plant_x = self.x + (self.width - plant_image.get_width()) // 2 - camera_x
-                plant_y = self.y + (self.height - plant_image.get_height()) // 2
-                screen.blit(plant_image, (plant_x, plant_y))
-            except KeyError as e:
-                print(f"Ошибка: изображение для {self.plant_type} не найдено - {e}")
+            soil_state, soil = "dry", self.image_dry
+        seed = int(field.seed_id[index]) if field.is_planted[index] else -1
+        stage = 2 if field.is_ripe[index] else 1 if field.is_sprouted[index] else 0
+        x, y = self.x - camera_x, self.y
+        for surface, (dx, dy) in bed_sprite(soil_state, soil, seed, stage, self.width, self.height):
+            screen.blit(surface, (x + dx, y + dy))
+
+    @property
+    def plant_type(self):
+        return seed_name(self.field.seed_id[self.index])
+
+    @plant_type.setter
+    def plant_type(self, value):
+        self.field.seed_id[self.index] = seed_id(value)
+        self.field.touch(self.index)
 
     def plant_seed(self, seed):
         if not self.is_planted:
@@ -148,22 +238,15 @@ class Bed(MapObject):
             self.first_watering_time = None
             self.watering_start_time = None
 
-    def water(self):
+    def water(self, current_time=None):
         if not self.is_watered and self.is_planted and self.watering_start_time is None:
-            self.watering_start_time = pygame.time.get_ticks()
+            self.watering_start_time = game_clock.get_ticks() if current_time is None else current_time
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
+    def update(self, current_time=None):
+        if current_time is None:
+            current_time = game_clock.get_ticks()
         if self.is_planted and self.plant_type:
-            seed = next((s for s in SEEDS if s["name"] == self.plant_type), None)
-            if seed:
-                watering_interval = seed["watering_interval_minutes"] * 60000
-                sprout_time = seed["sprout_time_minutes"] * 60000
-                ripening_time = seed["ripening_time_minutes"] * 60000
-            else:
-                watering_interval = 300000
-                sprout_time = 15000
-                ripening_time = 300000
+            watering_interval, sprout_time, ripening_time = seed_timings(self.plant_type)
 
             if self.watering_start_time is not None:
                 if current_time - self.watering_start_time >= self.watering_duration:
@@ -192,6 +275,10 @@ class Bed(MapObject):
                 if total_time >= ripening_time and not self.is_ripe:
                     self.is_ripe = True
 
+    def catch_up(self, current_time):
+        """Аналитически переводит грядку к моменту current_time (например, после простоя игры)."""
+        return self.field.catch_up(current_time, [self.index]).size > 0
+
     def harvest(self):
         self.is_planted = False
         self.plant_type = None
@@ -228,10 +315,10 @@ class Mill(MapObject):
         self.process_start_time = 0
         self.process_duration = BUILDING_CONFIG["mill"]["work_time"]
         self.harvest_stored = 0
+        self.scheduler = None  # TransitionScheduler, которому мельница сообщает срок окончания работы
         # Анимация
         self.frame = 0
         self.animation_speed = 0.1  # Скорость смены кадров в секундах
-        self.last_frame_time = pygame.time.get_ticks()
         try:
             self.static_image = images.GAME_IMAGES["mill"]  # Статичное изображение
             self.animations = images.GAME_IMAGES.get("mill_animations", {})  # Анимации
@@ -253,36 +340,45 @@ class Mill(MapObject):
             self.static_image.fill((160, 82, 45))
             self.processing_frames = [self.static_image]
 
+    def advance_animation(self, now):
+        """Кадр переработки; все постройки одного типа крутятся в одной фазе."""
+        if self.is_processing:
+            self.frame = frame_index(now, self.animation_speed * 1000, len(self.processing_frames))
+
     def draw(self, screen, camera_x):
-        current_time = pygame.time.get_ticks()
         if self.is_processing and self.processing_frames:
-            # Обновляем кадр анимации
-            if current_time - self.last_frame_time >= self.animation_speed * 1000:
-                self.frame = (self.frame + 1) % len(self.processing_frames)
-                self.last_frame_time = current_time
-            screen.blit(self.processing_frames[self.frame], (self.x - camera_x, self.y))
+            screen.blit(self.processing_frames[self.frame % len(self.processing_frames)], (self.x - camera_x, self.y))
         else:
             screen.blit(self.static_image, (self.x - camera_x, self.y))
 
         # Прогресс-бар
         if self.is_processing:
-            progress = (pygame.time.get_ticks() - self.process_start_time) / self.process_duration
+            progress = (animation.get_time() - self.process_start_time) / self.process_duration
             bar_width = int(self.width * progress)
-            pygame.draw.rect(screen, GREEN, (self.x - camera_x, self.y - 10, bar_width, 5))
+            screen.fill(GREEN, (self.x - camera_x, self.y - 10, bar_width, 5))
 
-    def start_processing(self, harvest):
+    def start_processing(self, harvest, current_time=None):
         """Начинает процесс переработки урожая в продукты."""
         if not self.is_processing and harvest >= BUILDING_CONFIG["mill"]["consume"].get("harvest", 0):
             self.is_processing = True
-            self.process_start_time = pygame.time.get_ticks()
+            self.process_start_time = game_clock.get_ticks() if current_time is None else current_time
             self.harvest_stored = BUILDING_CONFIG["mill"]["consume"].get("harvest", 0)
+            if self.scheduler is not None:
+                self.scheduler.reschedule(self)
             return self.harvest_stored
         return 0
 
-    def update(self):
+    def next_deadline(self):
+        """Момент окончания переработки или None, если мельница простаивает."""
+        if self.is_processing:
+            return self.process_start_time + self.process_duration
+        return None
+
+    def update(self, current_time=None):
         """Обновляет состояние мельницы и возвращает количество произведённых продуктов."""
         if self.is_processing:
-            current_time = pygame.time.get_ticks()
+            if current_time is None:
+                current_time = game_clock.get_ticks()
             if current_time - self.process_start_time >= self.process_duration:
                 self.is_processing = False
                 self.harvest_stored = 0
@@ -290,6 +386,10 @@ class Mill(MapObject):
                 return BUILDING_CONFIG["mill"]["produce"].get("products", 0)
         return 0
 
+    def catch_up(self, current_time):
+        """Переводит мельницу к моменту current_time; переработка завершается не больше одного раза."""
+        return self.update(current_time)
+
     def to_dict(self):
         return {
             "x": self.x, "y": self.y, "width": self.width, "height": self.height,
@@ -308,10 +408,10 @@ class CanningCellar(MapObject):
         self.process_duration = BUILDING_CONFIG["canning_cellar"]["work_time"]
         self.harvest_stored = 0
         self.products_stored = 0
+        self.scheduler = None  # TransitionScheduler, которому погреб сообщает срок окончания работы
         # Анимация
         self.frame = 0
         self.animation_speed = 0.1  # Скорость смены кадров в секундах
-        self.last_frame_time = pygame.time.get_ticks()
         try:
             self.static_image = images.GAME_IMAGES.get("canning_cellar", images.GAME_IMAGES["mill"])
             self.animations = images.GAME_IMAGES.get("canning_cellar_animations", {})
@@ -334,18 +434,27 @@ class CanningCellar(MapObject):
             self.static_image.fill((128, 0, 128))
             self.processing_frames = [self.static_image]
 
-    def start_processing(self, harvest, products):
+    def start_processing(self, harvest, products, current_time=None):
         if not self.is_processing and harvest >= BUILDING_CONFIG["canning_cellar"]["consume"].get("harvest", 0) and products >= 0:
             self.is_processing = True
-            self.process_start_time = pygame.time.get_ticks()
+            self.process_start_time = game_clock.get_ticks() if current_time is None else current_time
             self.harvest_stored = BUILDING_CONFIG["canning_cellar"]["consume"].get("harvest", 0)
             self.products_stored = 0
+            if self.scheduler is not None:
+                self.scheduler.reschedule(self)
             return BUILDING_CONFIG["canning_cellar"]["consume"].get("harvest", 0)
         return 0
 
-    def update(self):
+    def next_deadline(self):
+        """Момент окончания консервирования или None, если погреб простаивает."""
+        if self.is_processing:
+            return self.process_start_time + self.process_duration
+        return None
+
+    def update(self, current_time=None):
         if self.is_processing:
-            current_time = pygame.time.get_ticks()
+            if current_time is None:
+                current_time = game_clock.get_ticks()
             if current_time - self.process_start_time >= self.process_duration:
                 self.is_processing = False
                 self.harvest_stored = 0
@@ -353,22 +462,26 @@ class CanningCellar(MapObject):
                 return BUILDING_CONFIG["canning_cellar"]["produce"].get("products", 0)
         return 0
 
+    def catch_up(self, current_time):
+        """Переводит погреб к моменту current_time; консервирование завершается не больше одного раза."""
+        return self.update(current_time)
+
+    def advance_animation(self, now):
+        """Кадр переработки; все постройки одного типа крутятся в одной фазе."""
+        if self.is_processing:
+            self.frame = frame_index(now, self.animation_speed * 1000, len(self.processing_frames))
+
     def draw(self, screen, camera_x):
-        current_time = pygame.time.get_ticks()
         if self.is_processing and self.processing_frames:
-            # Обновляем кадр анимации
-            if current_time - self.last_frame_time >= self.animation_speed * 1000:
-                self.frame = (self.frame + 1) % len(self.processing_frames)
-                self.last_frame_time = current_time
-            screen.blit(self.processing_frames[self.frame], (self.x - camera_x, self.y))
+            screen.blit(self.processing_frames[self.frame % len(self.processing_frames)], (self.x - camera_x, self.y))
         else:
             screen.blit(self.static_image, (self.x - camera_x, self.y))
 
         # Прогресс-бар
         if self.is_processing:
-            progress = (pygame.time.get_ticks() - self.process_start_time) / self.process_duration
+            progress = (animation.get_time() - self.process_start_time) / self.process_duration
             bar_width = int(self.width * progress)
-            pygame.draw.rect(screen, GREEN, (self.x - camera_x, self.y - 10, bar_width, 5))
+            screen.fill(GREEN, (self.x - camera_x, self.y - 10, bar_width, 5))
 
     def to_dict(self):
         return {
@@ -396,7 +509,8 @@ class Player:
         self.language = language
         self.frame = 0  # Текущий кадр анимации
         self.animation_speed = 0.1  # Скорость смены кадров (в секундах)
-        self.last_frame_time = pygame.time.get_ticks()
+        self.animation_key = "idle"  # Анимация, которая сейчас проигрывается
+        self.animation_start = 0  # Когда она началась
 
         # Загрузка анимаций
         try:
@@ -452,9 +566,9 @@ class Player:
             for state in self.animations:
                 self.animations[state][0].fill((255, 0, 0, 128))
 
-    def start_action(self, action):
+    def start_action(self, action, current_time=None):
         self.state = action
-        self.action_start_time = pygame.time.get_ticks()
+        self.action_start_time = game_clock.get_ticks() if current_time is None else current_time
         self.frame = 0  # Сбрасываем кадр при смене действия
 
     def move(self):
@@ -494,24 +608,21 @@ class Player:
         elif self.state in ["idle", "watering", "harvesting", "processing"]:
             pass
 
+    def advance_animation(self, now):
+        """Выбирает анимацию по состоянию и направлению и кадр в ней; смена анимации начинает её с первого кадра."""
+        animation_key = f"walking_{self.direction}" if self.state == "walking" else self.state
+        if animation_key != self.animation_key:
+            self.animation_key = animation_key
+            self.animation_start = now
+        frames = self.animations.get(animation_key)
+        self.frame = frame_index(now, self.animation_speed * 1000, len(frames), self.animation_start) if frames else 0
+
     def draw(self, screen, camera_x):
         screen_x = self.x - camera_x
         if 0 <= screen_x <= screen.get_width() and 0 <= self.y <= screen.get_height():
             try:
-                # Выбираем анимацию в зависимости от состояния и направления
-                if self.state == "walking":
-                    animation_key = f"walking_{self.direction}"
-                else:
-                    animation_key = self.state
-
-                # Обновляем кадр анимации
-                current_time = pygame.time.get_ticks()
-                if current_time - self.last_frame_time >= self.animation_speed * 1000:
-                    self.frame = (self.frame + 1) % len(self.animations[animation_key])
-                    self.last_frame_time = current_time
-
-                # Рисуем текущий кадр
-                image = self.animations[animation_key][self.frame]
+                # Кадр выбран AnimationClock, здесь только рисуем
+                image = self.animations[self.animation_key][self.frame]
                 screen.blit(image, (screen_x, self.y))
             except (KeyError, IndexError) as e:
                 # Если что-то пошло не так, рисуем заглушку
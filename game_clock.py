@@ -0,0 +1,87 @@
+# game_clock.py
+import pygame
+
+
+class PygameClock:
+    """Часы реального времени на основе pygame.time.get_ticks()."""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+class ManualClock:
+    """Часы, которые идут только при явном вызове advance (для безголовых прогонов)."""
+
+    def __init__(self, start_time=0):
+        self.time = start_time
+
+    def get_ticks(self):
+        return self.time
+
+    def advance(self, ms):
+        self.time += ms
+        return self.time
+
+    def set_time(self, game_time):
+        self.time = game_time
+
+
+class GameClock:
+    """
+    Игровое время, которое переживает перезапуск: get_ticks() базовых часов плюс смещение.
+    Смещение выставляется при загрузке сохранения, поэтому сохранённые метки времени остаются осмысленными.
+    """
+
+    def __init__(self, base_clock=None, start_time=0):
+        self.base_clock = base_clock if base_clock is not None else PygameClock()
+        self.offset = 0
+        self.set_time(start_time)
+
+    def get_ticks(self):
+        return self.base_clock.get_ticks() + self.offset
+
+    def set_time(self, game_time):
+        """Переводит часы так, чтобы get_ticks() сейчас вернул game_time."""
+        self.offset = game_time - self.base_clock.get_ticks()
+
+
+def adjustable(clock):
+    """
+    Часы с переводом времени (get_ticks и set_time). Часы только с get_ticks() (например, PygameClock)
+    оборачиваются в GameClock, который сейчас показывает то же время.
+    """
+    if hasattr(clock, "set_time"):
+        return clock
+    return GameClock(clock, clock.get_ticks())
+
+
+_clock = GameClock()
+
+
+def set_clock(clock):
+    """
+    Подменяет глобальные игровые часы (например, на ManualClock).
+    Часы без set_time (PygameClock) оборачиваются в GameClock, чтобы resume мог их переводить.
+    """
+    global _clock
+    _clock = adjustable(clock)
+
+
+def get_clock():
+    return _clock
+
+
+def resume(game_time, offline_ms=0):
+    """
+    Продолжает игровое время с сохранённого момента.
+    :param game_time: float - игровое время на момент сохранения
+    :param offline_ms: float - сколько реального времени прошло с сохранения
+    :return: float - текущее игровое время
+    """
+    _clock.set_time(game_time + max(0, offline_ms))
+    return _clock.get_ticks()
+
+
+def get_ticks():
+    """Текущее игровое время в миллисекундах."""
+    return _clock.get_ticks()
@@ -1,8 +1,5 @@
 import pygame
-import time
-import random  # Оставляем только используемые импорты
-from config import MAP_WIDTH, SCREEN_HEIGHT, LEVEL_THRESHOLDS, SEEDS
-from translations import get_text
+from config import MAP_WIDTH, SCREEN_HEIGHT, SPATIAL_INDEX, SPATIAL_CELL_SIZE, DIRTY_RECTS
 from entities import Player, Bed, MapObject, MarketStall, Mill, CanningCellar
 from menus import MenuManager
 from rendering import render_game
@@ -10,7 +7,15 @@ from input_handler import handle_input
 from game_utils import snap_to_grid
 from save_load import save_game
 from quadtree import QuadTree
+from spatial_hash import SpatialHashGrid
 from notifications import NotificationManager
+from simulation import FarmSimulation
+from registry import EntityList
+from dirty_rects import DirtyRegions
+from occupancy import OccupancyGrid
+from tile_map import TileMap, GRASS_TILES
+import terrain
+import game_clock
 import fonts
 
 def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0, harvest_count=0, level=1, coins=10,
@@ -23,7 +28,6 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
     notification_manager = NotificationManager(language,fonts)
     menu_manager = MenuManager(language, coins, harvest, products, level, notification_manager=notification_manager, fonts=fonts)
     boundary = pygame.Rect(0, 0, MAP_WIDTH, SCREEN_HEIGHT)
-    quad_tree = QuadTree(boundary, capacity=4)
 
 
     # Инициализация game_context до его использования
@@ -37,7 +41,7 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
         "last_click_time": 0,
         "window_active": True,
         "window_minimized": False,
-        "map_tiles": map_tiles if map_tiles is not None else [],
+        "map_tiles": map_tiles if map_tiles is not None else TileMap.for_area(MAP_WIDTH, SCREEN_HEIGHT),
         "player": player,  # Добавляем данные для сохранения
         "house": house,
         "objects": objects,
@@ -71,8 +75,6 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
         objects = [Bed(bed1_x, bed1_y, width=32, height=32), Bed(bed2_x, bed2_y, width=32, height=32),
                    Bed(bed3_x, bed3_y, width=32, height=32), house, market_stall,
                    Mill(mill_x, mill_y), CanningCellar(cellar_x, cellar_y)]
-        for obj in objects:
-            quad_tree.insert(obj)
 
         player = Player(snap_to_grid(screen_width // 2 + 100, grid_size=32),
                         snap_to_grid(screen_height - 128, grid_size=32), 64, 64, 5, language=language)
@@ -86,12 +88,7 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
         harvest_count = 0
 
         # Генерация тайлов травы для фона
-        tile_size = 32
-        map_tiles = []
-        for x in range(0, MAP_WIDTH, tile_size):
-            for y in range(0, SCREEN_HEIGHT, tile_size):
-                tile_type = random.choice(["grass_tile_1", "grass_tile_2", "grass_tile_3"])
-                map_tiles.append({"x": x, "y": y, "type": tile_type})
+        map_tiles = TileMap.generate(terrain.new_seed(), MAP_WIDTH, SCREEN_HEIGHT, tile_size=32, palette=GRASS_TILES)
         game_context["map_tiles"] = map_tiles
 
         # Обновляем game_context для новой игры
@@ -116,8 +113,6 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
             market_y = snap_to_grid(house.y + 120, grid_size=32)  # Ниже дома
             market_stall = MarketStall(market_x, market_y)
             objects.append(market_stall)
-        for obj in objects:
-            quad_tree.insert(obj)
 
         player.language = language
         player.x = max(0, min(player.x, MAP_WIDTH - player.width))
@@ -143,20 +138,37 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
     running = True
 
 
-    def find_nearest_bed_quad(p, condition=None):  # Изменяем имя параметра, чтобы избежать затенения
-        player_pos = (p.x + p.width // 2, p.y + p.height // 2)
-        nearest, dist = quad_tree.find_nearest(player_pos, condition)
-        return nearest
-
-    def find_nearest_mill_quad(p, condition=None):  # Изменяем имя параметра
-        player_pos = (p.x + p.width // 2, p.y + p.height // 2)
-        nearest, dist = quad_tree.find_nearest(player_pos, condition)
-        return nearest
-
-    def find_nearest_canning_cellar_quad(p, condition=None):  # Изменяем имя параметра
-        player_pos = (p.x + p.width // 2, p.y + p.height // 2)
-        nearest, dist = quad_tree.find_nearest(player_pos, condition)
-        return nearest
+    # Пространственный индекс строится сразу по всем объектам, а не поштучными insert
+    if SPATIAL_INDEX == "hash_grid":
+        spatial_index = SpatialHashGrid.from_objects(boundary, objects, cell_size=SPATIAL_CELL_SIZE)
+    else:
+        spatial_index = QuadTree.from_objects(boundary, objects, capacity=4)
+
+    # Реестр объектов: постройка, перемещение и снос (в том числе из BuildMenu) обновляют индексы сами
+    objects = EntityList(objects)
+    registry = objects.registry
+    game_context["objects"] = objects
+    game_context["spatial_index"] = spatial_index  # Для отсечения невидимых объектов при отрисовке
+
+    simulation = FarmSimulation(player, objects, clock=game_clock.get_clock(), coins=coins, harvest=harvest,
+                                products=products, level=level, harvest_count=harvest_count, language=language,
+                                notification_manager=notification_manager, spatial_index=spatial_index,
+                                registry=registry)
+    registry.add_listener(on_add=spatial_index.insert, on_remove=spatial_index.remove, on_move=spatial_index.move)
+    registry.add_listener(on_add=simulation.add_object, on_remove=simulation.remove_object)
+
+    # Занятость клеток сетки строительства для проверки места под постройку
+    occupancy = OccupancyGrid.from_objects(MAP_WIDTH, SCREEN_HEIGHT, objects)
+    registry.add_listener(on_add=occupancy.add, on_remove=occupancy.remove, on_move=occupancy.move)
+    game_context["occupancy"] = occupancy
+    menu_manager.menus["build"].occupancy = occupancy
+    game_context.pop("placement_preview", None)  # Предпросмотр пересоздаётся под новую сетку
+
+    # Режим грязных областей: перерисовываем и выводим только то, что изменилось
+    dirty_regions = None
+    if DIRTY_RECTS:
+        dirty_regions = DirtyRegions(screen.get_size())
+        dirty_regions.watch(registry, simulation)
 
     result = None  # Инициализируем result, чтобы избежать ошибки
     while running:
@@ -186,7 +198,10 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
                         game_context["window_active"] = False
                     else:
                         game_context["window_active"] = True
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            if dirty_regions is not None and event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN,
+                                                             pygame.ACTIVEEVENT, pygame.VIDEOEXPOSE):
+                dirty_regions.mark_all()  # Действия игрока могут поменять что угодно на экране
+            if event.type == pygame.MOUSEBUTTONDOWN:
                 result = handle_input(player, objects, camera_x, screen_width, MAP_WIDTH, screen_height, game_context, coins,
                                       harvest, harvest_count, level, products, event)
                 print(f"Handle input result: {result}")  # Отладка
@@ -205,22 +220,9 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
                             "products": products
                         })
                     if result.get("action") == "build":
-                        if objects:
-                            new_obj = objects[-1]
-                            if isinstance(new_obj, Bed):
-                                grid_x = snap_to_grid(new_obj.x, grid_size=32)
-                                grid_y = snap_to_grid(new_obj.y, grid_size=32)
-                                new_obj.x = grid_x
-                                new_obj.y = grid_y
-                            if new_obj not in quad_tree.get_all_objects():
-                                quad_tree.insert(new_obj)
-                                print(f"Inserted into QuadTree: {new_obj.obj_type} at ({new_obj.x}, {new_obj.y})")
-                    elif result.get("action") == "plant":
-                        for obj in objects:
-                            if obj.obj_type == "bed" and obj.is_planted and not obj.is_watered:
-                                quad_tree.remove(obj)
-                                quad_tree.insert(obj)
-                                break
+                        # BuildMenu уже привязал объект к сетке и добавил в objects,
+                        # реестр вставил его в пространственный индекс, симуляцию и сетку занятости
+                        pass
                     elif result.get("action") == "sell":
                         pass
                     elif result.get("action") == "start_move_preview":
@@ -228,134 +230,32 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
                         game_context["preview_obj"] = result.get("preview_obj")  # Сохраняем предпросмотр
                     elif result.get("action") == "move_complete":
                         moved_obj = result.get("moved_obj")
-                        if moved_obj and isinstance(moved_obj, Bed):
-                            grid_x = snap_to_grid(moved_obj.x, grid_size=32)
-                            grid_y = snap_to_grid(moved_obj.y, grid_size=32)
-                            moved_obj.x = grid_x
-                            moved_obj.y = grid_y
-                            quad_tree.update_position(moved_obj, moved_obj.x, moved_obj.y)
+                        if moved_obj:
+                            # BuildMenu уже привязал и проверил новое место; реестр обновит индексы
+                            registry.move(moved_obj)
                         game_context["dragging_obj"] = None
                         game_context["preview_obj"] = None
                     elif result.get("action") == "destroy_complete":
-                        destroyed_obj = result.get("destroyed_obj")
-                        if destroyed_obj:
-                            quad_tree.remove(destroyed_obj)
+                        pass  # BuildMenu снял объект через objects.pop, реестр убрал его из индексов
 
         notification_manager.update()
 
-        target_beds = [obj for obj in objects if obj.obj_type == "bed"]
-        mills = [obj for obj in objects if obj.obj_type == "mill"]
-        canning_cellars = [obj for obj in objects if obj.obj_type == "canning_cellar"]
-        for bed in target_beds:
-            bed.update()
-        for mill in mills:
-            products += mill.update()
-        for cellar in canning_cellars:
-            products += cellar.update()
-
-        if player.state in ["idle", "walking", "watering", "harvesting"]:
-            current_time_ms = pygame.time.get_ticks()
-            if player.state in ["watering", "harvesting"]:
-                action_duration = 2000
-                if current_time_ms - player.action_start_time >= action_duration:
-                    player.state = "idle"
-
-            if player.state == "idle":
-                game_context["target_canning_cellar"] = None
-                game_context["target_mill"] = None
-                game_context["target_bed"] = None
-
-                if harvest >= 4:
-                    target_cellar = find_nearest_canning_cellar_quad(
-                        player,
-                        lambda c: c.obj_type == "canning_cellar" and not c.is_processing
-                    )
-                    if target_cellar:
-                        game_context["target_canning_cellar"] = target_cellar
-                        player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
-                        cellar_rect = pygame.Rect(target_cellar.x, target_cellar.y, target_cellar.width, target_cellar.height)
-                        if player_rect.colliderect(cellar_rect):
-                            harvest_used = target_cellar.start_processing(harvest, products)
-                            harvest -= harvest_used
-                        else:
-                            player.target_x = target_cellar.x + target_cellar.width // 2 - player.width // 2
-                            player.target_y = target_cellar.y + target_cellar.height // 2 - player.height // 2
-                            player.target_x = max(0, min(player.target_x, MAP_WIDTH - player.width))
-                            player.target_y = max(0, min(player.target_y, SCREEN_HEIGHT - player.height))
-                            player.state = "walking"
-                        continue
-
-                if harvest >= 2:
-                    target_mill = find_nearest_mill_quad(
-                        player,
-                        lambda m: m.obj_type == "mill" and not m.is_processing
-                    )
-                    if target_mill:
-                        game_context["target_mill"] = target_mill
-                        player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
-                        mill_rect = pygame.Rect(target_mill.x, target_mill.y, target_mill.width, target_mill.height)
-                        if player_rect.colliderect(mill_rect):
-                            harvest_used = target_mill.start_processing(harvest)
-                            harvest -= harvest_used
-                        else:
-                            player.target_x = target_mill.x + target_mill.width // 2 - player.width // 2
-                            player.target_y = target_mill.y + target_mill.height // 2 - player.height // 2
-                            player.target_x = max(0, min(player.target_x, MAP_WIDTH - player.width))
-                            player.target_y = max(0, min(player.target_y, SCREEN_HEIGHT - player.height))
-                            player.state = "walking"
-                        continue
-
-                target_bed = find_nearest_bed_quad(
-                    player,
-                    lambda b: b.obj_type == "bed" and b.is_planted and not b.is_watered and b.watering_start_time is None
-                )
-                if not target_bed:
-                    target_bed = find_nearest_bed_quad(
-                        player,
-                        lambda b: b.obj_type == "bed" and b.is_ripe
-                    )
-                if target_bed:
-                    game_context["target_bed"] = target_bed
-                    player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
-                    bed_rect = pygame.Rect(target_bed.x, target_bed.y, target_bed.width, target_bed.height)
-                    if player_rect.colliderect(bed_rect):
-                        if target_bed.is_planted and not target_bed.is_watered and not target_bed.is_ripe and target_bed.watering_start_time is None:
-                            target_bed.water()
-                            player.start_action("watering")
-                            player.direction = "right"
-                        elif target_bed.is_ripe:
-                            seed = next((s for s in SEEDS if s["name"] == target_bed.plant_type), SEEDS[0])
-                            harvest_yield = seed["harvest_yield"]
-                            target_bed.harvest()
-                            player.start_action("harvesting")
-                            player.direction = "right"
-                            harvest += harvest_yield
-                            harvest_count += 1
-                            harvest_threshold = LEVEL_THRESHOLDS.get(level, float('inf'))
-                            if harvest_count >= harvest_threshold:
-                                level = min(level + 1, max(LEVEL_THRESHOLDS.keys()))
-                                game_context["level"] = level
-                                notification_manager.add_notification("level_up")
-                                print(get_text("Level up! New level: {level}", language).format(level=level))
-                    else:
-                        player.target_x = target_bed.x - player.width // 2
-                        player.target_y = target_bed.y - player.height // 2
-                        player.target_x = max(0, min(player.target_x, MAP_WIDTH - player.width))
-                        player.target_y = max(0, min(player.target_y, SCREEN_HEIGHT - player.height))
-                        player.state = "walking"
-
-            if player.state != "walking" or game_context["target_canning_cellar"] is None:
-                game_context["target_canning_cellar"] = None
-            if player.state != "walking" or game_context["target_mill"] is None:
-                game_context["target_mill"] = None
-            if player.state != "walking" or game_context["target_bed"] is None:
-                game_context["target_bed"] = None
-
-        player.x = max(0, min(player.x, MAP_WIDTH - player.width))
-        player.y = max(0, min(player.y, SCREEN_HEIGHT - player.height))
-        player.move()
+        # Симуляция идёт фиксированными шагами независимо от частоты кадров
+        simulation.coins, simulation.harvest, simulation.products = coins, harvest, products
+        simulation.update()
+        harvest, products = simulation.harvest, simulation.products
+        level, harvest_count = simulation.level, simulation.harvest_count
+        game_context["level"] = level
+        game_context.update(simulation.targets)
 
         clock.tick(60)  # Убираем зависимость от window_minimized
+        if dirty_regions is not None:
+            build_menu = menu_manager.menus["build"]
+            overlays_active = bool(menu_manager.active_menu) or build_menu.build_action in [
+                "build_preview", "move_preview", "destroy"]
+            screen.set_clip(dirty_regions.begin_frame(camera_x, (coins, harvest, products, level, language),
+                                                      overlays_active, bool(notification_manager.notifications),
+                                                      game_context.get("visible_objects", ()), player))
         camera_x = render_game(screen , game_context["language"], player, objects, camera_x, screen_width, MAP_WIDTH, coins, harvest, products,
                                level, game_context,fonts=fonts)
         menu_manager.draw(screen, camera_x, harvest, products)  # Рисуем меню
@@ -363,7 +263,11 @@ def game_loop(screen, player=None, house=None, objects=None, initial_camera_x=0,
         # Обновляем camera_x в game_context
         game_context["camera_x"] = camera_x
 
-        pygame.display.flip()
+        if dirty_regions is not None:
+            screen.set_clip(None)
+            dirty_regions.present()
+        else:
+            pygame.display.flip()
 
         if result in ["exit", "main_menu"]:
             game_context.update({
@@ -0,0 +1,76 @@
+# hud.py
+import pygame
+from config import BLACK
+import images
+from translations import get_text
+from surface_cache import scale_surface
+
+ICON_SIZE = (16, 16)
+BAR_HEIGHT = 26  # 16 пикселей иконки + 5 сверху + 5 снизу
+
+
+class ResourceBar:
+    """
+    Полоса ресурсов (монеты, урожай, продукты, уровень) в левом верхнем углу.
+    Собирается в одну поверхность вместе с прямоугольниками подсказок и пересобирается,
+    только когда меняются показатели или язык.
+    """
+
+    def __init__(self, font=None):
+        """:param font: pygame.font.Font - шрифт показателей (по умолчанию системный 16pt)"""
+        self.font = font if font is not None else pygame.font.Font(None, 16)
+        self.state = None
+        self.surface = None
+        self.rects = {}  # "coins" / "harvest" / "products" / "level" -> прямоугольник подсказки на экране
+        self._icons = None
+
+    def _load_icons(self):
+        self._icons = [scale_surface(images.GAME_IMAGES[name], ICON_SIZE)
+                       for name in ("coin_main", "harvest", "product")]
+
+    def update(self, coins, harvest, products, level, language):
+        """Пересобирает полосу, если показатели или язык изменились."""
+        state = (coins, harvest, products, level, language)
+        if state == self.state:
+            return
+        self.state = state
+        if self._icons is None:
+            self._load_icons()
+        font = self.font
+        level_display = f"{get_text('Level', language)}: {level}"
+        texts = [font.render(str(value), True, BLACK) for value in (coins, harvest, products)]
+        level_surface = font.render(level_display, True, BLACK)
+
+        width = sum(icon.get_width() + 5 + text.get_width() + 30 for icon, text in zip(self._icons, texts))
+        width += level_surface.get_width() + 10
+        surface = pygame.Surface((width, BAR_HEIGHT))
+        surface.fill((211, 211, 211))  # Светло-серый фон
+
+        icon_height = ICON_SIZE[1]
+        y_offset = (BAR_HEIGHT - icon_height) // 2
+        icon_center_y = y_offset + icon_height // 2  # Текст центрируется по вертикали относительно иконки
+        x_offset = 0
+        rects = {}
+        for name, icon, text in zip(("coins", "harvest", "products"), self._icons, texts):
+            surface.blit(icon, (x_offset + 5, y_offset))
+            surface.blit(text, (x_offset + 5 + icon.get_width() + 5, icon_center_y - text.get_height() // 2))
+            rects[name] = pygame.Rect(x_offset + 5, y_offset, icon.get_width() + text.get_width() + 5 + 30,
+                                      icon.get_height())
+            x_offset += icon.get_width() + 5 + text.get_width() + 30
+        surface.blit(level_surface, (x_offset + 5, icon_center_y - level_surface.get_height() // 2))
+        rects["level"] = pygame.Rect(x_offset + 5, y_offset, level_surface.get_width(), level_surface.get_height())
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        self.surface = surface
+        self.rects = rects
+
+    def draw(self, screen):
+        screen.blit(self.surface, (0, 0))
+
+    def hit_test(self, pos):
+        """:return: str - имя показателя под точкой или None"""
+        for name, rect in self.rects.items():
+            if rect.collidepoint(pos):
+                return name
+        return None
@@ -1,6 +1,20 @@
 import pygame
 import os
 from config import BROWN, YELLOW, GREEN, BLACK, GRAY, SEEDS, WHITE
+from atlas import pack_images
+
+# Заполняется в main через load_game_images(); пустой словарь позволяет создавать
+# сущности без загруженных картинок (например, в безголовой симуляции)
+GAME_IMAGES = {}
+ATLAS = None  # TextureAtlas, в который упакованы спрайты GAME_IMAGES
+
+
+def load_packed_images():
+    """Загружает изображения игры и упаковывает мелкие спрайты в страницы атласа."""
+    global ATLAS
+    packed, ATLAS = pack_images(load_game_images())
+    print(f"Атлас: {ATLAS.surface_count()} страниц, спрайты: {ATLAS.stats}")
+    return packed
 
 
 def load_game_images():
@@ -178,6 +192,4 @@ def load_game_images():
                         IMAGES[f"{obj_type}_animations"] = states
                         print(f"Loaded states for {obj_type}: {list(states.keys())}")
 
-        return IMAGES
-
-    GAME_IMAGES = {}
\ No newline at end of file
+        return IMAGES
\ No newline at end of file
@@ -1,5 +1,4 @@
 import pygame
-from config import SCREEN_HEIGHT
 from menus import WheelMenu, SeedMenu, BuildMenu, MarketMenu
 from game_utils import snap_to_grid
 from entities import Bed
@@ -65,12 +64,7 @@ def handle_input(player, objects, camera_x, screen_width, map_width, screen_heig
                         screen_y = menu.center_y
                         menu_rect = pygame.Rect(screen_x - menu.radius, screen_y - menu.radius, 2 * menu.radius, 2 * menu.radius)
                     elif isinstance(menu, (SeedMenu, BuildMenu, MarketMenu)):
-                        if isinstance(menu, SeedMenu):
-                            menu_rect = pygame.Rect(screen_width - 200, 0, 200, SCREEN_HEIGHT)
-                        elif isinstance(menu, BuildMenu):
-                            menu_rect = pygame.Rect(screen_width - 240, 0, 240, SCREEN_HEIGHT)
-                        elif isinstance(menu, MarketMenu):
-                            menu_rect = pygame.Rect((screen_width - 400) // 2, (SCREEN_HEIGHT - 250) // 2, 400, 250)
+                        menu_rect = menu.layout(screen_width).rect("panel")  # Область меню из его дерева элементов
                     if menu_rect and not menu_rect.collidepoint(mx, my):
                         menu_manager.close_all()
                         return None
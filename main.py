@@ -14,6 +14,7 @@ import random
 from notifications import NotificationManager
 import fonts
 from fonts import initialize_fonts
+from surface_cache import render_text, scale_surface
 
 
 
@@ -45,7 +46,7 @@ def show_save_dialog(screen, game_context, language, fonts=None):
 
         # Текст запроса
         display_text = confirmation_text if confirmation_text else get_text("Do you want to save the game?", language)
-        text = font.render(display_text, True, WHITE)
+        text = render_text(font, display_text, True, WHITE)
         text_rect = text.get_rect(center=(screen.get_width() // 2, 50))
         screen.blit(text, text_rect)
 
@@ -81,13 +82,13 @@ def show_save_dialog(screen, game_context, language, fonts=None):
         # Отображаем кнопки
         for button in buttons:
             pygame.draw.rect(screen, GRAY if button["rect"].collidepoint(mx, my) else WHITE, button["rect"])
-            text_surf = small_font.render(button["text"], True, BLACK)
+            text_surf = render_text(small_font, button["text"], True, BLACK)
             screen.blit(text_surf, (button["rect"].x + 10, button["rect"].y + 10))
 
         # Отображаем слоты
         for slot_button in slot_buttons:
             pygame.draw.rect(screen, GRAY if slot_button["rect"].collidepoint(mx, my) else WHITE, slot_button["rect"])
-            text_surf = small_font.render(slot_button["text"], True, BLACK)
+            text_surf = render_text(small_font, slot_button["text"], True, BLACK)
             screen.blit(text_surf, (slot_button["rect"].x + 10, slot_button["rect"].y + 10))
 
         pygame.display.flip()
@@ -135,10 +136,10 @@ def show_load_dialog(screen, language, menu, fonts=None):
         if bg_height != SCREEN_HEIGHT:
             scale_factor = SCREEN_HEIGHT / bg_height
             new_width = int(bg_width * scale_factor)
-            background = pygame.transform.scale(background, (new_width, SCREEN_HEIGHT))
+            background = scale_surface(background, (new_width, SCREEN_HEIGHT))
             bg_width = new_width
         if bg_width < screen.get_width():
-            scaled_background = pygame.transform.scale(background, (screen.get_width(), SCREEN_HEIGHT))
+            scaled_background = scale_surface(background, (screen.get_width(), SCREEN_HEIGHT))
             screen.blit(scaled_background, (0, 0))
         else:
             clip_x = (bg_width - screen.get_width()) // 2
@@ -151,7 +152,7 @@ def show_load_dialog(screen, language, menu, fonts=None):
 
         # Текст запроса на уровне текста "New Game" из главного меню
         button_width = 340  # Ширина кнопок
-        text = font.render(get_text("Select a save to load:", language), True, WHITE)
+        text = render_text(font, get_text("Select a save to load:", language), True, WHITE)
         text_x = screen.get_width() * 2 //3 + button_width // 2-70  # Центр группы кнопок
         text_rect = text.get_rect(center=(text_x, 50))  # На уровне "New Game"
         screen.blit(text, text_rect)
@@ -193,24 +194,24 @@ def show_load_dialog(screen, language, menu, fonts=None):
                 button_image = menu.button_hover if slot_button["rect"].collidepoint(mx, my) else menu.button_normal
                 screen.blit(button_image, (slot_button["rect"].x, slot_button["rect"].y))  # Фоновое изображение
                 # Текст даты, начинается слева
-                date_text = small_font.render(slot_button["text"], True, BLACK)
+                date_text = render_text(small_font, slot_button["text"], True, BLACK)
                 date_text_rect = date_text.get_rect(topleft=(slot_button["rect"].x + 20, slot_button["rect"].y + 10))  # Слева с отступом
                 screen.blit(date_text, date_text_rect)
                 # Иконки ресурсов (под датой), 16x16, с расстоянием, внутри кнопки
                 data = save_slots[slot_buttons.index(slot_button)]["data"]
-                coin_icon = pygame.transform.scale(images.GAME_IMAGES["coin_main"], (16, 16))
-                harvest_icon = pygame.transform.scale(images.GAME_IMAGES["harvest"], (16, 16))
-                product_icon = pygame.transform.scale(images.GAME_IMAGES["product"], (16, 16))
+                coin_icon = scale_surface(images.GAME_IMAGES["coin_main"], (16, 16))
+                harvest_icon = scale_surface(images.GAME_IMAGES["harvest"], (16, 16))
+                product_icon = scale_surface(images.GAME_IMAGES["product"], (16, 16))
                 resource_y = slot_button["rect"].y + 30  # Вторая строка под датой
                 coin_x = slot_button["rect"].x + 15  # Начало слева
                 screen.blit(coin_icon, (coin_x, resource_y))
-                coin_value = small_font.render(str(data.get("coins", 0)), True, BLACK)
+                coin_value = render_text(small_font, str(data.get("coins", 0)), True, BLACK)
                 screen.blit(coin_value, (coin_x + 20, resource_y))
                 screen.blit(harvest_icon, (coin_x + 60, resource_y))
-                harvest_value = small_font.render(str(data.get("harvest", 0)), True, BLACK)
+                harvest_value = render_text(small_font, str(data.get("harvest", 0)), True, BLACK)
                 screen.blit(harvest_value, (coin_x + 80, resource_y))
                 screen.blit(product_icon, (coin_x + 120, resource_y))
-                product_value = small_font.render(str(data.get("products", 0)), True, BLACK)
+                product_value = render_text(small_font, str(data.get("products", 0)), True, BLACK)
                 screen.blit(product_value, (coin_x + 140, resource_y))
 
         pygame.display.flip()
@@ -279,7 +280,7 @@ def main():
     pygame.display.set_caption("Gay Farm Game")
     clock = pygame.time.Clock()
 
-    images.GAME_IMAGES = images.load_game_images()
+    images.GAME_IMAGES = images.load_packed_images()
 
     menu_language = load_menu_language()
     saved_data = load_game(screen)
@@ -7,6 +7,8 @@ from entities import Bed, MapObject, Mill, CanningCellar, MarketStall
 from notifications import NotificationManager
 from fonts import initialize_fonts
 import fonts
+from surface_cache import render_text, scale_surface
+from ui_layout import Layout, filled, outlined
 
 class WheelMenu:
     def __init__(self, language, fonts=None):
@@ -110,6 +112,9 @@ class SeedMenu:
         self.hovered_buttons = {}
         self.error_message = None
         self.error_timer = 0
+        self._layout = None  # ui_layout.Layout, пересобирается при смене ширины экрана, уровня или языка
+        self._tooltips = {}  # (семя, язык, изображения) -> готовая подсказка
+        self.available_seeds = []
 
         # Формируем seed_options из SEEDS
         self.seed_options = []
@@ -141,21 +146,50 @@ class SeedMenu:
         self.coins = coins
         self.level = level
 
+    def layout(self, screen_width):
+        """
+        Дерево элементов меню: фон, кнопка возврата и сетка семян.
+        Пересчитывается только при смене ширины экрана, уровня, языка или набора изображений.
+        """
+        key = (screen_width, self.level, self.language, id(images.GAME_IMAGES))
+        if self._layout is not None and self._layout.key == key:
+            return self._layout
+        menu_width = 200
+        seeds_per_row = 2
+        seed_width = 64  # Новый размер кнопки
+        seed_height = 64  # Новый размер кнопки
+        start_y = 60
+        # Вычисляем общую ширину строки кнопок
+        total_row_width = seeds_per_row * seed_width + (seeds_per_row - 1) * 10  # 138 пикселей для 2 кнопок
+        # Начальная позиция X для центрирования относительно центра меню
+        start_x = screen_width - menu_width // 2 - (total_row_width // 2)
+
+        layout = Layout(key)
+        layout.add("panel", (screen_width - menu_width, 0, menu_width, SCREEN_HEIGHT), interactive=False)
+        layout.add("close", (screen_width - 42, 10, 32, 32))  # 10 справа, 10 сверху
+        self.available_seeds = [seed for seed in SEEDS if seed["unlock_level"] <= self.level]
+        for i in range(len(self.available_seeds)):
+            row = i // seeds_per_row
+            col = i % seeds_per_row
+            layout.add(f"seed_{i}", (start_x + col * (seed_width + 10),  # Отступ 10 пикселей между кнопками
+                                     start_y + row * (seed_height + 10), seed_width, seed_height))
+        self._layout = layout
+        return layout
+
     def handle_input(self, event, screen_width, objects, camera_x):
         if not self.is_open:
             return None
 
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mx, my = pygame.mouse.get_pos()
-            close_rect = pygame.Rect(screen_width - 30, 10, 20, 20)
-            if close_rect.collidepoint(mx, my):
+            layout = self.layout(screen_width)
+            hit = layout.hit_test((mx, my))
+            if hit == "close":
                 self.close()
                 return "close_seed_menu"
-            available_seeds = [seed for seed in SEEDS if seed["unlock_level"] <= self.level]
-            for i, seed in enumerate(available_seeds):
-                row, col = i // 2, i % 2
-                rect = pygame.Rect(screen_width - 180 + col * (64 + 10), 60 + row * (64 + 10), 64, 64)  # Новые размеры
-                if rect.collidepoint(mx, my) and self.coins >= seed["cost"]:
+            if hit is not None and hit.startswith("seed_"):
+                seed = self.available_seeds[int(hit[len("seed_"):])]
+                if self.coins >= seed["cost"]:
                     self.selected_seed = {**seed, "language": self.language}
                     self.planting = True
 
@@ -180,192 +214,163 @@ class SeedMenu:
 
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
             mx, my = pygame.mouse.get_pos()
-            menu_rect = pygame.Rect(screen_width - 200, 0, 200, SCREEN_HEIGHT)
+            menu_rect = self.layout(screen_width).rect("panel")
 
             if not menu_rect.collidepoint(mx, my):
                 self.close()
                 return None
         return None
 
-    def draw(self, screen):
-        if not self.is_open:
-            return
-        screen_width = screen.get_width()
-        menu_width, menu_height = 200, SCREEN_HEIGHT
+    def _draw_panel(self, widget):
         # Загружаем изображение фона меню
         try:
             background_image = images.GAME_IMAGES["menu_background"]
         except KeyError as e:
 
             # Заглушка на случай, если изображение не загрузилось
-            background_image = pygame.Surface((menu_width, menu_height))
-            background_image.fill((200, 200, 200))
+            background_image = filled(widget.rect.size, (200, 200, 200))
+        return [(background_image, widget.rect.topleft)]
+
+    def _draw_seed(self, widget):
+        seed = self.available_seeds[int(widget.name[len("seed_"):])]
+        is_hovered, is_active = widget.state
+        rect = widget.rect
+        # Фон кнопки (puck_seed)
+        try:
+            puck_seed_image = images.GAME_IMAGES["puck_seed"]
+        except KeyError as e:
 
-        # Отрисовка фона
-        screen.blit(background_image, (screen_width - menu_width, 0))
+            puck_seed_image = filled(rect.size, GRAY)
+        commands = [(puck_seed_image, rect.topleft)]
 
-        seeds_per_row = 2
-        seed_width = 64  # Новый размер кнопки
-        seed_height = 64  # Новый размер кнопки
-        start_y = 60
+        # Изображение семени поверх фона, по центру кнопки
+        try:
+            seed_image = images.GAME_IMAGES[f"{seed['name']}_seed"]
+        except KeyError as e:
 
-        available_seeds = [seed for seed in SEEDS if seed["unlock_level"] <= self.level]
+            seed_image = filled(rect.size, YELLOW)
+        commands.append((seed_image, (rect.x + (rect.width - seed_image.get_width()) // 2,
+                                      rect.y + (rect.height - seed_image.get_height()) // 2)))
 
-        # Вычисляем общую ширину строки кнопок
-        total_row_width = seeds_per_row * seed_width + (seeds_per_row - 1) * 10  # 138 пикселей для 2 кнопок
-        # Центр меню
-        menu_center_x = screen_width - menu_width // 2
-        # Начальная позиция X для центрирования
-        start_x = menu_center_x - (total_row_width // 2)
+        # Подсветка при наведении или выборе
+        if is_active:
+            commands.append((outlined(rect.size, GREEN, 2), rect.topleft))  # Зеленая рамка для активной кнопки
+        elif is_hovered:
+            commands.append((outlined(rect.size, WHITE, 2), rect.topleft))  # Белая рамка при наведении
+        return commands
 
-        # Отрисовка кнопки возврата
+    def draw(self, screen):
+        if not self.is_open:
+            return
+        screen_width = screen.get_width()
+        layout = self.layout(screen_width)
         mx, my = pygame.mouse.get_pos()
-        return_rect = pygame.Rect(screen_width - 42, 10, 32, 32)  # 10 справа, 10 сверху
-        return_image = images.GAME_IMAGES["return_hover"] if return_rect.collidepoint(mx, my) else images.GAME_IMAGES[
-            "return"]
-        screen.blit(return_image, (return_rect.x, return_rect.y))
-
-        for i, seed in enumerate(available_seeds):
-            row = i // seeds_per_row
-            col = i % seeds_per_row
-            rect_x = start_x + col * (seed_width + 10)
-            rect_y = start_y + row * (seed_height + 10)
-            rect = pygame.Rect(rect_x, rect_y, seed_width, seed_height)
-            is_hovered = rect.collidepoint(pygame.mouse.get_pos())
-            is_active = self.selected_seed and seed["name"] == self.selected_seed["name"]
-        tooltip = None
-
-        for i, seed in enumerate(available_seeds):
-            row = i // seeds_per_row
-            col = i % seeds_per_row
-            rect_x = start_x + col * (seed_width + 10)  # Отступ 10 пикселей между кнопками
-            rect_y = start_y + row * (seed_height + 10)  # Отступ 10 пикселей между строками
-            rect = pygame.Rect(rect_x, rect_y, seed_width, seed_height)
-            is_hovered = rect.collidepoint(pygame.mouse.get_pos())
-            is_active = self.selected_seed and seed["name"] == self.selected_seed["name"]
-
-            # Отрисовка фона кнопки (puck_seed)
-            try:
-                puck_seed_image = images.GAME_IMAGES["puck_seed"]
-            except KeyError as e:
-
-                puck_seed_image = pygame.Surface((seed_width, seed_height))
-                puck_seed_image.fill(GRAY)
-
-            screen.blit(puck_seed_image, (rect_x, rect_y))
-
-            # Отрисовка изображения семени поверх фона
-            try:
-                seed_image = images.GAME_IMAGES[f"{seed['name']}_seed"]
-            except KeyError as e:
-
-                seed_image = pygame.Surface((seed_width, seed_height))
-                seed_image.fill(YELLOW)
-
-            # Центрируем семя на кнопке
-            seed_x = rect_x + (seed_width - seed_image.get_width()) // 2
-            seed_y = rect_y + (seed_height - seed_image.get_height()) // 2
-            screen.blit(seed_image, (seed_x, seed_y))
-
-            # Подсветка при наведении или выборе
-            if is_active:
-                pygame.draw.rect(screen, GREEN, rect, 2)  # Зеленая рамка для активной кнопки
-            elif is_hovered:
-                pygame.draw.rect(screen, WHITE, rect, 2)  # Белая рамка при наведении
-                # Формируем текст подсказки
-                tooltip_lines = [
-                    f"{get_text(seed['name'].capitalize(), self.language)}",  # Название
-                    "",  # Пустая строка для разделения (будет заменена иконками)
-                    "",  # Место для стоимости
-                    "",  # Место для времени созревания
-                    "",  # Место для времени полива
-                    ""  # Место для урожая
-                ]
-                tooltip = "\n".join(tooltip_lines)
-
-        # Отрисовка подсказки (оставим текущую реализацию, если она уже настроена)
-        if tooltip:
-            # (Твой код подсказки остается без изменений, если ты доволен текущей реализацией)
-            tooltip_lines = tooltip.split('\n')
-            icon_size = 16
-            line_height = 20
-            padding = 10
-            tooltip_width = 100
-            tooltip_height = len(tooltip_lines) * line_height
-
-            # Создаем поверхность для подсказки
-            tooltip_surface = pygame.Surface((tooltip_width, tooltip_height), pygame.SRCALPHA)
-
-            # Загружаем и масштабируем фон подсказки
-            try:
-                tooltip_background = images.GAME_IMAGES["tooltip_background"]
-                tooltip_background = pygame.transform.scale(tooltip_background, (tooltip_width, tooltip_height))
-            except KeyError as e:
-
-                tooltip_background = pygame.Surface((tooltip_width, tooltip_height))
-                tooltip_background.fill((0, 0, 0, 200))
-
-            tooltip_surface.blit(tooltip_background, (0, 0))
-
-            # Иконки
-            coin_icon = pygame.transform.scale(images.GAME_IMAGES["coin_menu"], (icon_size, icon_size))
-            clock_icon = pygame.transform.scale(images.GAME_IMAGES["clock_icon"], (icon_size, icon_size))
-            water_drop_icon = pygame.transform.scale(images.GAME_IMAGES["water_drop_icon"], (icon_size, icon_size))
-            harvest_icon = pygame.transform.scale(images.GAME_IMAGES["harvest"], (icon_size, icon_size))
-
-            # Заполняем строки
-            seed_index = next(i for i, seed in enumerate(available_seeds) if
-                              get_text(seed['name'].capitalize(), self.language) == tooltip_lines[0])
-            seed = available_seeds[seed_index]
-            y_offset = padding+2
-            x_offset = padding
-
-            # Название
-            name_text = self.tooltip_font.render(tooltip_lines[0], True, WHITE)
-            tooltip_surface.blit(name_text, (x_offset, y_offset))
-            y_offset += line_height
-
-            # Функция для центрирования иконки относительно текста
-            def center_icon_y(text_surface, y_position):
-                text_height = text_surface.get_height()
-                return y_position + (text_height - icon_size) // 2
-
-            # Стоимость
-            cost_text = self.tooltip_font.render(f"{seed['cost']}", True, WHITE)
-            tooltip_surface.blit(coin_icon, (x_offset, center_icon_y(cost_text, y_offset)))
-            tooltip_surface.blit(cost_text, (x_offset + icon_size + 5, y_offset))
-            y_offset += line_height + 2
-
-            # Время созревания
-            ripening_text = self.tooltip_font.render(
-                f"{seed['ripening_time_minutes']} {get_text('min', self.language)}", True, WHITE)
-            tooltip_surface.blit(clock_icon, (x_offset, center_icon_y(ripening_text, y_offset)))
-            tooltip_surface.blit(ripening_text, (x_offset + icon_size + 5, y_offset))
-            y_offset += line_height
-
-            # Время полива
-            watering_text = self.tooltip_font.render(
-                f"{seed['watering_interval_minutes']} {get_text('min', self.language)}", True, WHITE)
-            tooltip_surface.blit(water_drop_icon, (x_offset, center_icon_y(watering_text, y_offset)))
-            tooltip_surface.blit(watering_text, (x_offset + icon_size + 5, y_offset))
-            y_offset += line_height
-
-            # Урожай
-            harvest_text = self.tooltip_font.render(f"{seed['harvest_yield']}", True, WHITE)
-            tooltip_surface.blit(harvest_icon, (x_offset, center_icon_y(harvest_text, y_offset)))
-            tooltip_surface.blit(harvest_text, (x_offset + icon_size + 5, y_offset))
-
+        hovered = layout.hit_test((mx, my))
+
+        layout["panel"].update(None, self._draw_panel)
+        layout["close"].update(hovered == "close", lambda widget: [
+            (images.GAME_IMAGES["return_hover"] if widget.state else images.GAME_IMAGES["return"], widget.rect.topleft)])
+        tooltip_seed = None
+        for i, seed in enumerate(self.available_seeds):
+            name = f"seed_{i}"
+            is_hovered = hovered == name
+            is_active = bool(self.selected_seed and seed["name"] == self.selected_seed["name"])
+            layout[name].update((is_hovered, is_active), self._draw_seed)
+            if is_hovered and not is_active:
+                tooltip_seed = seed
+        layout.draw(screen)
+
+        if tooltip_seed:
+            tooltip_surface = self._tooltip(tooltip_seed)
+            tooltip_width, tooltip_height = tooltip_surface.get_size()
             # Позиция подсказки на экране
-            tooltip_rect = pygame.Rect(pygame.mouse.get_pos()[0] + 10, pygame.mouse.get_pos()[1], tooltip_width,
-                                       tooltip_height)
+            tooltip_rect = pygame.Rect(mx + 10, my, tooltip_width, tooltip_height)
             if tooltip_rect.right > screen_width:
-                tooltip_rect.left = pygame.mouse.get_pos()[0] - tooltip_width - 10
+                tooltip_rect.left = mx - tooltip_width - 10
             if tooltip_rect.bottom > SCREEN_HEIGHT:
-                tooltip_rect.top = pygame.mouse.get_pos()[1] - tooltip_height - 10
+                tooltip_rect.top = my - tooltip_height - 10
 
             # Отрисовка подсказки на экране
             screen.blit(tooltip_surface, (tooltip_rect.x, tooltip_rect.y))
 
+    def _tooltip(self, seed):
+        """Подсказка семени (название, стоимость, время созревания и полива, урожай); собирается один раз на язык."""
+        key = (seed["name"], self.language, id(images.GAME_IMAGES))
+        tooltip_surface = self._tooltips.get(key)
+        if tooltip_surface is not None:
+            return tooltip_surface
+        tooltip_lines = 6  # Название и пять строк с иконками (первая - разделитель)
+        icon_size = 16
+        line_height = 20
+        padding = 10
+        tooltip_width = 100
+        tooltip_height = tooltip_lines * line_height
+
+        # Создаем поверхность для подсказки
+        tooltip_surface = pygame.Surface((tooltip_width, tooltip_height), pygame.SRCALPHA)
+
+        # Загружаем и масштабируем фон подсказки
+        try:
+            tooltip_background = images.GAME_IMAGES["tooltip_background"]
+            tooltip_background = scale_surface(tooltip_background, (tooltip_width, tooltip_height))
+        except KeyError as e:
+
+            tooltip_background = pygame.Surface((tooltip_width, tooltip_height))
+            tooltip_background.fill((0, 0, 0, 200))
+
+        tooltip_surface.blit(tooltip_background, (0, 0))
+
+        # Иконки
+        coin_icon = scale_surface(images.GAME_IMAGES["coin_menu"], (icon_size, icon_size))
+        clock_icon = scale_surface(images.GAME_IMAGES["clock_icon"], (icon_size, icon_size))
+        water_drop_icon = scale_surface(images.GAME_IMAGES["water_drop_icon"], (icon_size, icon_size))
+        harvest_icon = scale_surface(images.GAME_IMAGES["harvest"], (icon_size, icon_size))
+
+        y_offset = padding+2
+        x_offset = padding
+
+        # Название
+        name_text = render_text(self.tooltip_font, get_text(seed['name'].capitalize(), self.language), True, WHITE)
+        tooltip_surface.blit(name_text, (x_offset, y_offset))
+        y_offset += line_height
+
+        # Функция для центрирования иконки относительно текста
+        def center_icon_y(text_surface, y_position):
+            text_height = text_surface.get_height()
+            return y_position + (text_height - icon_size) // 2
+
+        # Стоимость
+        cost_text = render_text(self.tooltip_font, f"{seed['cost']}", True, WHITE)
+        tooltip_surface.blit(coin_icon, (x_offset, center_icon_y(cost_text, y_offset)))
+        tooltip_surface.blit(cost_text, (x_offset + icon_size + 5, y_offset))
+        y_offset += line_height + 2
+
+        # Время созревания
+        ripening_text = render_text(self.tooltip_font,
+            f"{seed['ripening_time_minutes']} {get_text('min', self.language)}", True, WHITE)
+        tooltip_surface.blit(clock_icon, (x_offset, center_icon_y(ripening_text, y_offset)))
+        tooltip_surface.blit(ripening_text, (x_offset + icon_size + 5, y_offset))
+        y_offset += line_height
+
+        # Время полива
+        watering_text = render_text(self.tooltip_font,
+            f"{seed['watering_interval_minutes']} {get_text('min', self.language)}", True, WHITE)
+        tooltip_surface.blit(water_drop_icon, (x_offset, center_icon_y(watering_text, y_offset)))
+        tooltip_surface.blit(watering_text, (x_offset + icon_size + 5, y_offset))
+        y_offset += line_height
+
+        # Урожай
+        harvest_text = render_text(self.tooltip_font, f"{seed['harvest_yield']}", True, WHITE)
+        tooltip_surface.blit(harvest_icon, (x_offset, center_icon_y(harvest_text, y_offset)))
+        tooltip_surface.blit(harvest_text, (x_offset + icon_size + 5, y_offset))
+
+        self._tooltips[key] = tooltip_surface
+        return tooltip_surface
+
+# Элементы-стрелки меню построек -> ключи их изображений в images.GAME_IMAGES
+ARROW_IMAGES = {"left_arrow": "arrow_left", "right_arrow": "arrow_right"}
+
+
 class BuildMenu:
     def __init__(self, language, coins, level=1,notification_manager=None, fonts=None):
         self.is_open = False
@@ -409,6 +414,9 @@ class BuildMenu:
         # Фильтр по умолчанию (пока только "functional")
         self.current_category = "functional"
         self.notification_manager = notification_manager
+        self._layout = None  # ui_layout.Layout, пересобирается при смене ширины экрана, уровня или языка
+        self._error_surface = None  # (сообщение, поверхность с переносом строк)
+        self.occupancy = None  # OccupancyGrid из game_loop: проверка места без прохода по всем объектам
 
     def open(self):
         self.is_open = True
@@ -432,14 +440,21 @@ class BuildMenu:
         if not available_options or self.current_index >= len(available_options):
             self.current_index = 0
 
+    def _collides(self, obj, objects, ignore=None):
+        """Занято ли место под obj; ignore - перемещаемый объект, он сам себе не мешает."""
+        if self.occupancy is not None:
+            return self.occupancy.collides(obj, ignore)
+        from game_utils import check_collision
+        return check_collision(obj, [other for other in objects if other != ignore], grid_size=32, allow_touching=True)
+
     def handle_input(self, event, screen_width, map_width, objects, camera_x, harvest, products):
-        from game_utils import snap_to_grid, check_collision
+        from game_utils import snap_to_grid
         if not self.is_open:
             return None
 
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mx, my = pygame.mouse.get_pos()
-            build_rects = self.draw(pygame.display.get_surface(), harvest, products, return_rects=True)
+            build_rects = self.layout(screen_width).rects()
 
 
             # Обработка кликов по кнопкам категорий
@@ -512,7 +527,7 @@ class BuildMenu:
                 new_y = max(0, min(new_y, SCREEN_HEIGHT - self.preview_build.height))
                 self.preview_build.x = new_x
                 self.preview_build.y = new_y
-                if not check_collision(self.preview_build, objects, grid_size=32, allow_touching=True):
+                if not self._collides(self.preview_build, objects):
                     objects.append(self.preview_build)
                     print(
                         f"Added {self.preview_build.obj_type} to objects at ({self.preview_build.x}, {self.preview_build.y})")
@@ -559,8 +574,7 @@ class BuildMenu:
                 new_y = max(0, min(new_y, SCREEN_HEIGHT - self.preview_build.height))
                 self.preview_build.x = new_x
                 self.preview_build.y = new_y
-                temp_objects = [obj for obj in objects if obj != self.moving_object]
-                if not check_collision(self.preview_build, temp_objects, grid_size=32, allow_touching=True):
+                if not self._collides(self.preview_build, objects, self.moving_object):
                     self.moving_object.x = new_x
                     self.moving_object.y = new_y
                     moved_obj = self.moving_object
@@ -594,204 +608,196 @@ class BuildMenu:
                 return {"action": self.build_action, "preview_obj": self.preview_build}
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
             mx, my = pygame.mouse.get_pos()
-            menu_rect = pygame.Rect(screen_width - 240, 0, 240, SCREEN_HEIGHT)
+            menu_rect = self.layout(screen_width).rect("panel")
             if not menu_rect.collidepoint(mx, my):
                 self.close()
 
                 return None
         return None
 
-    def draw(self, screen, harvest, products, return_rects=False):
-        if not self.is_open:
-            return {} if return_rects else None
-        screen_width = screen.get_width()
-        menu_width, menu_height = 200, SCREEN_HEIGHT
-
+    def _current_option(self):
+        """:return: tuple (доступные постройки текущей категории, выбранная постройка или None)"""
+        available_options = [option for option in self.build_options if
+                             self.level >= option["unlock_level"] and option["category"] == self.current_category]
+        current_option = available_options[self.current_index % len(available_options)] if available_options else None
+        return available_options, current_option
+
+    def layout(self, screen_width):
+        """
+        Дерево элементов меню. Прямоугольники пересчитываются только при смене ширины экрана,
+        уровня, языка или набора изображений; видимость стрелок и кнопки Build - по текущей постройке.
+        """
+        key = (screen_width, self.level, self.language, id(images.GAME_IMAGES))
+        layout = self._layout
+        if layout is None or layout.key != key:
+            menu_width = 200
+            layout = Layout(key)
+            layout.add("panel", (screen_width - menu_width, 0, menu_width, SCREEN_HEIGHT), interactive=False)
+            # Кнопки "Close", "Move" и "Destroy"
+            layout.add("close", (screen_width - menu_width + menu_width - 32 - 10, 10, 32, 32))  # Справа, отступ 10
+            layout.add("move", (screen_width - menu_width + 10, 10, 32, 32))  # Слева, отступ 10
+            layout.add("destroy", (screen_width - menu_width + 10 + 32 + 10, 10, 32, 32))  # Справа от Move, отступ 10
+            # Кнопки категорий (на y=60, размер 32x32)
+            category_start_x = screen_width - menu_width + 15
+            for i, category in enumerate(["functional", "decor", "roads"]):
+                layout.add(f"category_{category}", (category_start_x + i * (32 + 10), 60, 32, 32))
+            # Зона изображения объекта (уменьшаем высоту, чтобы поместить кнопку Build)
+            build_rect = layout.add("option", (screen_width - menu_width + 15, 120, menu_width - 30, 150),
+                                    interactive=False).rect
+            # Кнопка "Build" (фиксированная позиция внизу)
+            layout.add("build_button", (build_rect.x + (build_rect.width - 100) // 2, SCREEN_HEIGHT - 60, 100, 40))
+            # Стрелки с одинаковыми отступами
+            arrow_y = build_rect.y + 10 + (64 - 20) // 2
+            layout.add("left_arrow", (build_rect.x + 15, arrow_y, 20, 20))
+            layout.add("right_arrow", (build_rect.right - 15 - 20, arrow_y, 20, 20))
+            self._layout = layout
+
+        available_options, current_option = self._current_option()
+        show_arrows = len(available_options) > 1
+        layout["option"].visible = layout["build_button"].visible = current_option is not None
+        layout["left_arrow"].visible = layout["right_arrow"].visible = show_arrows
+        return layout
+
+    def _draw_panel(self, widget):
         # Загружаем изображение фона меню
         try:
             background_image = images.GAME_IMAGES["menu_background"]
         except KeyError as e:
 
-            background_image = pygame.Surface((menu_width, menu_height))
-            background_image.fill((200, 200, 200))
-
-        # Отрисовка фона
-        screen.blit(background_image, (screen_width - menu_width, 0))
-
-        # Получаем позицию мыши
-        mx, my = pygame.mouse.get_pos()
+            background_image = filled(widget.rect.size, (200, 200, 200))
+        return [(background_image, widget.rect.topleft)]
 
-        # Кнопки "Close", "Move" и "Destroy"
-        close_rect = pygame.Rect(screen_width - menu_width + menu_width - 32 - 10, 10, 32, 32)  # Справа, отступ 10
-        move_rect = pygame.Rect(screen_width - menu_width + 10, 10, 32, 32)  # Слева, отступ 10
-        destroy_rect = pygame.Rect(screen_width - menu_width + 10 + 32 + 10, 10, 32, 32)  # Справа от Move, отступ 10
-        close_image = images.GAME_IMAGES["return" if not close_rect.collidepoint(mx, my) else "return_hover"]
-        move_state = "move_active" if self.build_action in ["move",
-                                                            "move_preview"] else "move_hover" if move_rect.collidepoint(
-            mx, my) else "move_normal"
-        destroy_state = "destroy_active" if self.build_action == "destroy" else "destroy_hover" if destroy_rect.collidepoint(
-            mx, my) else "destroy_normal"
-        screen.blit(close_image, close_rect.topleft)
-        screen.blit(images.GAME_IMAGES[move_state], move_rect.topleft)
-        screen.blit(images.GAME_IMAGES[destroy_state], destroy_rect.topleft)
-        self.hovered_buttons["close"] = close_rect.collidepoint(mx, my)
-        self.hovered_buttons["move"] = move_rect.collidepoint(mx, my)
-        self.hovered_buttons["destroy"] = destroy_rect.collidepoint(mx, my)
-
-        # Кнопки категорий (на y=60, размер 32x32)
-        category_rects = {}
-        categories = ["functional", "decor", "roads"]
-        category_width = 32
-        category_height = 32
-        category_start_x = screen_width - menu_width + 15
-        for i, category in enumerate(categories):
-            rect = pygame.Rect(category_start_x + i * (category_width + 10), 60, category_width, category_height)
-            category_rects[category] = rect
-            color = GREEN if self.current_category == category else GRAY
-            pygame.draw.rect(screen, color, rect)
-            category_text = self.tooltip_font.render(category.capitalize(), True, BLACK)
-            screen.blit(category_text, category_text.get_rect(center=rect.center))
-            self.hovered_buttons[f"category_{category}"] = rect.collidepoint(mx, my)
+    def _draw_category(self, widget):
+        color = GREEN if widget.state else GRAY
+        category_text = render_text(self.tooltip_font, widget.name[len("category_"):].capitalize(), True, BLACK)
+        return [(filled(widget.rect.size, color), widget.rect.topleft),
+                (category_text, category_text.get_rect(center=widget.rect.center))]
 
-        # Отрисовка текущей выбранной постройки
-        available_options = [option for option in self.build_options if
-                             self.level >= option["unlock_level"] and option["category"] == self.current_category]
-        current_option = available_options[self.current_index % len(available_options)] if available_options else None
-
-        # Условие для отображения стрелок
-        show_arrows = len(available_options) > 1 if available_options else False
-
-        # Зона изображения объекта (уменьшаем высоту, чтобы поместить кнопку Build)
-        build_rect = pygame.Rect(screen_width - menu_width + 15, 120, menu_width - 30, 150)  # Уменьшаем высоту до 150
+    def _draw_option(self, widget):
+        """Изображение, название, стоимость и описание выбранной постройки."""
+        current_option = widget.state
+        build_rect = widget.rect
         image_zone_width = 64
         image_zone_height = 64
         image_zone_x = build_rect.x + (build_rect.width - image_zone_width) // 2
         image_zone_y = build_rect.y + 10
-
-        if current_option:
-            if current_option["text"] == get_text("Bed", self.language):
-                build_image = images.GAME_IMAGES["bed_wet"]
-            elif current_option["text"] == get_text("Mill", self.language):
-                build_image = images.GAME_IMAGES["mill"]
-            elif current_option["text"] == get_text("Canning Cellar", self.language):
-                build_image = images.GAME_IMAGES.get("canning_cellar", images.GAME_IMAGES["mill"])
+        commands = []
+
+        if current_option["text"] == get_text("Bed", self.language):
+            build_image = images.GAME_IMAGES["bed_wet"]
+        elif current_option["text"] == get_text("Mill", self.language):
+            build_image = images.GAME_IMAGES["mill"]
+        elif current_option["text"] == get_text("Canning Cellar", self.language):
+            build_image = images.GAME_IMAGES.get("canning_cellar", images.GAME_IMAGES["mill"])
+        else:
+            build_image = filled((image_zone_width, image_zone_height), (255, 255, 255))
+        scale_factor = min(image_zone_width / build_image.get_width(), image_zone_height / build_image.get_height())
+        scaled_image = scale_surface(build_image, (
+            int(build_image.get_width() * scale_factor), int(build_image.get_height() * scale_factor)))
+        commands.append((scaled_image, (image_zone_x + (image_zone_width - scaled_image.get_width()) // 2,
+                                        image_zone_y + (image_zone_height - scaled_image.get_height()) // 2)))
+
+        # Название объекта
+        title_text = render_text(self.font, current_option["text"], True, BLACK)
+        commands.append((title_text, (
+            build_rect.x + (build_rect.width - title_text.get_width()) // 2, image_zone_y + image_zone_height + 10)))
+
+        # Стоимость
+        coin_image = images.GAME_IMAGES["coin_menu"]
+        harvest_image = scale_surface(images.GAME_IMAGES["harvest"], (16, 16))
+        product_image = scale_surface(images.GAME_IMAGES["product"], (16, 16))
+        items = []
+        total_width = 0
+        for icon, cost_key, gap in ((coin_image, "cost_coins", 5), (harvest_image, "cost_harvest", 15),
+                                    (product_image, "cost_products", 15)):
+            if current_option.get(cost_key, 0) > 0:
+                number_text = render_text(self.tooltip_font, str(current_option[cost_key]), True, BLACK)
+                total_width += icon.get_width() + number_text.get_width() + gap
+                items.append((icon, number_text))
+        x_pos = build_rect.x + (build_rect.width - total_width) // 2
+        y_pos = image_zone_y + image_zone_height + 40
+        for icon, number_text in items:
+            commands.append((icon, (x_pos, y_pos)))
+            commands.append((number_text, (x_pos + icon.get_width() + 5, y_pos)))
+            x_pos += icon.get_width() + number_text.get_width() + 15
+
+        # Статическое описание с переносом
+        description_lines = []
+        current_line = ""
+        for word in current_option["description"].split():
+            test_line = current_line + " " + word if current_line else word
+            if self.tooltip_font.size(test_line)[0] <= build_rect.width - 10:
+                current_line = test_line
             else:
-                build_image = pygame.Surface((image_zone_width, image_zone_height))
-                build_image.fill((255, 255, 255))
-            scale_factor = min(image_zone_width / build_image.get_width(), image_zone_height / build_image.get_height())
-            scaled_image = pygame.transform.scale(build_image, (
-                int(build_image.get_width() * scale_factor), int(build_image.get_height() * scale_factor)))
-            screen.blit(scaled_image, (image_zone_x + (image_zone_width - scaled_image.get_width()) // 2,
-                                       image_zone_y + (image_zone_height - scaled_image.get_height()) // 2))
-
-            # Название объекта
-            title_text = self.font.render(current_option["text"], True, BLACK)
-            screen.blit(title_text, (
-                build_rect.x + (build_rect.width - title_text.get_width()) // 2, image_zone_y + image_zone_height + 10))
-
-            # Стоимость
-            coin_image = images.GAME_IMAGES["coin_menu"]
-            harvest_image = pygame.transform.scale(images.GAME_IMAGES["harvest"], (16, 16))
-            product_image = pygame.transform.scale(images.GAME_IMAGES["product"], (16, 16))
-            cost_coins_text = self.tooltip_font.render(str(current_option["cost_coins"]), True, BLACK) if \
-                current_option["cost_coins"] > 0 else None
-            cost_harvest_text = self.tooltip_font.render(str(current_option["cost_harvest"]), True,
-                                                         BLACK) if "cost_harvest" in current_option and current_option[
-                "cost_harvest"] > 0 else None
-            cost_products_text = self.tooltip_font.render(str(current_option["cost_products"]), True,
-                                                          BLACK) if "cost_products" in current_option and \
-                                                                    current_option["cost_products"] > 0 else None
-            total_width = 0
-            items = []
-            if cost_coins_text:
-                total_width += coin_image.get_width() + cost_coins_text.get_width() + 5
-                items.append((coin_image, cost_coins_text))
-            if cost_harvest_text:
-                total_width += harvest_image.get_width() + cost_harvest_text.get_width() + 15
-                items.append((harvest_image, cost_harvest_text))
-            if cost_products_text:
-                total_width += product_image.get_width() + cost_products_text.get_width() + 15
-                items.append((product_image, cost_products_text))
-            x_pos = build_rect.x + (build_rect.width - total_width) // 2
-            y_pos = image_zone_y + image_zone_height + 40
-            for icon, number_text in items:
-                screen.blit(icon, (x_pos, y_pos))
-                if number_text:
-                    screen.blit(number_text, (x_pos + icon.get_width() + 5, y_pos))
-                x_pos += icon.get_width() + number_text.get_width() + 15
-
-            # Статическое описание с переносом
-            description_lines = []
-            current_line = ""
-            for word in current_option["description"].split():
-                test_line = current_line + " " + word if current_line else word
-                if self.tooltip_font.size(test_line)[0] <= build_rect.width - 10:
-                    current_line = test_line
-                else:
-                    description_lines.append(current_line)
-                    current_line = word
-            if current_line:
                 description_lines.append(current_line)
-            for i, line in enumerate(description_lines):
-                description_text = self.tooltip_font.render(line, True, BLACK)
-                description_rect = description_text.get_rect(
-                    center=(build_rect.x + build_rect.width // 2, y_pos + 25 + i * 20))
-                screen.blit(description_text, description_rect)
+                current_line = word
+        if current_line:
+            description_lines.append(current_line)
+        for i, line in enumerate(description_lines):
+            description_text = render_text(self.tooltip_font, line, True, BLACK)
+            commands.append((description_text, description_text.get_rect(
+                center=(build_rect.x + build_rect.width // 2, y_pos + 25 + i * 20))))
+        return commands
+
+    def _draw_build_button(self, widget):
+        can_build, is_hovered, is_building = widget.state
+        rect = widget.rect
+        build_state = "button_hover" if can_build and is_hovered else "button_normal"
+        build_button_image = scale_surface(images.GAME_IMAGES[build_state], (100, 40))
+        build_text_color = GREEN if can_build and is_building else WHITE if can_build and is_hovered else (128, 128, 128)
+        build_text = render_text(self.small_font, get_text("Build", self.language), True, build_text_color)
+        return [(build_button_image, rect.topleft), (build_text, build_text.get_rect(center=rect.center))]
 
-            # Кнопка "Build" (фиксированная позиция внизу)
-            build_button_rect = pygame.Rect(build_rect.x + (build_rect.width - 100) // 2, SCREEN_HEIGHT - 60, 100, 40)
+    def draw(self, screen, harvest, products, return_rects=False):
+        if not self.is_open:
+            return {} if return_rects else None
+        screen_width = screen.get_width()
+        menu_width = 200
+        layout = self.layout(screen_width)
+
+        # Получаем позицию мыши
+        mx, my = pygame.mouse.get_pos()
+        hovered = layout.hit_test((mx, my))
+
+        layout["panel"].update(None, self._draw_panel)
+        move_state = "move_active" if self.build_action in ["move", "move_preview"] else \
+            "move_hover" if hovered == "move" else "move_normal"
+        destroy_state = "destroy_active" if self.build_action == "destroy" else \
+            "destroy_hover" if hovered == "destroy" else "destroy_normal"
+        for name, image_name in (("close", "return_hover" if hovered == "close" else "return"),
+                                 ("move", move_state), ("destroy", destroy_state)):
+            layout[name].update(image_name, lambda widget: [(images.GAME_IMAGES[widget.state], widget.rect.topleft)])
+        for category in ["functional", "decor", "roads"]:
+            layout[f"category_{category}"].update(self.current_category == category, self._draw_category)
+
+        # Отрисовка текущей выбранной постройки
+        _, current_option = self._current_option()
+        can_build = False
+        if layout["option"].visible:
+            layout["option"].update(current_option, self._draw_option)
             total_cost_coins = current_option["cost_coins"]
             cost_harvest = current_option.get("cost_harvest", 0)
             cost_products = current_option.get("cost_products", 0)
             can_build = (self.coins >= total_cost_coins and
                          ("cost_harvest" not in current_option or harvest >= cost_harvest) and
                          ("cost_products" not in current_option or products >= cost_products))
-            build_state = "button_hover" if can_build and build_button_rect.collidepoint(mx, my) else "button_normal"
-            build_button_image = pygame.transform.scale(images.GAME_IMAGES[build_state], (100, 40))
-            screen.blit(build_button_image, (build_button_rect.x, build_button_rect.y))
-            build_text_color = GREEN if can_build and self.build_action == "build_preview" else WHITE if can_build and build_button_rect.collidepoint(
-                mx, my) else (128, 128, 128)
-            build_text = self.small_font.render(get_text("Build", self.language), True, build_text_color)
-            screen.blit(build_text, build_text.get_rect(center=build_button_rect.center))
-            self.hovered_buttons["build_button"] = build_button_rect.collidepoint(mx, my) and can_build
-
-        # Стрелки с одинаковыми отступами
-        left_arrow_rect = pygame.Rect(build_rect.x + 15, image_zone_y + (image_zone_height - 20) // 2, 20, 20)
-        right_arrow_rect = pygame.Rect(build_rect.right - 15 - 20, image_zone_y + (image_zone_height - 20) // 2, 20, 20)
-        if show_arrows:
-            screen.blit(images.GAME_IMAGES["arrow_left"], left_arrow_rect.topleft)
-            screen.blit(images.GAME_IMAGES["arrow_right"], right_arrow_rect.topleft)
-            self.hovered_buttons["left_arrow"] = left_arrow_rect.collidepoint(mx, my)
-            self.hovered_buttons["right_arrow"] = right_arrow_rect.collidepoint(mx, my)
+            layout["build_button"].update((can_build, hovered == "build_button", self.build_action == "build_preview"),
+                                          self._draw_build_button)
+        for name, image_name in ARROW_IMAGES.items():
+            if layout[name].visible:
+                layout[name].update(image_name, lambda widget: [(images.GAME_IMAGES[widget.state], widget.rect.topleft)])
+        layout.draw(screen)
+
+        for name, widget in layout.widgets.items():
+            if widget.interactive and widget.visible:
+                self.hovered_buttons[name] = hovered == name and (can_build or name != "build_button")
 
         # Отрисовка сообщения об ошибке с переносом текста и плавным исчезновением
         if self.error_message and pygame.time.get_ticks() - self.error_timer < 2000:
-            # Разбиваем текст на строки, чтобы он помещался в ширину меню
-            max_width = menu_width - 20  # Учитываем небольшие отступы
-            words = self.error_message.split()
-            lines = []
-            current_line = ""
-            for word in words:
-                test_line = current_line + " " + word if current_line else word
-                if self.small_font.size(test_line)[0] <= max_width:
-                    current_line = test_line
-                else:
-                    lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
-
-            # Вычисляем высоту текста
-            line_height = self.small_font.size(" ")[1]  # Высота строки
-            total_text_height = len(lines) * line_height
-
-            # Создаем поверхность для текста
-            text_surface = pygame.Surface((menu_width, total_text_height), pygame.SRCALPHA)
-
-            # Отрисовываем строки текста
-            for i, line in enumerate(lines):
-                line_surface = self.small_font.render(line, True, (255, 0, 0))
-                text_surface.blit(line_surface, (10, i * line_height))  # Отступ слева 10 пикселей
+            if self._error_surface is None or self._error_surface[0] != self.error_message:
+                self._error_surface = (self.error_message, self._render_error(self.error_message, menu_width))
+            text_surface = self._error_surface[1]
+            total_text_height = text_surface.get_height()
 
             # Вычисляем прозрачность (от 255 до 0 за 2 секунды)
             elapsed_time = pygame.time.get_ticks() - self.error_timer
@@ -805,16 +811,29 @@ class BuildMenu:
             screen.blit(text_surface, text_rect)
 
         if return_rects:
-            rects = {
-                "close": close_rect,
-                "move": move_rect,
-                "destroy": destroy_rect,
-                "build_button": build_button_rect if current_option else pygame.Rect(0, 0, 0, 0),
-                "left_arrow": left_arrow_rect,
-                "right_arrow": right_arrow_rect
-            }
-            rects.update({f"category_{category}": rect for category, rect in category_rects.items()})
-            return rects
+            return layout.rects()
+
+    def _render_error(self, message, menu_width):
+        """Сообщение об ошибке, разбитое на строки по ширине меню (своя поверхность - ей меняют прозрачность)."""
+        max_width = menu_width - 20  # Учитываем небольшие отступы
+        lines = []
+        current_line = ""
+        for word in message.split():
+            test_line = current_line + " " + word if current_line else word
+            if self.small_font.size(test_line)[0] <= max_width:
+                current_line = test_line
+            else:
+                lines.append(current_line)
+                current_line = word
+        if current_line:
+            lines.append(current_line)
+
+        line_height = self.small_font.size(" ")[1]  # Высота строки
+        text_surface = pygame.Surface((menu_width, len(lines) * line_height), pygame.SRCALPHA)
+        for i, line in enumerate(lines):
+            line_surface = render_text(self.small_font, line, True, (255, 0, 0))
+            text_surface.blit(line_surface, (10, i * line_height))  # Отступ слева 10 пикселей
+        return text_surface
 
 
 class MarketMenu:
@@ -832,6 +851,7 @@ class MarketMenu:
         self.error_timer = 0
         self.sale_values = [0, 1, 5, 10, 25, 50, 100]
         self.animations = []
+        self._layout = None  # ui_layout.Layout, пересобирается при смене ширины экрана или языка
 
     def open(self):
         self.is_open = True
@@ -863,7 +883,7 @@ class MarketMenu:
 
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mx, my = pygame.mouse.get_pos()
-            rects = self.draw(pygame.display.get_surface(), return_rects=True)
+            rects = self.layout(screen_width).rects()
             if rects["close"].collidepoint(mx, my):
                 self.close()
                 return "close_market_menu"
@@ -930,91 +950,110 @@ class MarketMenu:
                     print(self.error_message)
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
             mx, my = pygame.mouse.get_pos()
-            menu_rect = pygame.Rect((screen_width - 400) // 2, (SCREEN_HEIGHT - 250) // 2, 400, 250)
+            menu_rect = self.layout(screen_width).rect("panel")
 
             if not menu_rect.collidepoint(mx, my):
                 self.close()
                 return None
         return None
 
-    def draw(self, screen, return_rects=False):
-
-        if not self.is_open:
-            return {} if return_rects else None
-        screen_width = screen.get_width()
+    def layout(self, screen_width):
+        """Дерево элементов окна рынка; пересчитывается только при смене ширины экрана, языка или изображений."""
+        key = (screen_width, self.language, id(images.GAME_IMAGES))
+        if self._layout is not None and self._layout.key == key:
+            return self._layout
         menu_width, menu_height = 400, 250
         menu_x = (screen_width - menu_width) // 2
         menu_y = (SCREEN_HEIGHT - menu_height) // 2
-        pygame.draw.rect(screen, (211, 211, 211), (menu_x, menu_y, menu_width, menu_height))
-        pygame.draw.rect(screen, GRAY, (menu_x, menu_y, menu_width, menu_height), 2)
-        close_rect = pygame.Rect(menu_x + menu_width - 30, menu_y + 10, 20, 20)
-        pygame.draw.rect(screen, (173, 216, 230), close_rect)
-        close_text = self.small_font.render("×", True, BLACK)
-        screen.blit(close_text, close_text.get_rect(center=close_rect.center))
-
+        layout = Layout(key)
+        layout.add("panel", (menu_x, menu_y, menu_width, menu_height), interactive=False)
+        layout.add("close", (menu_x + menu_width - 30, menu_y + 10, 20, 20))
+        layout.add("harvest_value", (menu_x + 150, menu_y + 50, 50, 40), interactive=False)
+        layout.add("products_value", (menu_x + 150, menu_y + 100, 50, 40), interactive=False)
+        layout.add("harvest_increase", (menu_x + 205, menu_y + 50, 30, 20))
+        layout.add("harvest_decrease", (menu_x + 205, menu_y + 70, 30, 20))
+        layout.add("products_increase", (menu_x + 205, menu_y + 100, 30, 20))
+        layout.add("products_decrease", (menu_x + 205, menu_y + 120, 30, 20))
+        # Стрелки рисуются после всех кнопок: символ может выступать за свою кнопку
+        layout.add("arrow_labels", (menu_x + 205, menu_y + 50, 30, 90), interactive=False)
+        layout.add("total", (menu_x + 150, menu_y + 150, 100, 20), interactive=False)
+        layout.add("sell", (menu_x + 150, menu_y + 180, 100, 40))
+        self._layout = layout
+        return layout
+
+    def _draw_panel(self, widget):
+        rect = widget.rect
         harvest_image = images.GAME_IMAGES.get("harvest", pygame.Surface((32, 32)))
         product_image = images.GAME_IMAGES.get("product", pygame.Surface((32, 32)))
+        return [(filled(rect.size, (211, 211, 211)), rect.topleft), (outlined(rect.size, GRAY, 2), rect.topleft),
+                (harvest_image, (rect.x + 20, rect.y + 50)), (product_image, (rect.x + 20, rect.y + 100))]
+
+    def _draw_button(self, widget):
+        """Кнопка с заливкой; state - (цвет, надпись или None)."""
+        color, label = widget.state
+        commands = [(filled(widget.rect.size, color), widget.rect.topleft)]
+        if label is not None:
+            text = render_text(self.small_font, label, True, BLACK)
+            commands.append((text, text.get_rect(center=widget.rect.center)))
+        return commands
+
+    def _draw_value(self, widget):
+        rect = widget.rect
+        text = render_text(self.small_font, str(widget.state), True, BLACK)
+        return [(filled(rect.size, WHITE), rect.topleft),
+                (text, (rect.x + (rect.width - text.get_width()) // 2, rect.y + 10))]
+
+    def _draw_arrow_labels(self, widget):
+        layout = self._layout
+        up = render_text(self.small_font, "↑", True, BLACK)
+        down = render_text(self.small_font, "↓", True, BLACK)
+        return [(up, layout["harvest_increase"].rect.move(10, 2)), (down, layout["harvest_decrease"].rect.move(10, 2)),
+                (up, layout["products_increase"].rect.move(10, 2)), (down, layout["products_decrease"].rect.move(10, 2))]
+
+    def _draw_total(self, widget):
         coin_image = images.GAME_IMAGES.get("coin_menu", pygame.Surface((16, 16)))
+        value_text = render_text(self.small_font, str(widget.state), True, BLACK)
+        return [(coin_image, widget.rect.topleft), (value_text, (widget.rect.x + 40, widget.rect.y + 2))]
 
-        screen.blit(harvest_image, (menu_x + 20, menu_y + 50))
-        harvest_rect = pygame.Rect(menu_x + 150, menu_y + 50, 50, 40)
-        pygame.draw.rect(screen, WHITE, harvest_rect)
-        harvest_text = self.small_font.render(str(self.harvest_to_sell), True, BLACK)
-        screen.blit(harvest_text,
-                    (harvest_rect.x + (harvest_rect.width - harvest_text.get_width()) // 2, harvest_rect.y + 10))
-
-        screen.blit(product_image, (menu_x + 20, menu_y + 100))
-        products_rect = pygame.Rect(menu_x + 150, menu_y + 100, 50, 40)
-        pygame.draw.rect(screen, WHITE, products_rect)
-        products_text = self.small_font.render(str(self.products_to_sell), True, BLACK)
-        screen.blit(products_text,
-                    (products_rect.x + (products_rect.width - products_text.get_width()) // 2, products_rect.y + 10))
-
-        harvest_increase = pygame.Rect(menu_x + 205, menu_y + 50, 30, 20)
-        harvest_decrease = pygame.Rect(menu_x + 205, menu_y + 70, 30, 20)
-        products_increase = pygame.Rect(menu_x + 205, menu_y + 100, 30, 20)
-        products_decrease = pygame.Rect(menu_x + 205, menu_y + 120, 30, 20)
-        pygame.draw.rect(screen, GREEN, harvest_increase)
-        pygame.draw.rect(screen, GREEN, harvest_decrease)
-        pygame.draw.rect(screen, GREEN, products_increase)
-        pygame.draw.rect(screen, GREEN, products_decrease)
-        screen.blit(self.small_font.render("↑", True, BLACK), harvest_increase.move(10, 2))
-        screen.blit(self.small_font.render("↓", True, BLACK), harvest_decrease.move(10, 2))
-        screen.blit(self.small_font.render("↑", True, BLACK), products_increase.move(10, 2))
-        screen.blit(self.small_font.render("↓", True, BLACK), products_decrease.move(10, 2))
+    def draw(self, screen, return_rects=False):
 
+        if not self.is_open:
+            return {} if return_rects else None
+        layout = self.layout(screen.get_width())
+        panel = layout["panel"].rect
+        menu_x, menu_y, menu_width, menu_height = panel
+
+        layout["panel"].update(None, self._draw_panel)
+        layout["close"].update(((173, 216, 230), "×"), self._draw_button)
+        layout["harvest_value"].update(self.harvest_to_sell, self._draw_value)
+        layout["products_value"].update(self.products_to_sell, self._draw_value)
+        for name in ("harvest_increase", "harvest_decrease", "products_increase", "products_decrease"):
+            layout[name].update((GREEN, None), self._draw_button)
+        layout["arrow_labels"].update(None, self._draw_arrow_labels)
         total_value = (self.harvest_to_sell * 2) + (self.products_to_sell * 15)
-        screen.blit(coin_image, (menu_x + 150, menu_y + 150))
-        value_text = self.small_font.render(str(total_value), True, BLACK)
-        screen.blit(value_text, (menu_x + 190, menu_y + 152))
-        sell_rect = pygame.Rect(menu_x + 150, menu_y + 180, 100, 40)
-        pygame.draw.rect(screen, GREEN, sell_rect)
-        sell_text = self.small_font.render(get_text("Sell", self.language), True, BLACK)
-        screen.blit(sell_text, sell_text.get_rect(center=sell_rect.center))
+        layout["total"].update(total_value, self._draw_total)
+        layout["sell"].update((GREEN, get_text("Sell", self.language)), self._draw_button)
+        layout.draw(screen)
 
         for anim in self.animations:
             image = anim["image"]
             if anim["type"] == "coins":
-                text = self.small_font.render(f"+{anim['value']}", True, BLACK)
+                text = render_text(self.small_font, f"+{anim['value']}", True, BLACK)
             else:
-                text = self.small_font.render(str(anim["value"]), True, BLACK)
+                text = render_text(self.small_font, str(anim["value"]), True, BLACK)
+            text = text.copy()  # Поверхность из кэша общая, прозрачность ставим на копии
             image.set_alpha(anim["alpha"])
             text.set_alpha(anim["alpha"])
             screen.blit(text, (anim["x"] - text.get_width() - 5, anim["y"] - text.get_height() // 2))
             screen.blit(image, (anim["x"] + 5, anim["y"] - image.get_height() // 2))
 
         if self.error_message and pygame.time.get_ticks() - self.error_timer < 2000:
-            error_surface = self.small_font.render(self.error_message, True, (255, 0, 0))
+            error_surface = render_text(self.small_font, self.error_message, True, (255, 0, 0))
             error_rect = error_surface.get_rect(center=(menu_x + menu_width // 2, menu_y + menu_height - 30))
             screen.blit(error_surface, error_rect)
 
         if return_rects:
-            return {
-                "close": close_rect,
-                "harvest_increase": harvest_increase, "harvest_decrease": harvest_decrease,
-                "products_increase": products_increase, "products_decrease": products_decrease,
-                "sell": sell_rect
-            }
+            return layout.rects()
 
 class MenuManager:
     def __init__(self, language, coins, harvest, products, level, notification_manager=None, fonts=None):
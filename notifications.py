@@ -3,6 +3,18 @@ from config import SCREEN_HEIGHT, WHITE, RED, GREEN
 import images
 from fonts import initialize_fonts
 from translations import get_text
+from surface_cache import render_text, scale_surface
+
+NOTIFICATION_WIDTH = 400
+NOTIFICATION_HEIGHT = 84
+NOTIFICATION_TOP = 10  # Отступ окна уведомления от верха экрана
+
+
+def notification_rect(screen_width):
+    """Прямоугольник окна уведомления (по центру экрана по горизонтали)."""
+    return pygame.Rect((screen_width - NOTIFICATION_WIDTH) // 2, NOTIFICATION_TOP,
+                       NOTIFICATION_WIDTH, NOTIFICATION_HEIGHT)
+
 
 class NotificationManager:
     def __init__(self, language, fonts):  # Добавляем параметр fonts
@@ -58,18 +70,12 @@ class NotificationManager:
             return
 
         notification = self.notifications[0]
-        screen_width = screen.get_width()
-        menu_width, menu_height = 400, 84
-        menu_x = (screen_width - menu_width) // 2
-        menu_y = 10
+        menu_x, menu_y, menu_width, menu_height = notification_rect(screen.get_width())
 
-        # Фон
-        try:
-            bg_image = images.GAME_IMAGES["notification_background"]
-            bg_image = pygame.transform.scale(bg_image, (menu_width, menu_height))
-        except KeyError:
-            bg_image = pygame.Surface((menu_width, menu_height), pygame.SRCALPHA)
-            bg_image.fill((0, 0, 0, 128))
+        # Фон и строки текста - собственные поверхности уведомления, собираются один раз при первом показе
+        if "surfaces" not in notification:
+            notification["surfaces"] = self._build_surfaces(notification, menu_width, menu_height)
+        bg_image, text_lines = notification["surfaces"]
 
         bg_image.set_alpha(int(notification["alpha"]))
         screen.blit(bg_image, (menu_x, menu_y))
@@ -85,6 +91,23 @@ class NotificationManager:
             portrait.set_alpha(int(notification["alpha"]))
             screen.blit(portrait, (menu_x + 10, menu_y + 10))
 
+        # Отрисовка текста построчно
+        for text_surface, line_x, line_y in text_lines:
+            text_surface.set_alpha(int(notification["alpha"]))
+            screen.blit(text_surface, (menu_x + line_x, menu_y + line_y))
+
+    def _build_surfaces(self, notification, menu_width, menu_height):
+        """
+        Фон и строки текста уведомления. Это копии общих кэшей: их прозрачность меняется при появлении и исчезновении.
+        :return: tuple (фон, список (строка, x, y) относительно окна уведомления)
+        """
+        try:
+            bg_image = images.GAME_IMAGES["notification_background"]
+            bg_image = scale_surface(bg_image, (menu_width, menu_height)).copy()
+        except KeyError:
+            bg_image = pygame.Surface((menu_width, menu_height), pygame.SRCALPHA)
+            bg_image.fill((0, 0, 0, 128))
+
         # Разбиваем текст на строки
         words = notification["message"].split()
         lines = []
@@ -100,14 +123,11 @@ class NotificationManager:
         if current_line:
             lines.append(current_line)
 
-        # Отрисовка текста построчно
         line_height = self.font.get_linesize()  # Высота строки текста
         total_text_height = len(lines) * line_height
-        text_x = menu_x + 84  # 64 (портрет) + 20 (отступ)
+        text_x = 84  # 64 (портрет) + 20 (отступ)
         # Центрируем текст по вертикали в окне
-        text_y_start = menu_y + (menu_height - total_text_height) // 2
-
-        for i, line in enumerate(lines):
-            text_surface = self.font.render(line, True, notification["color"])
-            text_surface.set_alpha(int(notification["alpha"]))
-            screen.blit(text_surface, (text_x, text_y_start + i * line_height))
\ No newline at end of file
+        text_y_start = (menu_height - total_text_height) // 2
+        text_lines = [(render_text(self.font, line, True, notification["color"]).copy(), text_x,
+                       text_y_start + i * line_height) for i, line in enumerate(lines)]
+        return bg_image, text_lines
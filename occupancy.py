@@ -0,0 +1,116 @@
+# occupancy.py
+import numpy as np
+
+
+class OccupancyGrid:
+    """
+    Занятость клеток сетки строительства (32px): сколько объектов лежит в каждой клетке.
+    Объект занимает клетки, которые его прямоугольник перекрывает больше чем на 1 пиксель -
+    так же, как check_collision(..., allow_touching=True) разрешает касание краями.
+    Обновляется подписчиками реестра при постройке, перемещении и сносе.
+    """
+
+    def __init__(self, width, height, cell_size=32):
+        """
+        :param width: int - ширина карты в пикселях
+        :param height: int - высота карты в пикселях
+        :param cell_size: int - размер клетки в пикселях
+        """
+        self.cell_size = cell_size
+        self.columns = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.counts = np.zeros((self.rows, self.columns), dtype=np.uint8)
+        self.version = 0  # Растёт при каждом изменении, по нему кэши проверок понимают, что пора пересчитать
+
+    @classmethod
+    def from_objects(cls, width, height, objects, cell_size=32):
+        grid = cls(width, height, cell_size)
+        for obj in objects:
+            grid.add(obj)
+        return grid
+
+    def footprint(self, x, y, width, height):
+        """
+        Клетки, занятые прямоугольником, обрезанные по краям карты.
+        :return: tuple (row0, row1, column0, column1) - границы среза, правые не включаются
+        """
+        size = self.cell_size
+        column0 = max(0, (x + 1) // size)
+        column1 = min(self.columns, (x + width - 2) // size + 1)
+        row0 = max(0, (y + 1) // size)
+        row1 = min(self.rows, (y + height - 2) // size + 1)
+        return row0, max(row0, row1), column0, max(column0, column1)
+
+    def _mark(self, x, y, width, height, delta):
+        row0, row1, column0, column1 = self.footprint(x, y, width, height)
+        cells = self.counts[row0:row1, column0:column1]
+        if delta > 0:
+            cells += 1
+        else:
+            cells[cells > 0] -= 1
+        self.version += 1
+
+    def add(self, obj):
+        self._mark(obj.x, obj.y, obj.width, obj.height, 1)
+
+    def remove(self, obj):
+        self._mark(obj.x, obj.y, obj.width, obj.height, -1)
+
+    def move(self, obj, old_x, old_y):
+        self._mark(old_x, old_y, obj.width, obj.height, -1)
+        self._mark(obj.x, obj.y, obj.width, obj.height, 1)
+
+    def is_free(self, x, y, width, height, ignore=None):
+        """
+        Свободна ли область под постройку.
+        :param ignore: объект, который не считается препятствием (перемещаемый)
+        :return: bool
+        """
+        row0, row1, column0, column1 = self.footprint(x, y, width, height)
+        cells = self.counts[row0:row1, column0:column1]
+        if ignore is None:
+            return not cells.any()
+        # Клетки перемещаемого объекта внутри области занимает он сам - вычитаем его
+        own = np.zeros(cells.shape, dtype=np.uint8)
+        own_row0, own_row1, own_column0, own_column1 = self.footprint(ignore.x, ignore.y, ignore.width, ignore.height)
+        own[max(own_row0 - row0, 0):max(own_row1 - row0, 0),
+            max(own_column0 - column0, 0):max(own_column1 - column0, 0)] = 1
+        return not (cells > own).any()
+
+    def collides(self, obj, ignore=None):
+        return not self.is_free(obj.x, obj.y, obj.width, obj.height, ignore)
+
+    def fit_mask(self, width, height, map_width, map_height, ignore=None):
+        """
+        Куда помещается постройка заданного размера: для каждой клетки - встанет ли постройка,
+        если щёлкнуть курсором в этой клетке. Позиция считается как в BuildMenu: привязка к сетке,
+        затем прижатие к правому и нижнему краю карты. Считается сразу для всей карты через таблицу сумм занятости.
+        :param map_width: int - ширина карты в пикселях (постройка не должна выходить за край)
+        :param map_height: int - высота карты в пикселях
+        :param ignore: объект, который не считается препятствием (перемещаемый)
+        :return: numpy.ndarray bool формы (rows, columns)
+        """
+        mask = np.zeros((self.rows, self.columns), dtype=bool)
+        if width > map_width or height > map_height:
+            return mask
+        occupied = self.counts > 0
+        if ignore is not None:
+            row0, row1, column0, column1 = self.footprint(ignore.x, ignore.y, ignore.width, ignore.height)
+            occupied = self.counts.astype(np.int16)
+            occupied[row0:row1, column0:column1] -= 1
+            occupied = occupied > 0
+        size = self.cell_size
+        # Левый верхний угол постройки для каждого столбца и строки клеток под курсором
+        xs = np.minimum(np.arange(self.columns) * size, map_width - width)
+        ys = np.minimum(np.arange(self.rows) * size, map_height - height)
+        column0 = np.clip((xs + 1) // size, 0, self.columns)
+        column1 = np.clip((xs + width - 2) // size + 1, column0, self.columns)
+        row0 = np.clip((ys + 1) // size, 0, self.rows)
+        row1 = np.clip((ys + height - 2) // size + 1, row0, self.rows)
+        # Таблица сумм с нулевой первой строкой и столбцом: сумма любого окна - четыре обращения
+        table = np.zeros((self.rows + 1, self.columns + 1), dtype=np.int32)
+        table[1:, 1:] = occupied.cumsum(axis=0).cumsum(axis=1)
+        row0, row1 = row0[:, None], row1[:, None]
+        window = table[row1, column1] - table[row0, column1] - table[row1, column0] + table[row0, column0]
+        mask[:] = window == 0
+        return mask
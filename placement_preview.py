@@ -0,0 +1,116 @@
+# placement_preview.py
+import pygame
+import images
+from game_utils import check_collision
+from surface_cache import scale_surface
+
+GLOW_PAD = 10  # Отступ рамки подсветки от призрака постройки
+VALID_COLOR = (0, 255, 0, 100)
+INVALID_COLOR = (255, 0, 0, 100)
+OVERLAY_COLOR = (0, 255, 0)
+OVERLAY_ALPHA = 40  # Прозрачность подсветки клеток, куда помещается постройка
+
+
+class PlacementPreview:
+    """
+    Предпросмотр постройки и перемещения: полупрозрачный «призрак» объекта и рамка
+    (зелёная - можно ставить, красная - занято). Поверхности создаются один раз на тип и размер,
+    а проверка места пересчитывается, только когда привязанная к сетке позиция или карта изменились.
+    """
+
+    def __init__(self, occupancy=None):
+        """:param occupancy: OccupancyGrid - занятость клеток; без неё проверка идёт по списку объектов"""
+        self.occupancy = occupancy
+        self._ghosts = {}  # (тип, ширина, высота, цвет, изображение) -> призрак
+        self._glows = {}  # (ширина, высота, можно ли ставить) -> рамка
+        self._check_key = None
+        self.valid = False
+        self.checks = 0  # Сколько раз проверка места действительно считалась
+        self._overlay_key = None
+        self._overlay = None
+
+    def _image_for(self, obj):
+        name = {"bed": "bed_dry", "house": "house", "mill": "mill", "market_stall": "market_stall"}.get(obj.obj_type)
+        return images.GAME_IMAGES.get(name) if name else None
+
+    def ghost(self, obj):
+        """Полупрозрачная поверхность постройки (альфа 128)."""
+        image = self._image_for(obj)
+        key = (obj.obj_type, obj.width, obj.height, tuple(obj.color), image)
+        surface = self._ghosts.get(key)
+        if surface is None:
+            surface = pygame.Surface((obj.width, obj.height), pygame.SRCALPHA)
+            if image is None:
+                pygame.draw.rect(surface, obj.color, (0, 0, obj.width, obj.height))
+            elif obj.obj_type == "bed":
+                surface.blit(image, (0, 0))
+            else:
+                surface.blit(scale_surface(image, (obj.width, obj.height)), (0, 0))
+            surface.set_alpha(128)
+            self._ghosts[key] = surface
+        return surface
+
+    def glow(self, width, height, valid):
+        """Рамка толщиной 4px вокруг призрака."""
+        key = (width, height, valid)
+        surface = self._glows.get(key)
+        if surface is None:
+            surface = pygame.Surface((width + 2 * GLOW_PAD, height + 2 * GLOW_PAD), pygame.SRCALPHA)
+            pygame.draw.rect(surface, VALID_COLOR if valid else INVALID_COLOR,
+                             (GLOW_PAD, GLOW_PAD, width, height), 4)
+            self._glows[key] = surface
+        return surface
+
+    def is_valid(self, obj, objects, ignore=None):
+        """
+        Можно ли поставить obj на текущее место.
+        :param objects: list - объекты карты (нужны, только если нет сетки занятости)
+        :param ignore: объект, который сейчас перемещается
+        """
+        occupancy = self.occupancy
+        key = (id(obj), obj.x, obj.y, obj.width, obj.height, id(ignore),
+               occupancy.version if occupancy is not None else len(objects))
+        if key != self._check_key:
+            self._check_key = key
+            self.checks += 1
+            if occupancy is not None:
+                self.valid = not occupancy.collides(obj, ignore)
+            else:
+                self.valid = not check_collision(obj, [other for other in objects if other != ignore],
+                                                 grid_size=32, allow_touching=True)
+        return self.valid
+
+    def overlay(self, obj, map_width, map_height, ignore=None):
+        """
+        Поверхность размером с карту, подсвечивающая клетки, щелчок в которых поставит obj (см. OccupancyGrid.fit_mask).
+        Пересобирается, только когда меняется размер постройки, перемещаемый объект или занятость карты.
+        :return: pygame.Surface или None без сетки занятости
+        """
+        occupancy = self.occupancy
+        if occupancy is None:
+            return None
+        key = (obj.width, obj.height, id(ignore), occupancy.version)
+        if key != self._overlay_key:
+            self._overlay_key = key
+            mask = occupancy.fit_mask(obj.width, obj.height, map_width, map_height, ignore)
+            cells = pygame.Surface((occupancy.columns, occupancy.rows), pygame.SRCALPHA)
+            cells.fill(OVERLAY_COLOR + (0,))
+            alpha = pygame.surfarray.pixels_alpha(cells)
+            alpha[:] = mask.T * OVERLAY_ALPHA
+            del alpha  # Снимает блокировку поверхности
+            size = occupancy.cell_size
+            self._overlay = pygame.transform.scale(cells, (occupancy.columns * size, occupancy.rows * size))
+        return self._overlay
+
+    def draw(self, screen, obj, camera_x, objects, ignore=None, map_size=None):
+        """
+        Рисует рамку и призрак obj в его текущей (уже привязанной к сетке) позиции.
+        :param map_size: tuple - размер карты; если задан, под призраком рисуется подсветка свободных мест
+        """
+        if map_size is not None:
+            overlay = self.overlay(obj, map_size[0], map_size[1], ignore)
+            if overlay is not None:
+                screen.blit(overlay, (-camera_x, 0))
+        valid = self.is_valid(obj, objects, ignore)
+        screen.blit(self.glow(obj.width, obj.height, valid), (obj.x - camera_x - GLOW_PAD, obj.y - GLOW_PAD))
+        screen.blit(self.ghost(obj), (obj.x - camera_x, obj.y))
@@ -1,75 +1,232 @@
+import heapq
+import itertools
 import pygame
 import math
 
 class QuadTree:
-    def __init__(self, boundary, capacity=4):
+    def __init__(self, boundary, capacity=4, parent=None):
         """
         Инициализация QuadTree.
         :param boundary: pygame.Rect - прямоугольник, определяющий границы области
         :param capacity: int - максимальное количество объектов в узле до разделения
+        :param parent: QuadTree - родительский узел (None для корня)
         """
         self.boundary = boundary
         self.capacity = capacity
+        self.parent = parent
         self.objects = []
         self.divided = False
         self.northwest = None
         self.northeast = None
         self.southwest = None
         self.southeast = None
+        if parent is None:
+            # Общие для всего дерева данные: узел каждого объекта и именованные разделы
+            self.node_of = {}  # id(obj) -> узел, в списке objects которого лежит объект
+            self.partitions = {}
+            self.members = {}  # Раздел -> множество id участников
+        else:
+            self.node_of = parent.node_of
+            self.partitions = parent.partitions
+            self.members = parent.members
+        self.partition_counts = {}  # Раздел -> число его участников в поддереве этого узла
+
+    @classmethod
+    def from_objects(cls, boundary, objects, capacity=4):
+        """
+        Строит дерево сразу по всем объектам (без поштучных insert и отладочной печати):
+        объекты раскладываются по квадрантам сверху вниз, каждый узел делится не больше одного раза.
+        :param boundary: pygame.Rect - границы области
+        :param objects: iterable - объекты карты
+        :param capacity: int - максимальное количество объектов в узле до разделения
+        :return: QuadTree
+        """
+        tree = cls(boundary, capacity)
+        entries = []
+        for obj in objects:
+            center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
+            if boundary.collidepoint(center):
+                entries.append((center, obj))
+            else:
+                print(f"Object {obj.obj_type} at ({obj.x}, {obj.y}) outside boundary {boundary}")
+        stack = [(tree, entries)]
+        while stack:
+            node, entries = stack.pop()
+            rect = node.boundary
+            first_center = entries[0][0] if entries else None
+            if (len(entries) <= capacity or min(rect.width, rect.height) < 2
+                    or all(center == first_center for center, obj in entries)):  # Совпадающие центры не разделить
+                for center, obj in entries:
+                    node._store(obj)
+                continue
+            node.subdivide()
+            mid_x = rect.x + rect.width // 2
+            mid_y = rect.y + rect.height // 2
+            quadrants = ([], [], [], [])  # Порядок как в children(): NW, NE, SW, SE
+            for entry in entries:
+                (x, y), obj = entry
+                quadrants[(x >= mid_x) + 2 * (y >= mid_y)].append(entry)
+            for child, child_entries in zip(node.children(), quadrants):
+                stack.append((child, child_entries))
+        return tree
 
     def subdivide(self):
         """
-        Разделяет текущий узел на четыре дочерних узла.
+        Разделяет текущий узел на четыре дочерних узла. Нечётные размеры делятся без потери пикселей.
         """
         x, y, w, h = self.boundary.x, self.boundary.y, self.boundary.width, self.boundary.height
         half_w, half_h = w // 2, h // 2
-        self.northwest = QuadTree(pygame.Rect(x, y, half_w, half_h), self.capacity)
-        self.northeast = QuadTree(pygame.Rect(x + half_w, y, half_w, half_h), self.capacity)
-        self.southwest = QuadTree(pygame.Rect(x, y + half_h, half_w, half_h), self.capacity)
-        self.southeast = QuadTree(pygame.Rect(x + half_w, y + half_h, half_w, half_h), self.capacity)
+        self.northwest = QuadTree(pygame.Rect(x, y, half_w, half_h), self.capacity, self)
+        self.northeast = QuadTree(pygame.Rect(x + half_w, y, w - half_w, half_h), self.capacity, self)
+        self.southwest = QuadTree(pygame.Rect(x, y + half_h, half_w, h - half_h), self.capacity, self)
+        self.southeast = QuadTree(pygame.Rect(x + half_w, y + half_h, w - half_w, h - half_h), self.capacity, self)
         self.divided = True
 
+    def children(self):
+        if not self.divided:
+            return ()
+        return self.northwest, self.northeast, self.southwest, self.southeast
+
+    def _child_for(self, obj_center):
+        for child in self.children():
+            if child.boundary.collidepoint(obj_center):
+                return child
+        return None
+
+    def add_partition(self, name, predicate):
+        """
+        Заводит именованный раздел: объекты, для которых predicate(obj) истинно.
+        Поиск с partition=name обходит только поддеревья, где есть участники раздела.
+        :param name: str - имя раздела
+        :param predicate: callable - условие участия объекта в разделе
+        """
+        self.partitions[name] = predicate
+        self.members[name] = set()
+        for obj in self.get_all_objects():
+            self.refresh(obj)
+
+    def _partitions_of(self, obj):
+        return {name for name, predicate in self.partitions.items() if predicate(obj)}
+
+    def _member_of(self, obj):
+        key = id(obj)
+        return {name for name, ids in self.members.items() if key in ids}
+
+    def _count(self, names, delta, stop=None):
+        """Меняет счётчики разделов от этого узла вверх до stop (не включая его)."""
+        node = self
+        while node is not stop:
+            for name in names:
+                node.partition_counts[name] = node.partition_counts.get(name, 0) + delta
+            node = node.parent
+
+    def refresh(self, obj):
+        """
+        Пересчитывает участие объекта в разделах после смены его состояния.
+        :return: bool - изменилось ли участие хотя бы в одном разделе
+        """
+        node = self.node_of.get(id(obj))
+        if node is None:
+            return False
+        key = id(obj)
+        new_names = self._partitions_of(obj)
+        old_names = self._member_of(obj)
+        if new_names == old_names:
+            return False
+        for name in old_names - new_names:
+            self.members[name].discard(key)
+        for name in new_names - old_names:
+            self.members[name].add(key)
+        node._count(old_names - new_names, -1)
+        node._count(new_names - old_names, 1)
+        return True
+
     def insert(self, obj):
+        if id(obj) in self.node_of:
+            self.remove(obj)
+        names = self._partitions_of(obj)
+        if not self._insert(obj, names):
+            return False
+        for name in names:
+            self.members[name].add(id(obj))
+        return True
+
+    def _insert(self, obj, names):
         obj_center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
         if not self.boundary.collidepoint(obj_center):
             print(f"Object {obj.obj_type} at ({obj.x}, {obj.y}) outside boundary {self.boundary}")
             return False
-        if len(self.objects) < self.capacity and not self.divided:
-            self.objects.append(obj)
-            print(f"Inserted {obj.obj_type} at ({obj.x}, {obj.y}) into leaf node")
-            return True
-        if not self.divided:
-            self.subdivide()
-            print(f"Subdivided node at {self.boundary}")
-            for existing_obj in self.objects[:]:
-                self.insert(existing_obj)
-            self.objects.clear()
-        success = (self.northwest.insert(obj) or
-                   self.northeast.insert(obj) or
-                   self.southwest.insert(obj) or
-                   self.southeast.insert(obj))
-        if not success:
-            print(f"Failed to insert {obj.obj_type} at ({obj.x}, {obj.y}) into any child node")
-        return success
-
-    def remove(self, obj):
-        """
-        Удаляет объект из QuadTree.
+        node = self
+        while True:
+            node._count(names, 1, stop=node.parent)
+            if not node.divided:
+                # Узел размером в пиксель уже не делится - в нём может оказаться больше capacity объектов
+                if len(node.objects) < node.capacity or min(node.boundary.width, node.boundary.height) < 2:
+                    node._store(obj)
+                    print(f"Inserted {obj.obj_type} at ({obj.x}, {obj.y}) into leaf node")
+                    return True
+                node.subdivide()
+                print(f"Subdivided node at {node.boundary}")
+                for existing_obj in node.objects[:]:
+                    child = node._child_for((existing_obj.x + existing_obj.width // 2,
+                                             existing_obj.y + existing_obj.height // 2))
+                    if child is not None:
+                        node.objects.remove(existing_obj)
+                        child._count(self._member_of(existing_obj), 1, stop=node)
+                        child._store(existing_obj)
+            child = node._child_for(obj_center)
+            if child is None:
+                node._store(obj)
+                return True
+            node = child
+
+    def _store(self, obj):
+        self.objects.append(obj)
+        self.node_of[id(obj)] = self
+
+    def remove(self, obj, obj_center=None):
+        """
+        Удаляет объект из QuadTree по сохранённой ссылке на его узел, без спуска от корня.
         :param obj: объект для удаления
+        :param obj_center: не используется; оставлен для совместимости (узел известен и так)
         :return: bool - успешно ли удален объект
         """
-        obj_center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
-        if not self.boundary.collidepoint(obj_center):
+        node = self.node_of.pop(id(obj), None)
+        if node is None:
             return False
-        if obj in self.objects:
-            self.objects.remove(obj)
+        node.objects.remove(obj)
+        names = self._member_of(obj)
+        node._count(names, -1)
+        for name in names:
+            self.members[name].discard(id(obj))
+        return True
+
+    def move(self, obj, old_x=None, old_y=None):
+        """
+        Переносит объект, координаты которого уже изменены. Если новый центр остался в том же листе,
+        дерево не меняется; иначе объект поднимается до ближайшего узла, содержащего новый центр.
+        :param old_x: не используется; узел объекта известен по ссылке
+        :param old_y: не используется
+        :return: bool - находится ли объект в дереве после перемещения
+        """
+        node = self.node_of.get(id(obj))
+        if node is None:
+            return self.insert(obj)
+        obj_center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
+        if not node.divided and node.boundary.collidepoint(obj_center):
             return True
-        if self.divided:
-            return (self.northwest.remove(obj) or
-                    self.northeast.remove(obj) or
-                    self.southwest.remove(obj) or
-                    self.southeast.remove(obj))
-        return False
+        ancestor = node
+        while ancestor is not None and not ancestor.boundary.collidepoint(obj_center):
+            ancestor = ancestor.parent
+        if ancestor is None:
+            self.remove(obj)
+            print(f"Object {obj.obj_type} at ({obj.x}, {obj.y}) outside boundary {self.boundary}")
+            return False
+        names = self._member_of(obj)
+        node.objects.remove(obj)
+        del self.node_of[id(obj)]
+        node._count(names, -1, stop=ancestor.parent)  # Выше ancestor счётчики не меняются
+        return ancestor._insert(obj, names)
 
     def update_position(self, obj, new_x, new_y):
         """
@@ -79,15 +236,15 @@ class QuadTree:
         :param new_y: новая координата y
         :return: bool - успешно ли обновлена позиция
         """
-        if self.remove(obj):
-            old_x, old_y = obj.x, obj.y
-            obj.x, obj.y = new_x, new_y
-            if not self.insert(obj):
-                obj.x, obj.y = old_x, old_y
-                self.insert(obj)
-                return False
-            return True
-        return False
+        if id(obj) not in self.node_of:
+            return False
+        old_x, old_y = obj.x, obj.y
+        obj.x, obj.y = new_x, new_y
+        if not self.move(obj):
+            obj.x, obj.y = old_x, old_y
+            self.insert(obj)
+            return False
+        return True
 
     def query(self, rect):
         """
@@ -109,33 +266,81 @@ class QuadTree:
             found.extend(self.southeast.query(rect))
         return found
 
-    def find_nearest(self, point, condition=None, max_range=3000):
+    def find_nearest(self, point, condition=None, max_range=3000, partition=None):
         """
         Находит ближайший объект к заданной точке.
         :param point: tuple (x, y) - точка поиска
         :param condition: callable - опциональное условие для фильтрации объектов
         :param max_range: float - максимальная дистанция поиска
+        :param partition: str - искать только среди участников раздела
         :return: tuple (object, distance) - ближайший объект и расстояние до него
         """
-        nearest = None
-        min_dist = max_range
-        range_rect = pygame.Rect(point[0] - max_range, point[1] - max_range, max_range * 2, max_range * 2)
-        candidates = self.query(range_rect)
-        for obj in candidates:
-            if condition and not condition(obj):
-                continue
-            obj_center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
-            dist = math.hypot(point[0] - obj_center[0], point[1] - obj_center[1])
-            if dist < min_dist:
-                min_dist = dist
-                nearest = obj
-        return nearest, min_dist
+        found = self.find_k_nearest(point, 1, condition, max_range, partition)
+        if not found:
+            return None, max_range
+        return found[0]
+
+    def find_k_nearest(self, point, k, condition=None, max_range=3000, partition=None):
+        """
+        Находит k ближайших объектов поиском "сначала лучший": узлы обходятся по возрастанию
+        расстояния до их границ, а поддеревья дальше текущего k-го кандидата отсекаются.
+        :param point: tuple (x, y) - точка поиска
+        :param k: int - сколько объектов вернуть
+        :param condition: callable - опциональное условие для фильтрации объектов
+        :param max_range: float - максимальная дистанция поиска
+        :param partition: str - искать только среди участников раздела (см. add_partition)
+        :return: list - пары (object, distance), от ближайшего к дальнему
+        """
+        if k <= 0:
+            return []
+        members = self.members[partition] if partition is not None else None
+        px, py = point
+        best = []  # Куча из (-distance, порядковый номер, object) - k лучших кандидатов
+        bound = max_range
+        counter = itertools.count()
+        nodes = [(self._min_distance(px, py), next(counter), self)]
+        while nodes:
+            node_dist, _, node = heapq.heappop(nodes)
+            if node_dist >= bound:
+                break  # Остальные узлы ещё дальше
+            for obj in node.objects:
+                if members is not None and id(obj) not in members:
+                    continue
+                if condition and not condition(obj):
+                    continue
+                dist = math.hypot(px - (obj.x + obj.width // 2), py - (obj.y + obj.height // 2))
+                if dist >= bound:
+                    continue
+                heapq.heappush(best, (-dist, next(counter), obj))
+                if len(best) > k:
+                    heapq.heappop(best)
+                if len(best) == k:
+                    bound = -best[0][0]
+            if node.divided:
+                for child in node.children():
+                    if members is not None and not child.partition_counts.get(partition):
+                        continue  # В поддереве нет участников раздела
+                    child_dist = child._min_distance(px, py)
+                    if child_dist < bound:
+                        heapq.heappush(nodes, (child_dist, next(counter), child))
+        return [(obj, -neg_dist) for neg_dist, _, obj in sorted(best, reverse=True)]
+
+    def _min_distance(self, px, py):
+        """Расстояние от точки до границ узла (0, если точка внутри)."""
+        rect = self.boundary
+        dx = max(rect.left - px, 0, px - rect.right)
+        dy = max(rect.top - py, 0, py - rect.bottom)
+        return math.hypot(dx, dy)
 
     def clear(self):
         """
         Очищает QuadTree, удаляя все объекты и дочерние узлы.
         """
         self.objects.clear()
+        self.node_of.clear()
+        for ids in self.members.values():
+            ids.clear()
+        self.partition_counts.clear()
         self.divided = False
         self.northwest = None
         self.northeast = None
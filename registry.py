@@ -0,0 +1,135 @@
+# registry.py
+import itertools
+
+
+class EntityRegistry:
+    """
+    Реестр объектов карты: карта id -> объект и множества объектов по типам.
+    Обновляется при постройке, перемещении и сносе, поэтому проверки принадлежности
+    и выборки по типу не требуют прохода по всему списку objects.
+    """
+
+    def __init__(self, objects=()):
+        self.by_id = {}
+        self.by_type = {}  # obj_type -> {entity_id: объект}, порядок добавления сохраняется
+        self.positions = {}  # entity_id -> (x, y) на момент последней регистрации/перемещения
+        self._ids = itertools.count(1)
+        self._listeners = []
+        for obj in objects:
+            self.add(obj)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __contains__(self, obj):
+        entity_id = getattr(obj, "entity_id", None)
+        return entity_id is not None and self.by_id.get(entity_id) is obj
+
+    def add_listener(self, on_add=None, on_remove=None, on_move=None):
+        """
+        Подписывает обработчики на изменения реестра.
+        :param on_add: callable(obj) - объект добавлен
+        :param on_remove: callable(obj) - объект удалён
+        :param on_move: callable(obj, old_x, old_y) - объект перемещён
+        """
+        self._listeners.append((on_add, on_remove, on_move))
+
+    def add(self, obj):
+        """Регистрирует объект и присваивает ему entity_id. Повторная регистрация ничего не делает."""
+        if obj in self:
+            return False
+        obj.entity_id = next(self._ids)
+        self.by_id[obj.entity_id] = obj
+        self.by_type.setdefault(obj.obj_type, {})[obj.entity_id] = obj
+        self.positions[obj.entity_id] = (obj.x, obj.y)
+        for on_add, _, _ in self._listeners:
+            if on_add:
+                on_add(obj)
+        return True
+
+    def remove(self, obj):
+        if obj not in self:
+            return False
+        entity_id = obj.entity_id
+        del self.by_id[entity_id]
+        del self.by_type[obj.obj_type][entity_id]
+        del self.positions[entity_id]
+        for _, on_remove, _ in self._listeners:
+            if on_remove:
+                on_remove(obj)
+        return True
+
+    def move(self, obj):
+        """Сообщает подписчикам, что объект сменил координаты (obj.x, obj.y уже новые)."""
+        if obj not in self:
+            return False
+        old_x, old_y = self.positions[obj.entity_id]
+        if (old_x, old_y) == (obj.x, obj.y):
+            return False
+        self.positions[obj.entity_id] = (obj.x, obj.y)
+        for _, _, on_move in self._listeners:
+            if on_move:
+                on_move(obj, old_x, old_y)
+        return True
+
+    def get(self, entity_id):
+        return self.by_id.get(entity_id)
+
+    def of_type(self, obj_type):
+        """Все объекты заданного типа (представление, без копирования)."""
+        return self.by_type.get(obj_type, {}).values()
+
+
+class EntityList(list):
+    """
+    Список objects, который держит реестр в курсе: append/pop/remove и прочие изменения
+    (в том числе из BuildMenu) сразу регистрируют или снимают объект.
+    """
+
+    def __init__(self, objects=(), registry=None):
+        super().__init__(objects)
+        self.registry = registry if registry is not None else EntityRegistry()
+        for obj in self:
+            self.registry.add(obj)
+
+    def of_type(self, obj_type):
+        return self.registry.of_type(obj_type)
+
+    def __contains__(self, obj):
+        return obj in self.registry
+
+    def append(self, obj):
+        super().append(obj)
+        self.registry.add(obj)
+
+    def extend(self, objects):
+        for obj in objects:
+            self.append(obj)
+
+    def insert(self, index, obj):
+        super().insert(index, obj)
+        self.registry.add(obj)
+
+    def pop(self, index=-1):
+        obj = super().pop(index)
+        self.registry.remove(obj)
+        return obj
+
+    def remove(self, obj):
+        super().remove(obj)
+        self.registry.remove(obj)
+
+    def clear(self):
+        objects = list(self)
+        super().clear()
+        for obj in objects:
+            self.registry.remove(obj)
+
+    def __delitem__(self, index):
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for obj in removed:
+            self.registry.remove(obj)
@@ -4,6 +4,14 @@ import os
 import time
 import pygame
 from entities import Player, Bed, MarketStall, Mill, CanningCellar, MapObject  # Импортируем классы
+from bed_field import BedField
+from tile_map import TileMap
+from config import MAP_WIDTH, SCREEN_HEIGHT
+import game_clock
+
+# Поля с метками игрового времени; по ним восстанавливаем время старых сохранений без game_time
+TIMESTAMP_KEYS = ("last_watered_time", "ripening_start_time", "first_watering_time", "watering_start_time",
+                  "process_start_time", "action_start_time")
 
 def filter_dict(data, exclude_types=(pygame.Surface, pygame.Rect, pygame.Color)):
     """Рекурсивно фильтрует словарь, исключая несохраняемые объекты."""
@@ -16,6 +24,31 @@ def filter_dict(data, exclude_types=(pygame.Surface, pygame.Rect, pygame.Color))
         return data
     return str(data)  # Преобразуем несохраняемые объекты в строку (для отладки)
 
+def latest_timestamp(*records):
+    """Максимальная метка времени среди сохранённых объектов (для сохранений без game_time)."""
+    latest = 0
+    for record in records:
+        for key in TIMESTAMP_KEYS:
+            value = record.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                latest = max(latest, value)
+    return latest
+
+def catch_up_objects(objects, current_time):
+    """
+    Аналитически догоняет грядки и постройки до current_time без покадрового прогона.
+    :return: int - продукты, произведённые за время простоя
+    """
+    field = BedField(capacity=len(objects))
+    produced = 0
+    for obj in objects:
+        if obj.obj_type == "bed":
+            field.add(obj)
+        elif obj.obj_type in ("mill", "canning_cellar"):
+            produced += obj.catch_up(current_time)
+    field.catch_up(current_time)
+    return produced
+
 def list_saves():
     """Возвращает список сохранений с информацией о файлах и временных метках."""
     saves_dir = "saves"
@@ -70,7 +103,7 @@ def load_game(screen, filename=None):
             harvest = data.get("harvest", 0)
             products = data.get("products", 0)
             language = data.get("language", "en")
-            map_tiles = data.get("map_tiles", [])
+            map_tiles = TileMap.load(data.get("map_tiles"), MAP_WIDTH, SCREEN_HEIGHT)
 
             # Восстановление Player
             player = Player(player_data.get("x", 0), player_data.get("y", 0), player_data.get("width", 64),
@@ -99,10 +132,21 @@ def load_game(screen, filename=None):
                 else:
                     obj = MapObject(obj_data.get("x", 0), obj_data.get("y", 0), obj_data.get("width", 64),
                                    obj_data.get("height", 64), obj_data.get("color", (0, 0, 0)), obj_type)
-                obj.__dict__.update(obj_data)
+                for key, value in obj_data.items():
+                    setattr(obj, key, value)  # setattr, чтобы состояние грядок попало в их BedField
                 obj.reload_images()  # Перезагружаем изображения
                 objects.append(obj)
 
+            # Продолжаем игровое время с момента сохранения и догоняем время простоя
+            game_time = data.get("game_time")
+            if game_time is None:
+                game_time = latest_timestamp(player_data, *objects_data)
+            saved_at = data.get("saved_at", os.path.getmtime(file_path))
+            offline_ms = max(0, time.time() - saved_at) * 1000
+            current_time = game_clock.resume(game_time, offline_ms)
+            products += catch_up_objects(objects, current_time)
+            print(f"Игровое время: {current_time:.0f} мс, простой: {offline_ms / 1000:.0f} с")
+
             print(f"Успешно загружено: player={player}, house={house}, objects={len(objects)}")
             return player, house, objects, camera_x, harvest_count, level, coins, harvest, products, language, map_tiles
         except json.JSONDecodeError as e:
@@ -125,7 +169,9 @@ def save_game(player, house, objects, camera_x, harvest_count, level, coins, har
     filtered_objects = [obj.to_dict() for obj in objects]  # Используем to_dict для объектов
     filtered_game_context = {
         k: filter_dict(v) for k, v in game_context.items()
-        if k not in ["screen", "menu_manager", "target_bed", "target_mill", "target_canning_cellar"]
+        if k not in ["screen", "menu_manager", "target_bed", "target_mill", "target_canning_cellar", "background",
+                     "spatial_index", "visible_objects", "resource_bar", "draw_list", "map_tiles",
+                     "occupancy", "placement_preview"]  # Карта сохраняется один раз, на верхнем уровне
     }
 
     save_data = {
@@ -139,7 +185,9 @@ def save_game(player, house, objects, camera_x, harvest_count, level, coins, har
         "harvest": harvest,
         "products": products,
         "language": language,
-        "map_tiles": filter_dict(game_context["map_tiles"])
+        "map_tiles": game_context["map_tiles"].to_dict(),  # Упакованная сетка индексов с палитрой
+        "game_time": game_clock.get_ticks(),  # Игровое время, от которого отсчитаны все метки в объектах
+        "saved_at": time.time()  # Реальное время сохранения, чтобы догнать простой при загрузке
     }
     save_data["game_context"] = filtered_game_context  # Сохраняем отфильтрованный game_context
     with open(file_path, "w", encoding="utf-8") as f:
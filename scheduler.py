@@ -0,0 +1,71 @@
+# scheduler.py
+import heapq
+import itertools
+import math
+
+
+class TransitionScheduler:
+    """
+    Планировщик переходов состояний на основе кучи сроков.
+    Сущность сообщает свой ближайший срок (next_deadline), а run_due обновляет
+    только те сущности, чей срок наступил, вместо опроса всех объектов каждый кадр.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._deadlines = {}  # id(сущности) -> актуальный срок; записи в куче с другим сроком устарели
+        self._counter = itertools.count()
+        self.fired_count = 0
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def schedule(self, entity, deadline):
+        """
+        Назначает (или переназначает) срок для сущности.
+        :param entity: объект с методами update(current_time) и next_deadline()
+        :param deadline: float или None - момент следующего перехода; None снимает сущность с учёта
+        """
+        if deadline is None or deadline == math.inf:
+            self.cancel(entity)
+            return
+        key = id(entity)
+        if self._deadlines.get(key) == deadline:
+            return
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), entity))
+
+    def reschedule(self, entity):
+        """Переназначает срок по текущему состоянию сущности."""
+        self.schedule(entity, entity.next_deadline())
+
+    def cancel(self, entity):
+        self._deadlines.pop(id(entity), None)
+
+    def next_deadline(self):
+        """Ближайший срок среди всех сущностей (или None)."""
+        heap = self._heap
+        while heap and self._deadlines.get(id(heap[0][2])) != heap[0][0]:
+            heapq.heappop(heap)  # Выбрасываем устаревшие записи
+        return heap[0][0] if heap else None
+
+    def run_due(self, current_time):
+        """
+        Обновляет сущности, срок которых наступил.
+        :param current_time: float - текущее игровое время
+        :return: list - пары (сущность, результат её update)
+        """
+        heap = self._heap
+        fired = []
+        while heap and heap[0][0] <= current_time:
+            deadline, _, entity = heapq.heappop(heap)
+            key = id(entity)
+            if self._deadlines.get(key) != deadline:
+                continue
+            del self._deadlines[key]
+            fired.append((entity, entity.update(current_time)))
+        # Новые сроки ставим после прохода: срок, равный current_time, сработает на следующем шаге
+        for entity, _ in fired:
+            self.reschedule(entity)
+        self.fired_count += len(fired)
+        return fired
@@ -0,0 +1,268 @@
+# simulation.py
+import math
+import pygame
+from config import MAP_WIDTH, SCREEN_HEIGHT, LEVEL_THRESHOLDS, SEEDS
+from translations import get_text
+from bed_field import BedField
+from scheduler import TransitionScheduler
+import game_clock
+
+FIXED_STEP_MS = 1000 / 60  # Шаг симуляции, как раньше при clock.tick(60)
+MAX_STEPS_PER_UPDATE = 240  # Не догоняем больше ~4 секунд за кадр, чтобы не уйти в "спираль смерти"
+ACTION_DURATION = 2000  # Длительность полива/сбора урожая
+
+# Разделы пространственного индекса: объекты входят в них и выходят по мере смены состояния,
+# поэтому поиск цели для работника обходит только подходящие объекты
+WORKER_PARTITIONS = {
+    "needs_water": lambda obj: (obj.obj_type == "bed" and obj.is_planted and not obj.is_watered
+                                and obj.watering_start_time is None),
+    "ripe": lambda obj: obj.obj_type == "bed" and obj.is_ripe,
+    "idle_mill": lambda obj: obj.obj_type == "mill" and not obj.is_processing,
+    "idle_canning_cellar": lambda obj: obj.obj_type == "canning_cellar" and not obj.is_processing,
+}
+
+
+class FarmSimulation:
+    """
+    Безголовое ядро симуляции фермы: грядки, постройки, игрок и его задачи.
+    Не требует экрана, шрифтов и картинок; время берётся из внедрённых часов.
+    """
+
+    def __init__(self, player, objects, clock=None, coins=10, harvest=0, products=0, level=1, harvest_count=0,
+                 language="en", notification_manager=None, spatial_index=None, registry=None, step_ms=FIXED_STEP_MS):
+        """
+        :param player: Player - работник фермы
+        :param objects: list - объекты карты (грядки, мельницы, погреба и т.д.)
+        :param clock: часы с методом get_ticks(); без set_time оборачиваются в GameClock (см. game_clock.adjustable).
+                      По умолчанию глобальные игровые часы
+        :param spatial_index: QuadTree - опциональный индекс для поиска ближайших целей
+        :param registry: EntityRegistry - опциональный реестр для выборки объектов по типу
+        :param step_ms: float - длительность фиксированного шага в миллисекундах
+        """
+        self.player = player
+        self.objects = objects
+        self.clock = game_clock.adjustable(clock) if clock is not None else game_clock.get_clock()
+        self.coins = coins
+        self.harvest = harvest
+        self.products = products
+        self.level = level
+        self.harvest_count = harvest_count
+        self.language = language
+        self.notification_manager = notification_manager
+        self.spatial_index = spatial_index
+        self.registry = registry
+        self.step_ms = step_ms
+        self.time = self.clock.get_ticks()  # Время симуляции, двигается строго шагами step_ms
+        self.accumulator = 0
+        self._last_clock_time = self.time
+        self.steps = 0
+        self.targets = {"target_bed": None, "target_mill": None, "target_canning_cellar": None}
+        self.state_listeners = []  # callable(obj) - состояние объекта изменилось (например, для перерисовки)
+        # Переходы состояний срабатывают по срокам, а не опросом всех объектов каждый шаг
+        self.scheduler = TransitionScheduler()
+        self.bed_field = BedField(capacity=len(objects))  # Все грядки фермы обновляются одним векторным проходом
+        self.bed_field.scheduler = self.scheduler
+        for obj in objects:
+            self.add_object(obj)
+        if spatial_index is not None:
+            for name, predicate in WORKER_PARTITIONS.items():
+                spatial_index.add_partition(name, predicate)
+
+    def add_object(self, obj):
+        """Регистрирует построенный объект в симуляции (объект уже добавлен в objects)."""
+        if obj.obj_type == "bed":
+            self.bed_field.add(obj)
+        elif obj.obj_type in ("mill", "canning_cellar"):
+            obj.scheduler = self.scheduler
+            self.scheduler.reschedule(obj)
+
+    def remove_object(self, obj):
+        """Убирает снесённый объект из симуляции."""
+        if obj.obj_type == "bed":
+            self.bed_field.remove(obj)
+        elif obj.obj_type in ("mill", "canning_cellar"):
+            self.scheduler.cancel(obj)
+            obj.scheduler = None
+
+    def update(self):
+        """
+        Догоняет часы фиксированными шагами.
+        :return: int - количество выполненных шагов
+        """
+        now = self.clock.get_ticks()
+        self.accumulator += now - self._last_clock_time
+        self._last_clock_time = now
+        steps = 0
+        while self.accumulator >= self.step_ms and steps < MAX_STEPS_PER_UPDATE:
+            self.step()
+            self.accumulator -= self.step_ms
+            steps += 1
+        if steps == MAX_STEPS_PER_UPDATE and self.accumulator > 0:
+            # Отбрасываем отставание, которое не успели догнать, и переводим часы на время симуляции:
+            # иначе метки в объектах навсегда отстанут от игрового времени (game_time в сохранении)
+            self.accumulator = 0
+            self._last_clock_time = self.time
+            self.clock.set_time(self.time)
+        return steps
+
+    def run(self, duration_ms):
+        """
+        Прогоняет симуляцию на duration_ms вперёд без оглядки на реальное время.
+        :return: int - количество выполненных шагов
+        """
+        steps = int(duration_ms // self.step_ms)
+        for _ in range(steps):
+            self.step()
+        return steps
+
+    def step(self):
+        """Один фиксированный шаг симуляции."""
+        self.time += self.step_ms
+        self.steps += 1
+        current_time = self.time
+
+        for entity, result in self.scheduler.run_due(current_time):
+            if entity is self.bed_field:
+                for index in result:
+                    self.state_changed(self.bed_field.beds[index])
+            else:
+                self.products += result  # Мельница или погреб закончили работу
+                self.state_changed(entity)
+
+        self.update_worker(current_time)
+
+        player = self.player
+        player.x = max(0, min(player.x, MAP_WIDTH - player.width))
+        player.y = max(0, min(player.y, SCREEN_HEIGHT - player.height))
+        player.move()
+
+    def state_changed(self, obj):
+        """Сообщает пространственному индексу и подписчикам, что состояние объекта изменилось."""
+        if self.spatial_index is not None:
+            self.spatial_index.refresh(obj)
+        for listener in self.state_listeners:
+            listener(obj)
+
+    def find_nearest(self, condition=None, obj_type=None, partition=None, max_range=3000):
+        """
+        Ищет ближайший к игроку объект типа obj_type, удовлетворяющий условию.
+        :param partition: str - раздел индекса, совпадающий с условием; при наличии индекса ищем только в нём
+        """
+        player = self.player
+        point = (player.x + player.width // 2, player.y + player.height // 2)
+        if self.spatial_index is not None and partition is not None:
+            nearest, dist = self.spatial_index.find_nearest(point, max_range=max_range, partition=partition)
+            return nearest
+        if obj_type is not None:
+            type_condition = condition
+            condition = lambda obj: obj.obj_type == obj_type and (type_condition is None or type_condition(obj))
+        candidates = self.objects
+        if self.registry is not None and obj_type is not None:
+            candidates = self.registry.of_type(obj_type)
+        elif self.spatial_index is not None:
+            nearest, dist = self.spatial_index.find_nearest(point, condition, max_range)
+            return nearest
+        nearest = None
+        min_dist = max_range
+        for obj in candidates:
+            if condition and not condition(obj):
+                continue
+            obj_center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
+            dist = math.hypot(point[0] - obj_center[0], point[1] - obj_center[1])
+            if dist < min_dist:
+                min_dist = dist
+                nearest = obj
+        return nearest
+
+    def walk_to(self, target_x, target_y):
+        player = self.player
+        player.target_x = max(0, min(target_x, MAP_WIDTH - player.width))
+        player.target_y = max(0, min(target_y, SCREEN_HEIGHT - player.height))
+        player.state = "walking"
+
+    def update_worker(self, current_time):
+        """Логика работника: переработка урожая, полив и сбор."""
+        player = self.player
+        if player.state not in ["idle", "walking", "watering", "harvesting"]:
+            return
+
+        if player.state in ["watering", "harvesting"]:
+            if current_time - player.action_start_time >= ACTION_DURATION:
+                player.state = "idle"
+
+        if player.state == "idle":
+            self.targets["target_canning_cellar"] = None
+            self.targets["target_mill"] = None
+            self.targets["target_bed"] = None
+            self.assign_task(current_time)
+
+        if player.state != "walking" or self.targets["target_canning_cellar"] is None:
+            self.targets["target_canning_cellar"] = None
+        if player.state != "walking" or self.targets["target_mill"] is None:
+            self.targets["target_mill"] = None
+        if player.state != "walking" or self.targets["target_bed"] is None:
+            self.targets["target_bed"] = None
+
+    def assign_task(self, current_time):
+        """Выбирает задачу для свободного работника."""
+        player = self.player
+        player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
+
+        if self.harvest >= 4:
+            target_cellar = self.find_nearest(lambda c: not c.is_processing, "canning_cellar", "idle_canning_cellar")
+            if target_cellar:
+                self.targets["target_canning_cellar"] = target_cellar
+                cellar_rect = pygame.Rect(target_cellar.x, target_cellar.y, target_cellar.width, target_cellar.height)
+                if player_rect.colliderect(cellar_rect):
+                    self.harvest -= target_cellar.start_processing(self.harvest, self.products, current_time)
+                    self.state_changed(target_cellar)
+                else:
+                    self.walk_to(target_cellar.x + target_cellar.width // 2 - player.width // 2,
+                                 target_cellar.y + target_cellar.height // 2 - player.height // 2)
+                return
+
+        if self.harvest >= 2:
+            target_mill = self.find_nearest(lambda m: not m.is_processing, "mill", "idle_mill")
+            if target_mill:
+                self.targets["target_mill"] = target_mill
+                mill_rect = pygame.Rect(target_mill.x, target_mill.y, target_mill.width, target_mill.height)
+                if player_rect.colliderect(mill_rect):
+                    self.harvest -= target_mill.start_processing(self.harvest, current_time)
+                    self.state_changed(target_mill)
+                else:
+                    self.walk_to(target_mill.x + target_mill.width // 2 - player.width // 2,
+                                 target_mill.y + target_mill.height // 2 - player.height // 2)
+                return
+
+        target_bed = self.find_nearest(
+            lambda b: b.is_planted and not b.is_watered and b.watering_start_time is None, "bed", "needs_water"
+        )
+        if not target_bed:
+            target_bed = self.find_nearest(lambda b: b.is_ripe, "bed", "ripe")
+        if not target_bed:
+            return
+
+        self.targets["target_bed"] = target_bed
+        bed_rect = pygame.Rect(target_bed.x, target_bed.y, target_bed.width, target_bed.height)
+        if player_rect.colliderect(bed_rect):
+            if target_bed.is_planted and not target_bed.is_watered and not target_bed.is_ripe and target_bed.watering_start_time is None:
+                target_bed.water(current_time)
+                self.state_changed(target_bed)
+                player.start_action("watering", current_time)
+                player.direction = "right"
+            elif target_bed.is_ripe:
+                seed = next((s for s in SEEDS if s["name"] == target_bed.plant_type), SEEDS[0])
+                target_bed.harvest()
+                self.state_changed(target_bed)
+                player.start_action("harvesting", current_time)
+                player.direction = "right"
+                self.harvest += seed["harvest_yield"]
+                self.harvest_count += 1
+                harvest_threshold = LEVEL_THRESHOLDS.get(self.level, float('inf'))
+                if self.harvest_count >= harvest_threshold:
+                    self.level = min(self.level + 1, max(LEVEL_THRESHOLDS.keys()))
+                    if self.notification_manager:
+                        self.notification_manager.add_notification("level_up")
+                    print(get_text("Level up! New level: {level}", self.language).format(level=self.level))
+        else:
+            self.walk_to(target_bed.x - player.width // 2, target_bed.y - player.height // 2)
@@ -0,0 +1,269 @@
+# spatial_hash.py
+import heapq
+import itertools
+import math
+import pygame
+
+
+class SpatialHashGrid:
+    """
+    Пространственный индекс на равномерной сетке ячеек (по умолчанию 32px, как сетка строительства).
+    Объект лежит в ячейке своего центра; вставка, удаление и перемещение - O(1).
+    API совпадает с QuadTree, поэтому game_loop может использовать любой из них.
+    """
+
+    def __init__(self, boundary, cell_size=32):
+        """
+        :param boundary: pygame.Rect - границы индексируемой области
+        :param cell_size: int - размер ячейки в пикселях
+        """
+        self.boundary = boundary
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {id(obj): obj}
+        self._obj_cells = {}  # id(obj) -> ячейка, в которой объект лежит сейчас
+        # Именованные разделы: предикат и собственные корзины ячеек только с участниками раздела
+        self.partitions = {}
+        self.partition_cells = {}
+        self._obj_partitions = {}  # id(obj) -> множество разделов, где объект сейчас участвует
+
+    @classmethod
+    def from_objects(cls, boundary, objects, cell_size=32):
+        """
+        Строит сетку сразу по всем объектам, без поштучных insert.
+        :return: SpatialHashGrid
+        """
+        grid = cls(boundary, cell_size)
+        cells = grid.cells
+        obj_cells = grid._obj_cells
+        for obj in objects:
+            center_x, center_y = obj.x + obj.width // 2, obj.y + obj.height // 2
+            if not boundary.collidepoint(center_x, center_y):
+                print(f"Object {obj.obj_type} at ({obj.x}, {obj.y}) outside boundary {boundary}")
+                continue
+            cell = (int(center_x // cell_size), int(center_y // cell_size))
+            key = id(obj)
+            cells.setdefault(cell, {})[key] = obj
+            obj_cells[key] = cell
+        return grid
+
+    def __len__(self):
+        return len(self._obj_cells)
+
+    def _cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def add_partition(self, name, predicate):
+        """
+        Заводит именованный раздел: объекты, для которых predicate(obj) истинно.
+        :param name: str - имя раздела
+        :param predicate: callable - условие участия объекта в разделе
+        """
+        self.partitions[name] = predicate
+        self.partition_cells[name] = {}
+        for obj in self.get_all_objects():
+            self.refresh(obj)
+
+    def _link(self, obj, cell, names):
+        key = id(obj)
+        for name in names:
+            self.partition_cells[name].setdefault(cell, {})[key] = obj
+
+    def _unlink(self, obj, cell, names):
+        key = id(obj)
+        for name in names:
+            cells = self.partition_cells[name]
+            bucket = cells[cell]
+            del bucket[key]
+            if not bucket:
+                del cells[cell]
+
+    def refresh(self, obj):
+        """
+        Пересчитывает участие объекта в разделах после смены его состояния.
+        :return: bool - изменилось ли участие хотя бы в одном разделе
+        """
+        key = id(obj)
+        cell = self._obj_cells.get(key)
+        if cell is None:
+            return False
+        old_names = self._obj_partitions.get(key, set())
+        new_names = {name for name, predicate in self.partitions.items() if predicate(obj)}
+        if new_names == old_names:
+            return False
+        self._unlink(obj, cell, old_names - new_names)
+        self._link(obj, cell, new_names - old_names)
+        self._obj_partitions[key] = new_names
+        return True
+
+    def insert(self, obj):
+        obj_center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
+        if not self.boundary.collidepoint(obj_center):
+            print(f"Object {obj.obj_type} at ({obj.x}, {obj.y}) outside boundary {self.boundary}")
+            return False
+        key = id(obj)
+        if key in self._obj_cells:
+            self.remove(obj)
+        cell = self._cell_of(*obj_center)
+        self.cells.setdefault(cell, {})[key] = obj
+        self._obj_cells[key] = cell
+        names = {name for name, predicate in self.partitions.items() if predicate(obj)}
+        self._link(obj, cell, names)
+        self._obj_partitions[key] = names
+        return True
+
+    def remove(self, obj, obj_center=None):
+        """
+        Удаляет объект из сетки. Ячейка берётся из индекса, поэтому изменённые x/y не мешают удалению.
+        :param obj_center: не используется, оставлен для совместимости с QuadTree.remove
+        :return: bool - успешно ли удален объект
+        """
+        key = id(obj)
+        cell = self._obj_cells.pop(key, None)
+        if cell is None:
+            return False
+        bucket = self.cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self.cells[cell]
+        self._unlink(obj, cell, self._obj_partitions.pop(key, ()))
+        return True
+
+    def move(self, obj, old_x=None, old_y=None):
+        """Переносит объект в ячейку его текущего центра; перемещение внутри ячейки ничего не стоит."""
+        key = id(obj)
+        obj_center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
+        cell = self._cell_of(*obj_center)
+        if self._obj_cells.get(key) == cell and self.boundary.collidepoint(obj_center):
+            return True
+        self.remove(obj)
+        return self.insert(obj)
+
+    def update_position(self, obj, new_x, new_y):
+        """
+        Обновляет позицию объекта.
+        :return: bool - успешно ли обновлена позиция
+        """
+        if id(obj) not in self._obj_cells:
+            return False
+        old_x, old_y = obj.x, obj.y
+        obj.x, obj.y = new_x, new_y
+        if not self.move(obj):
+            obj.x, obj.y = old_x, old_y
+            self.insert(obj)
+            return False
+        return True
+
+    def query(self, rect):
+        """
+        Находит все объекты, центр которых лежит в заданном прямоугольнике.
+        :param rect: pygame.Rect - область запроса
+        :return: list - список объектов в области
+        """
+        found = []
+        area = rect.clip(self.boundary)
+        if area.width <= 0 or area.height <= 0:
+            return found
+        min_cx, min_cy = self._cell_of(area.left, area.top)
+        max_cx, max_cy = self._cell_of(area.right - 1, area.bottom - 1)
+        cells = self.cells
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            # Запрос шире заполненной части сетки - дешевле пройти по занятым ячейкам
+            candidate_cells = [bucket for (cx, cy), bucket in cells.items()
+                               if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy]
+        else:
+            candidate_cells = [cells[(cx, cy)] for cx in range(min_cx, max_cx + 1)
+                               for cy in range(min_cy, max_cy + 1) if (cx, cy) in cells]
+        for bucket in candidate_cells:
+            for obj in bucket.values():
+                obj_center = (obj.x + obj.width // 2, obj.y + obj.height // 2)
+                if rect.collidepoint(obj_center):
+                    found.append(obj)
+        return found
+
+    def _ring(self, center_cell, radius):
+        """Ячейки на расстоянии radius (по Чебышёву) от center_cell."""
+        cx, cy = center_cell
+        if radius == 0:
+            yield center_cell
+            return
+        for x in range(cx - radius, cx + radius + 1):
+            yield x, cy - radius
+            yield x, cy + radius
+        for y in range(cy - radius + 1, cy + radius):
+            yield cx - radius, y
+            yield cx + radius, y
+
+    def find_nearest(self, point, condition=None, max_range=3000, partition=None):
+        """
+        Находит ближайший объект к заданной точке.
+        :param point: tuple (x, y) - точка поиска
+        :param condition: callable - опциональное условие для фильтрации объектов
+        :param max_range: float - максимальная дистанция поиска
+        :param partition: str - искать только среди участников раздела
+        :return: tuple (object, distance) - ближайший объект и расстояние до него
+        """
+        found = self.find_k_nearest(point, 1, condition, max_range, partition)
+        if not found:
+            return None, max_range
+        return found[0]
+
+    def find_k_nearest(self, point, k, condition=None, max_range=3000, partition=None):
+        """
+        Находит k ближайших объектов, обходя кольца ячеек от точки наружу; обход останавливается,
+        когда следующее кольцо дальше текущего k-го кандидата.
+        :param partition: str - искать только в корзинах раздела
+        :return: list - пары (object, distance), от ближайшего к дальнему
+        """
+        cells = self.cells if partition is None else self.partition_cells[partition]
+        if k <= 0 or not cells:
+            return []
+        best = []  # Куча из (-distance, порядковый номер, object)
+        state = {"bound": max_range, "counter": itertools.count()}
+        center_cell = self._cell_of(*point)
+        max_radius = int(max_range // self.cell_size) + 1
+        visited = 0
+        for radius in range(max_radius + 1):
+            # Все ячейки кольца radius дальше, чем (radius - 1) * cell_size
+            if (radius - 1) * self.cell_size >= state["bound"]:
+                break
+            if visited > len(cells):
+                # Пустых ячеек уже просмотрено больше, чем занятых всего - добираем перебором занятых
+                cx0, cy0 = center_cell
+                for (cx, cy), bucket in cells.items():
+                    if max(abs(cx - cx0), abs(cy - cy0)) >= radius:
+                        self._collect(bucket, point, k, condition, best, state)
+                break
+            for cell in self._ring(center_cell, radius):
+                visited += 1
+                bucket = cells.get(cell)
+                if bucket:
+                    self._collect(bucket, point, k, condition, best, state)
+        return [(obj, -neg_dist) for neg_dist, _, obj in sorted(best, reverse=True)]
+
+    def _collect(self, bucket, point, k, condition, best, state):
+        """Добавляет объекты ячейки в кучу k лучших кандидатов."""
+        for obj in bucket.values():
+            if condition and not condition(obj):
+                continue
+            dist = math.hypot(point[0] - (obj.x + obj.width // 2), point[1] - (obj.y + obj.height // 2))
+            if dist >= state["bound"]:
+                continue
+            heapq.heappush(best, (-dist, next(state["counter"]), obj))
+            if len(best) > k:
+                heapq.heappop(best)
+            if len(best) == k:
+                state["bound"] = -best[0][0]
+
+    def clear(self):
+        self.cells.clear()
+        self._obj_cells.clear()
+        self._obj_partitions.clear()
+        for cells in self.partition_cells.values():
+            cells.clear()
+
+    def get_all_objects(self):
+        """
+        Возвращает все объекты в сетке (для отладки).
+        :return: list - список всех объектов
+        """
+        return [obj for bucket in self.cells.values() for obj in bucket.values()]
@@ -0,0 +1,120 @@
+# surface_cache.py
+from collections import OrderedDict
+import pygame
+from config import SCALE_CACHE_BYTES
+
+
+class TextCache:
+    """
+    Ограниченный LRU-кэш отрисованного текста: (шрифт, текст, цвет, сглаживание, фон) -> поверхность.
+    Поверхности общие для всех вызовов - менять их нельзя (для set_alpha нужна копия).
+    """
+
+    def __init__(self, max_entries=512):
+        """:param max_entries: int - сколько поверхностей хранить до вытеснения самых старых"""
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0  # Память пикселей всех закэшированных поверхностей
+
+    def render(self, font, text, antialias, color, background=None):
+        """Аналог font.render(text, antialias, color, background) с кэшированием результата."""
+        key = (font, text, antialias, tuple(color), None if background is None else tuple(background))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+        self.misses += 1
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        self.entries[key] = surface
+        self.bytes += _surface_bytes(surface)
+        while len(self.entries) > self.max_entries:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= _surface_bytes(old)
+        return surface
+
+    def stats(self):
+        """Счётчики для отладки: попадания, промахи, число поверхностей и занятая память."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "bytes": self.bytes}
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+class ScaleCache:
+    """
+    LRU-кэш масштабированных изображений: (исходная поверхность, размер, фильтр) -> поверхность.
+    Суммарная память ограничена бюджетом в байтах; при превышении вытесняются давно не использованные.
+    Результат общий - перед set_alpha и рисованием на нём нужна копия.
+    """
+
+    def __init__(self, budget_bytes=SCALE_CACHE_BYTES):
+        """:param budget_bytes: int - предел памяти пикселей всех закэшированных поверхностей"""
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def scale(self, surface, size, smooth=False):
+        """Аналог pygame.transform.scale (smooth=True - smoothscale), считающий каждый размер один раз."""
+        size = (int(size[0]), int(size[1]))
+        key = (surface, size, smooth)
+        scaled = self.entries.get(key)
+        if scaled is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return scaled
+        self.misses += 1
+        scaled = pygame.transform.smoothscale(surface, size) if smooth else pygame.transform.scale(surface, size)
+        size_bytes = _surface_bytes(scaled)
+        if size_bytes > self.budget_bytes:
+            return scaled  # Больше всего бюджета - не кэшируем
+        self.entries[key] = scaled
+        self.bytes += size_bytes
+        while self.bytes > self.budget_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= _surface_bytes(old)
+            self.evictions += 1
+        return scaled
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.entries), "bytes": self.bytes, "budget_bytes": self.budget_bytes}
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+def _surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+_text_cache = TextCache()
+_scale_cache = ScaleCache()
+
+
+def render_text(font, text, antialias, color, background=None):
+    """Отрисовывает текст через общий кэш; сигнатура как у font.render, первым аргументом - шрифт."""
+    return _text_cache.render(font, text, antialias, color, background)
+
+
+def text_cache_stats():
+    return _text_cache.stats()
+
+
+def scale_surface(surface, size, smooth=False):
+    """Масштабирует изображение через общий кэш; сигнатура как у pygame.transform.scale."""
+    return _scale_cache.scale(surface, size, smooth)
+
+
+def scale_cache_stats():
+    return _scale_cache.stats()
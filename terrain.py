@@ -0,0 +1,52 @@
+# terrain.py
+import random
+import numpy as np
+
+# Константы перемешивания (splitmix64)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_ROW_MIX = np.uint64(0xC2B2AE3D27D4EB4F)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def new_seed():
+    """Случайное зерно для новой карты."""
+    return random.getrandbits(32)
+
+
+def cell_hash(seed, columns, rows):
+    """
+    Чистая функция (seed, клетка) -> 64-битный хеш; работает сразу по массивам клеток.
+    :param columns: np.ndarray - номера столбцов
+    :param rows: np.ndarray - номера строк (форма, совместимая с columns)
+    :return: np.ndarray uint64
+    """
+    x = (np.asarray(columns).astype(np.uint64) * _GOLDEN) ^ (np.asarray(rows).astype(np.uint64) * _ROW_MIX)
+    x ^= np.uint64(seed & 0xFFFFFFFFFFFFFFFF)
+    x ^= x >> np.uint64(30)
+    x *= _MIX_1
+    x ^= x >> np.uint64(27)
+    x *= _MIX_2
+    x ^= x >> np.uint64(31)
+    return x
+
+
+def generate_region(seed, column, row, columns, rows, variants):
+    """
+    Вариант тайла для прямоугольной области клеток; результат не зависит от того,
+    какими кусками карту генерируют, поэтому любую область можно пересчитать отдельно.
+    :param column: int - первый столбец области
+    :param row: int - первая строка области
+    :param columns: int - ширина области в клетках
+    :param rows: int - высота области в клетках
+    :param variants: int - число вариантов тайла
+    :return: np.ndarray uint8 формы (rows, columns)
+    """
+    column_ids = np.arange(column, column + columns, dtype=np.int64)[np.newaxis, :]
+    row_ids = np.arange(row, row + rows, dtype=np.int64)[:, np.newaxis]
+    return (cell_hash(seed, column_ids, row_ids) % np.uint64(variants)).astype(np.uint8)
+
+
+def variant_at(seed, column, row, variants):
+    """Вариант тайла одной клетки."""
+    return int(generate_region(seed, column, row, 1, 1, variants)[0, 0])
@@ -0,0 +1,168 @@
+# tile_map.py
+import base64
+import zlib
+import numpy as np
+import terrain
+
+GRASS_TILES = ["grass_tile_1", "grass_tile_2", "grass_tile_3"]
+
+
+class TileMap:
+    """
+    Карта тайлов фона: сетка индексов uint8 (строка, столбец) и маленькая палитра имён тайлов.
+    Один байт на клетку вместо словаря {"x", "y", "type"}; тип клетки берётся за O(1).
+    Карта с зерном (seed) восстанавливается генератором terrain, в сохранение попадают только правки поверх него.
+    """
+
+    def __init__(self, columns, rows, tile_size=32, palette=None, tiles=None):
+        """
+        :param columns: int - число столбцов (клеток по ширине)
+        :param rows: int - число строк (клеток по высоте)
+        :param tile_size: int - размер клетки в пикселях
+        :param palette: list - имена тайлов; индекс в палитре и есть значение клетки
+        :param tiles: np.ndarray - готовая сетка индексов формы (rows, columns)
+        """
+        self.columns = columns
+        self.rows = rows
+        self.tile_size = tile_size
+        self.palette = list(palette) if palette else list(GRASS_TILES)
+        self._palette_ids = {name: i for i, name in enumerate(self.palette)}
+        self.tiles = np.zeros((rows, columns), dtype=np.uint8) if tiles is None else tiles
+        self._listeners = []
+        self.seed = None  # Зерно процедурной карты; None - сетка задана явно
+        self.variants = 0  # Сколько первых тайлов палитры использует генератор
+
+    @classmethod
+    def for_area(cls, width, height, tile_size=32, palette=None):
+        """Пустая карта, покрывающая область width x height пикселей."""
+        return cls(-(-width // tile_size), -(-height // tile_size), tile_size, palette)
+
+    @classmethod
+    def generate(cls, seed, width, height, tile_size=32, palette=None):
+        """
+        Процедурная карта: вариант каждой клетки - чистая функция (seed, клетка).
+        :param seed: int - зерно генератора
+        :return: TileMap
+        """
+        tile_map = cls.for_area(width, height, tile_size, palette)
+        tile_map.seed = seed
+        tile_map.variants = len(tile_map.palette)
+        tile_map.tiles[:] = tile_map.generated_region(0, 0, tile_map.columns, tile_map.rows)
+        return tile_map
+
+    @classmethod
+    def from_tiles(cls, map_tiles, width, height, tile_size=32):
+        """
+        Переводит старый список тайлов {"x", "y", "type"} в TileMap (для старых сохранений).
+        """
+        tile_map = cls.for_area(width, height, tile_size)
+        for tile in map_tiles:
+            column, row = tile["x"] // tile_size, tile["y"] // tile_size
+            if 0 <= column < tile_map.columns and 0 <= row < tile_map.rows:
+                tile_map.tiles[row, column] = tile_map.palette_index(tile["type"])
+        return tile_map
+
+    @classmethod
+    def from_dict(cls, data):
+        """Восстанавливает карту из упакованного вида to_dict()."""
+        columns, rows = data["columns"], data["rows"]
+        if "seed" in data:
+            tile_map = cls(columns, rows, data.get("tile_size", 32), data["palette"])
+            tile_map.seed = data["seed"]
+            tile_map.variants = data["variants"]
+            tile_map.tiles[:] = tile_map.generated_region(0, 0, columns, rows)
+            for column, row, index in data.get("overrides", []):
+                tile_map.tiles[row, column] = index
+            return tile_map
+        raw = zlib.decompress(base64.b64decode(data["data"]))
+        tiles = np.frombuffer(raw, dtype=np.uint8).reshape(rows, columns).copy()
+        return cls(columns, rows, data.get("tile_size", 32), data["palette"], tiles)
+
+    @classmethod
+    def load(cls, data, width, height, tile_size=32):
+        """
+        Карта из сохранения: упакованный словарь, старый список тайлов или None.
+        :return: TileMap или None, если в сохранении нет карты
+        """
+        if isinstance(data, dict):
+            return cls.from_dict(data)
+        if data:
+            return cls.from_tiles(data, width, height, tile_size)
+        return None
+
+    def to_dict(self):
+        """
+        Упаковывает карту для сохранения: процедурная карта - зерно и список изменённых клеток,
+        явная - сетка, сжатая zlib и закодированная в base64.
+        """
+        if self.seed is not None:
+            rows, columns = np.nonzero(self.tiles != self.generated_region(0, 0, self.columns, self.rows))
+            return {
+                "columns": self.columns,
+                "rows": self.rows,
+                "tile_size": self.tile_size,
+                "palette": self.palette,
+                "seed": self.seed,
+                "variants": self.variants,
+                "overrides": [[int(column), int(row), int(self.tiles[row, column])]
+                              for column, row in zip(columns, rows)],
+            }
+        packed = zlib.compress(self.tiles.tobytes(), 9)
+        return {
+            "columns": self.columns,
+            "rows": self.rows,
+            "tile_size": self.tile_size,
+            "palette": self.palette,
+            "data": base64.b64encode(packed).decode("ascii"),
+        }
+
+    def __len__(self):
+        return self.columns * self.rows
+
+    @property
+    def width(self):
+        return self.columns * self.tile_size
+
+    @property
+    def height(self):
+        return self.rows * self.tile_size
+
+    def generated_region(self, column, row, columns, rows):
+        """Сетка, которую генератор даёт для области клеток (без правок поверх неё)."""
+        return terrain.generate_region(self.seed, column, row, columns, rows, self.variants)
+
+    def palette_index(self, tile_type):
+        """Индекс тайла в палитре; новые имена дописываются в конец (не больше 256)."""
+        index = self._palette_ids.get(tile_type)
+        if index is None:
+            if len(self.palette) >= 256:
+                raise ValueError(f"Палитра TileMap переполнена: {tile_type}")
+            index = len(self.palette)
+            self.palette.append(tile_type)
+            self._palette_ids[tile_type] = index
+        return index
+
+    def add_listener(self, callback):
+        """:param callback: callable(column, row) - клетка сменила тип"""
+        self._listeners.append(callback)
+
+    def cell_at(self, x, y):
+        """Клетка (столбец, строка), в которую попадает точка в пикселях."""
+        return int(x // self.tile_size), int(y // self.tile_size)
+
+    def get(self, column, row):
+        """Имя тайла в клетке."""
+        return self.palette[self.tiles[row, column]]
+
+    def type_at(self, x, y):
+        """Имя тайла под точкой в пикселях."""
+        column, row = self.cell_at(x, y)
+        return self.get(column, row)
+
+    def set(self, column, row, tile_type):
+        index = self.palette_index(tile_type)
+        if self.tiles[row, column] == index:
+            return
+        self.tiles[row, column] = index
+        for callback in self._listeners:
+            callback(column, row)
@@ -4,6 +4,7 @@ import images
 from config import SCREEN_HEIGHT, WHITE, BLACK, GRAY, GREEN, SEEDS
 from translations import get_text
 import fonts
+from surface_cache import render_text, scale_surface
 import json
 
 def save_menu_language(language):
@@ -50,8 +51,8 @@ class Menu:
             self.arrow_right = pygame.Surface((20, 20))
             self.arrow_right.fill(GRAY)
         else:
-            self.arrow_left = pygame.transform.scale(self.arrow_left, (20, 20))
-            self.arrow_right = pygame.transform.scale(self.arrow_right, (20, 20))
+            self.arrow_left = scale_surface(self.arrow_left, (20, 20))
+            self.arrow_right = scale_surface(self.arrow_right, (20, 20))
 
         has_saves = self.is_save_exists()
         self.options = [
@@ -105,7 +106,7 @@ class Menu:
 
             # Прямоугольники для переключения языка
             lang_text = "English" if self.current_language == "en" else "Русский"
-            lang_switch_text = self.font.render(lang_text, True, WHITE)
+            lang_switch_text = render_text(self.font, lang_text, True, WHITE)
             text_width = lang_switch_text.get_width()
             padding = 20
             lang_switch_width = text_width + padding
@@ -145,10 +146,10 @@ class Menu:
         if bg_height != screen_height:
             scale_factor = screen_height / bg_height
             new_width = int(bg_width * scale_factor)
-            background = pygame.transform.scale(background, (new_width, screen_height))
+            background = scale_surface(background, (new_width, screen_height))
             bg_width = new_width
         if bg_width < screen_width:
-            scaled_background = pygame.transform.scale(background, (screen_width, screen_height))
+            scaled_background = scale_surface(background, (screen_width, screen_height))
             screen.blit(scaled_background, (0, 0))
         else:
             clip_x = (bg_width - screen_width) // 2
@@ -164,7 +165,7 @@ class Menu:
                 button_rect = self.option_rects[i]
                 image_to_draw = option["image_hover"] if button_rect.collidepoint(mx, my) and option["color"] != GRAY else option["image_normal"]
                 screen.blit(image_to_draw, (button_rect.x, button_rect.y))
-                text_surface = self.font.render(option["text"], True, option["color"])
+                text_surface = render_text(self.font, option["text"], True, option["color"])
                 text_rect = text_surface.get_rect(center=button_rect.center)
                 screen.blit(text_surface, text_rect)
 
@@ -189,21 +190,21 @@ class Menu:
 
             settings_rect = pygame.Rect(base_x, base_y, button_width, button_height)
             screen.blit(self.button_normal, (settings_rect.x, settings_rect.y))
-            settings_title = self.font.render(get_text("Settings", self.current_language), True, WHITE)
+            settings_title = render_text(self.font, get_text("Settings", self.current_language), True, WHITE)
             settings_text_rect = settings_title.get_rect(center=settings_rect.center)
             screen.blit(settings_title, settings_text_rect)
 
             language_rect = pygame.Rect(base_x, base_y + spacing, button_width, button_height)
             screen.blit(self.button_normal, (language_rect.x, language_rect.y))
-            language_title = self.font.render(get_text("Language", self.current_language), True, WHITE)
+            language_title = render_text(self.font, get_text("Language", self.current_language), True, WHITE)
             language_text_rect = language_title.get_rect(center=language_rect.center)
             screen.blit(language_title, language_text_rect)
 
             lang_text = "English" if self.current_language == "en" else "Русский"
-            lang_switch_text = self.font.render(lang_text, True, WHITE)
+            lang_switch_text = render_text(self.font, lang_text, True, WHITE)
             # Заменяем условие на постоянное использование self.button_normal
             lang_switch_image = self.button_normal  # Убрано активное состояние
-            lang_switch_image = pygame.transform.scale(lang_switch_image,
+            lang_switch_image = scale_surface(lang_switch_image,
                                                        (self.lang_switch_rect.width, self.lang_switch_rect.height))
             screen.blit(lang_switch_image, (self.lang_switch_rect.x, self.lang_switch_rect.y))
             lang_switch_text_rect = lang_switch_text.get_rect(center=self.lang_switch_rect.center)
@@ -214,7 +215,7 @@ class Menu:
 
             music_rect = pygame.Rect(base_x, base_y + 2 * spacing, button_width, button_height)
             screen.blit(self.button_normal, (music_rect.x, music_rect.y))
-            music_title = self.font.render(get_text("Music Volume", self.current_language), True, WHITE)
+            music_title = render_text(self.font, get_text("Music Volume", self.current_language), True, WHITE)
             music_text_rect = music_title.get_rect(center=music_rect.center)
             screen.blit(music_title, music_text_rect)
             pygame.draw.rect(screen, GRAY, (self.music_slider_x, music_rect.y + (button_height - 10) // 2, self.slider_width, 10))
@@ -224,7 +225,7 @@ class Menu:
 
             sound_rect = pygame.Rect(base_x, base_y + 3 * spacing, button_width, button_height)
             screen.blit(self.button_normal, (sound_rect.x, sound_rect.y))
-            sound_title = self.font.render(get_text("Sound Volume", self.current_language), True, WHITE)
+            sound_title = render_text(self.font, get_text("Sound Volume", self.current_language), True, WHITE)
             sound_text_rect = sound_title.get_rect(center=sound_rect.center)
             screen.blit(sound_title, sound_text_rect)
             pygame.draw.rect(screen, GRAY, (self.sound_slider_x, sound_rect.y + (button_height - 10) // 2, self.slider_width, 10))
@@ -335,8 +336,8 @@ def draw_wheel(screen, game_context, camera_x, fonts=None):
     )
 
     font = fonts["title_font_medium"] if fonts else pygame.font.Font(None, 24)
-    build_text = font.render(get_text("Construction", game_context["language"]), True, (0, 0, 255))
-    plant_text = font.render(get_text("Planting", game_context["language"]), True, (0, 255, 0))
+    build_text = render_text(font, get_text("Construction", game_context["language"]), True, (0, 0, 255))
+    plant_text = render_text(font, get_text("Planting", game_context["language"]), True, (0, 255, 0))
 
     screen.blit(build_text, (build_endpoint[0] + 5, build_endpoint[1] - 10))
     screen.blit(plant_text, (plant_endpoint[0] - plant_text.get_width() - 5, plant_endpoint[1] - 10))
@@ -362,7 +363,7 @@ def draw_seed_menu(game_context, coins, selected_seed=None, level=1, fonts=fonts
 
     close_rect = pygame.Rect(screen_width - 30, 10, 20, 20)
     pygame.draw.rect(screen, (173, 216, 230), close_rect)
-    close_text = small_font.render("×", True, BLACK)
+    close_text = render_text(small_font, "×", True, BLACK)
     screen.blit(close_text, close_text.get_rect(center=close_rect.center))
 
     seeds_per_row = 2
@@ -397,7 +398,7 @@ def draw_seed_menu(game_context, coins, selected_seed=None, level=1, fonts=fonts
                 f"{get_text('Harvest Yield', language=seed_lang)}: {seed['harvest_yield']}"
             )
         pygame.draw.rect(screen, menu_color, rect)
-        text = font.render(get_text(seed["name"], language=seed_lang)[0], True, BLACK)
+        text = render_text(font, get_text(seed["name"], language=seed_lang)[0], True, BLACK)
         text_rect = text.get_rect(center=(rect_x + 40, rect_y + 25))
         screen.blit(text, text_rect)
 
@@ -435,8 +436,8 @@ def draw_seed_menu(game_context, coins, selected_seed=None, level=1, fonts=fonts
                 parts = line.split(': ', 1)
                 if len(parts) == 2:
                     text_part, number = parts
-                    text_surface = tooltip_font.render(f"{text_part}: ", True, WHITE)
-                    number_surface = tooltip_font.render(number, True, WHITE)
+                    text_surface = render_text(tooltip_font, f"{text_part}: ", True, WHITE)
+                    number_surface = render_text(tooltip_font, number, True, WHITE)
                     coin_image = images.GAME_IMAGES["coin_menu"]
                     text_height = text_surface.get_height()
                     coin_height = coin_image.get_height()
@@ -447,7 +448,7 @@ def draw_seed_menu(game_context, coins, selected_seed=None, level=1, fonts=fonts
                     screen.blit(coin_image, (tooltip_rect.x + 5 + tooltip_font.size(f"{text_part}: {number}")[0] + 5,
                                              tooltip_rect.y + 5 + i * 20 + y_offset))
             else:
-                text_surface = tooltip_font.render(line, True, WHITE)
+                text_surface = render_text(tooltip_font, line, True, WHITE)
                 screen.blit(text_surface, (tooltip_rect.x + 5, tooltip_rect.y + 5 + i * 20))
 
 
@@ -474,7 +475,7 @@ def draw_build_menu(game_context, coins, current_index=0, build_type="functional
 
     close_rect = pygame.Rect(screen_width - 30, 10, 20, 20)
     pygame.draw.rect(screen, (173, 216, 230), close_rect)
-    close_text = small_font.render("×", True, BLACK)
+    close_text = render_text(small_font, "×", True, BLACK)
     screen.blit(close_text, close_text.get_rect(center=close_rect.center))
 
     action_width = (menu_width - 30) // 2
@@ -482,8 +483,8 @@ def draw_build_menu(game_context, coins, current_index=0, build_type="functional
     destroy_rect = pygame.Rect(screen_width - action_width - 15, 60, action_width, 50)
     pygame.draw.rect(screen, (173, 216, 230) if coins >= 0 else GRAY, move_rect)
     pygame.draw.rect(screen, (173, 216, 230) if coins >= 0 else GRAY, destroy_rect)
-    move_text = small_font.render(get_text("Move", language=language), True, BLACK)
-    destroy_text = small_font.render(get_text("Destroy", language=language), True, (255, 0, 0))
+    move_text = render_text(small_font, get_text("Move", language=language), True, BLACK)
+    destroy_text = render_text(small_font, get_text("Destroy", language=language), True, (255, 0, 0))
     screen.blit(move_text, move_text.get_rect(center=(move_rect.x + action_width // 2, move_rect.y + 25)))
     screen.blit(destroy_text, destroy_text.get_rect(center=(destroy_rect.x + action_width // 2, destroy_rect.y + 25)))
 
@@ -504,19 +505,19 @@ def draw_build_menu(game_context, coins, current_index=0, build_type="functional
         scale_factor = min(image_zone_width / bed_image.get_width(), image_zone_height / bed_image.get_height())
         scaled_width = int(bed_image.get_width() * scale_factor)
         scaled_height = int(bed_image.get_height() * scale_factor)
-        scaled_bed_image = pygame.transform.scale(bed_image, (scaled_width, scaled_height))
+        scaled_bed_image = scale_surface(bed_image, (scaled_width, scaled_height))
         image_x = image_zone_x + (image_zone_width - scaled_width) // 2
         image_y = image_zone_y + (image_zone_height - scaled_height) // 2
         screen.blit(scaled_bed_image, (image_x, image_y))
 
-        title_text = tooltip_font.render(current_build["text"], True, BLACK)
+        title_text = render_text(tooltip_font, current_build["text"], True, BLACK)
         title_x = build_rect.x + (build_rect.width - title_text.get_width()) // 2
         title_y = image_zone_y + image_zone_height + 20
         screen.blit(title_text, (title_x, title_y))
 
         coin_image = images.GAME_IMAGES["coin_menu"]
         cost_value = current_build["cost"]
-        cost_text = tooltip_font.render(str(cost_value), True, BLACK)
+        cost_text = render_text(tooltip_font, str(cost_value), True, BLACK)
         total_width = cost_text.get_width() + coin_image.get_width() + 5
         cost_x = build_rect.x + (build_rect.width - total_width) // 2
         cost_y = title_y + title_text.get_height() + 10
@@ -538,7 +539,7 @@ def draw_build_menu(game_context, coins, current_index=0, build_type="functional
 
         description_start_y = cost_y + tooltip_font.get_height() + 10
         for i, line in enumerate(lines[:4]):
-            desc_text = tooltip_font.render(line, True, BLACK)
+            desc_text = render_text(tooltip_font, line, True, BLACK)
             screen.blit(desc_text, (build_rect.x + 15, description_start_y + i * 20))
 
         left_arrow_rect = pygame.Rect(build_rect.x + 10, image_zone_y + (image_zone_height - 40) // 2, 40, 40)
@@ -560,7 +561,7 @@ def draw_build_menu(game_context, coins, current_index=0, build_type="functional
         type_rect = pygame.Rect(screen_width - menu_width + 15 + i * ((menu_width - 30) // 2), type_y,
                                 (menu_width - 30) // 2, type_height)
         pygame.draw.rect(screen, btype["color"], type_rect)
-        type_text = small_font.render(btype["text"][0], True, BLACK)
+        type_text = render_text(small_font, btype["text"][0], True, BLACK)
         screen.blit(type_text, type_text.get_rect(
             center=(type_rect.x + type_rect.width // 2, type_rect.y + type_rect.height // 2)))
 
@@ -594,13 +595,13 @@ def confirm_dialog(screen, message,fonts=None):
                     return False
 
         screen.fill(BLACK)
-        text = font.render(message, True, WHITE)
+        text = render_text(font, message, True, WHITE)
         text_rect = text.get_rect(center=(screen.get_width() // 2, SCREEN_HEIGHT // 2 - 20))
         screen.blit(text, text_rect)
         pygame.draw.rect(screen, GREEN, (screen.get_width() // 2 - 100, SCREEN_HEIGHT // 2 + 20, 80, 40))
         pygame.draw.rect(screen, GRAY, (screen.get_width() // 2 + 20, SCREEN_HEIGHT // 2 + 20, 80, 40))
-        yes_text = font.render("Да", True, WHITE)
-        no_text = font.render("Нет", True, WHITE)
+        yes_text = render_text(font, "Да", True, WHITE)
+        no_text = render_text(font, "Нет", True, WHITE)
         screen.blit(yes_text, yes_text.get_rect(center=(screen.get_width() // 2 - 60, SCREEN_HEIGHT // 2 + 40)))
         screen.blit(no_text, no_text.get_rect(center=(screen.get_width() // 2 + 60, SCREEN_HEIGHT // 2 + 40)))
         pygame.display.flip()
@@ -621,7 +622,7 @@ def draw_market_menu(game_context, coins, harvest, products, fonts=None):
 
     close_rect = pygame.Rect(menu_x + menu_width - 30, menu_y + 10, 20, 20)
     pygame.draw.rect(screen, (173, 216, 230), close_rect)
-    close_text = small_font.render("×", True, BLACK)
+    close_text = render_text(small_font, "×", True, BLACK)
     screen.blit(close_text, close_text.get_rect(center=close_rect.center))
 
     # Иконки без названий
@@ -633,7 +634,7 @@ def draw_market_menu(game_context, coins, harvest, products, fonts=None):
     harvest_count = game_context["market_harvest_to_sell"]
     harvest_rect = pygame.Rect(menu_x + 150, menu_y + 70, 50, 40)
     pygame.draw.rect(screen, WHITE, harvest_rect)
-    harvest_text = small_font.render(str(harvest_count), True, BLACK)
+    harvest_text = render_text(small_font, str(harvest_count), True, BLACK)
     screen.blit(harvest_text, (harvest_rect.x + (harvest_rect.width - harvest_text.get_width()) // 2, harvest_rect.y + 10))
     screen.blit(harvest_image, (menu_x + 20, menu_y + 70))
 
@@ -641,14 +642,14 @@ def draw_market_menu(game_context, coins, harvest, products, fonts=None):
     harvest_decrease = pygame.Rect(menu_x + 205, menu_y + 90, 30, 20)
     pygame.draw.rect(screen, GREEN, harvest_increase)
     pygame.draw.rect(screen, GREEN, harvest_decrease)
-    screen.blit(small_font.render("↑", True, BLACK), harvest_increase.move(10, 2))
-    screen.blit(small_font.render("↓", True, BLACK), harvest_decrease.move(10, 2))
+    screen.blit(render_text(small_font, "↑", True, BLACK), harvest_increase.move(10, 2))
+    screen.blit(render_text(small_font, "↓", True, BLACK), harvest_decrease.move(10, 2))
 
     # Окошко для Продуктов с двумя стрелочками
     products_count = game_context["market_products_to_sell"]
     products_rect = pygame.Rect(menu_x + 150, menu_y + 130, 50, 40)
     pygame.draw.rect(screen, WHITE, products_rect)
-    products_text = small_font.render(str(products_count), True, BLACK)
+    products_text = render_text(small_font, str(products_count), True, BLACK)
     screen.blit(products_text, (products_rect.x + (products_rect.width - products_text.get_width()) // 2, products_rect.y + 10))
     screen.blit(product_image, (menu_x + 20, menu_y + 130))
 
@@ -656,19 +657,19 @@ def draw_market_menu(game_context, coins, harvest, products, fonts=None):
     products_decrease = pygame.Rect(menu_x + 205, menu_y + 150, 30, 20)
     pygame.draw.rect(screen, GREEN, products_increase)
     pygame.draw.rect(screen, GREEN, products_decrease)
-    screen.blit(small_font.render("↑", True, BLACK), products_increase.move(10, 2))
-    screen.blit(small_font.render("↓", True, BLACK), products_decrease.move(10, 2))
+    screen.blit(render_text(small_font, "↑", True, BLACK), products_increase.move(10, 2))
+    screen.blit(render_text(small_font, "↓", True, BLACK), products_decrease.move(10, 2))
 
     # Иконка монетки вместо "Итого"
     total_value = (game_context["market_harvest_to_sell"] * 2) + (game_context["market_products_to_sell"] * 15)
     screen.blit(coin_image, (menu_x + 150, menu_y + 200))
-    value_text = small_font.render(str(total_value), True, BLACK)
+    value_text = render_text(small_font, str(total_value), True, BLACK)
     screen.blit(value_text, (menu_x + 190, menu_y + 202))
 
     # Кнопка "Продать"
     sell_rect = pygame.Rect(menu_x + 150, menu_y + 230, 100, 40)
     pygame.draw.rect(screen, GREEN, sell_rect)
-    sell_text = small_font.render(get_text("Sell", language), True, BLACK)
+    sell_text = render_text(small_font, get_text("Sell", language), True, BLACK)
     screen.blit(sell_text, sell_text.get_rect(center=sell_rect.center))
 
     return {
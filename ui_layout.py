@@ -0,0 +1,103 @@
+# ui_layout.py
+import pygame
+
+
+class Widget:
+    """
+    Элемент меню: прямоугольник на экране и готовые команды отрисовки (surface, позиция).
+    Команды пересобираются, только когда меняется состояние элемента (наведение, выбор, значение).
+    """
+
+    def __init__(self, name, rect, interactive=True, visible=True):
+        """
+        :param name: str - имя элемента, его возвращает hit_test
+        :param rect: pygame.Rect - область элемента на экране
+        :param interactive: bool - участвует ли элемент в попаданиях мышью (фон и подписи - нет)
+        :param visible: bool - рисуется ли элемент и можно ли в него попасть
+        """
+        self.name = name
+        self.rect = pygame.Rect(rect)
+        self.interactive = interactive
+        self.visible = visible
+        self.state = None  # Состояние, для которого собраны commands
+        self.commands = []
+        self.dirty = True
+
+    def update(self, state, build):
+        """
+        Пересобирает команды, если состояние изменилось.
+        :param state: любое сравнимое значение - всё, от чего зависит вид элемента
+        :param build: callable(widget) -> список команд (surface, позиция)
+        """
+        if self.dirty or state != self.state:
+            self.state = state
+            self.commands = build(self)
+            self.dirty = False
+        return self.commands
+
+
+class Layout:
+    """
+    Сохраняемое дерево элементов одного меню. Прямоугольники считаются один раз для ключа
+    (ширина экрана, язык, уровень и т.п.); попадание мышью - только геометрия, без отрисовки.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.widgets = {}  # Имя -> Widget, в порядке отрисовки
+
+    def add(self, name, rect, interactive=True, visible=True):
+        widget = Widget(name, rect, interactive, visible)
+        self.widgets[name] = widget
+        return widget
+
+    def __getitem__(self, name):
+        return self.widgets[name]
+
+    def __contains__(self, name):
+        return name in self.widgets
+
+    def rect(self, name):
+        """Прямоугольник элемента; для скрытого или отсутствующего - пустой."""
+        widget = self.widgets.get(name)
+        if widget is None or not widget.visible:
+            return pygame.Rect(0, 0, 0, 0)
+        return widget.rect
+
+    def rects(self):
+        """Прямоугольники всех интерактивных элементов (как раньше возвращал draw(..., return_rects=True))."""
+        return {name: self.rect(name) for name, widget in self.widgets.items() if widget.interactive}
+
+    def hit_test(self, pos):
+        """:return: str - имя верхнего видимого интерактивного элемента под точкой или None"""
+        for name, widget in reversed(self.widgets.items()):
+            if widget.interactive and widget.visible and widget.rect.collidepoint(pos):
+                return name
+        return None
+
+    def invalidate(self):
+        """Помечает все элементы для пересборки (например, после замены изображений)."""
+        for widget in self.widgets.values():
+            widget.dirty = True
+
+    def draw(self, screen):
+        """Рисует видимые элементы готовыми командами, одним Surface.blits."""
+        commands = []
+        for widget in self.widgets.values():
+            if widget.visible:
+                commands.extend(widget.commands)
+        screen.blits(commands, False)
+
+
+def filled(size, color):
+    """Непрозрачный прямоугольник цвета color (замена pygame.draw.rect с заливкой)."""
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface
+
+
+def outlined(size, color, width):
+    """Прозрачная поверхность с рамкой (замена pygame.draw.rect с толщиной линии)."""
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.rect(surface, color, (0, 0, size[0], size[1]), width)
+    return surface